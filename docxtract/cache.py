@@ -0,0 +1,329 @@
+"""
+On-disk cache of LLM results for docxtract.
+
+Three layers live under ``~/.cache/docxtract`` (override with the
+``DOCXTRACT_CACHE_DIR`` environment variable, disable with ``DOCXTRACT_NO_CACHE=1``):
+
+- Pipeline step results, stored as JSON keyed by the SHA-256 of the PDF bytes,
+  the model deployment and API version, and a hash of the prompt sources, so
+  re-running the pipeline on an identical PDF skips the LLM steps, while editing
+  a prompt or switching models invalidates old entries.
+- Individual LLM responses under ``responses/``, keyed by the exact prompt, model
+  deployment and API version, so identical prompts are never sent twice.
+- Optional semantic indexes of section summaries under ``sem/``, so near-duplicate
+  sections (by embedding similarity) reuse an earlier summary.
+
+See .github/copilot-instructions.md for documentation and code style standards.
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Bump when the format of cached step results changes
+CACHE_VERSION = 1
+
+PROMPTS_DIR = Path(__file__).parent / "prompts"
+
+# Modules with prompts embedded in code, hashed along with the prompt templates
+PROMPT_SOURCES = (Path(__file__).parent / "summarizer.py",)
+
+
+def get_cache_dir() -> Path:
+    """Return the directory holding cached LLM results."""
+    cache_dir = os.environ.get("DOCXTRACT_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+    return Path.home() / ".cache" / "docxtract"
+
+
+def cache_enabled() -> bool:
+    """Return False when caching is disabled via ``DOCXTRACT_NO_CACHE``."""
+    return os.environ.get("DOCXTRACT_NO_CACHE", "").lower() not in ("1", "true", "yes")
+
+
+@functools.lru_cache(maxsize=32)
+def _file_sha256(path: str, size: int, mtime_ns: int) -> str:
+    """Hash a file's bytes (memoized per path, size and modification time)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _content_hash(path: Path) -> str:
+    """Hash a file's bytes, reusing the digest while its size and mtime are unchanged."""
+    stat = os.stat(path)
+    return _file_sha256(str(path), stat.st_size, stat.st_mtime_ns)
+
+
+def prompt_version() -> str:
+    """
+    Return a version string that changes whenever a prompt is edited.
+
+    It hashes the contents (not the modification times) of the prompt templates
+    and PROMPT_SOURCES, so checkouts and copies keep the key stable.
+    """
+    digest = hashlib.sha256(str(CACHE_VERSION).encode())
+    for path in (*sorted(PROMPTS_DIR.glob("*.md")), *PROMPT_SOURCES):
+        digest.update(f"|{path.name}:{_content_hash(path)}".encode())
+    return digest.hexdigest()
+
+
+def cache_key(
+    pdf_path: Path, model: Optional[str] = None, api_version: Optional[str] = None
+) -> Optional[str]:
+    """
+    Compute the cache key for a PDF file.
+
+    Args:
+        pdf_path: Path to the source PDF
+        model: Model deployment producing the cached results
+        api_version: Azure OpenAI API version used for the requests
+
+    Returns:
+        Hex digest key, or None if the file cannot be read
+    """
+    try:
+        content_hash = _content_hash(pdf_path)
+    except OSError:
+        return None
+    return hashlib.sha256(
+        f"{content_hash}|{model}|{api_version}|{prompt_version()}".encode()
+    ).hexdigest()
+
+
+def load_cache_entry(key: str) -> Dict[str, Any]:
+    """Load the cached results for a key (empty if missing or unreadable)."""
+    try:
+        with open(get_cache_dir() / f"{key}.json", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return entry if isinstance(entry, dict) else {}
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Write text to path via a temp file and rename, ignoring write errors."""
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def save_cache_entry(key: str, values: Dict[str, Any]) -> None:
+    """Merge values into the cache entry for a key, ignoring write errors."""
+    entry = load_cache_entry(key)
+    entry.update(values)
+    _write_atomic(
+        get_cache_dir() / f"{key}.json", json.dumps(entry, ensure_ascii=False)
+    )
+
+
+def response_cache_key(model: str, api_version: str, prompt: str) -> str:
+    """Compute the exact-match cache key for an LLM prompt."""
+    return hashlib.blake2b(
+        f"{model}|{api_version}|{prompt}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def _response_path(key: str) -> Path:
+    """Return the file holding a cached response (sharded by key prefix)."""
+    return get_cache_dir() / "responses" / key[:2] / f"{key}.txt"
+
+
+def load_response(key: str) -> Optional[str]:
+    """Load a cached LLM response, or None if it is not cached."""
+    try:
+        return _response_path(key).read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def save_response(key: str, response: str) -> None:
+    """Cache an LLM response, ignoring write errors."""
+    _write_atomic(_response_path(key), response)
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache of section summaries for one section title.
+
+    Vectors are L2-normalized and stored in
+    ``sem/<model>/<api version>/<prompt version>/<section>.npy`` with the matching
+    summaries in a sibling JSON file, so a lookup is one inner product. Like the
+    other layers, the index starts afresh when a prompt or the model changes.
+    numpy is imported on first use, so runs without embeddings never load it.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        api_version: Optional[str],
+        section_title: str,
+        threshold: float,
+    ):
+        """
+        Args:
+            model: Model deployment the summaries were produced with
+            api_version: Azure OpenAI API version the summaries were produced with
+            section_title: Section title this index is restricted to
+            threshold: Minimum cosine similarity for a cached summary to be reused
+        """
+        base = (
+            get_cache_dir()
+            / "sem"
+            / _safe_name(model)
+            / _safe_name(api_version or "")
+            / prompt_version()[:16]
+            / _safe_name(section_title)
+        )
+        self.vectors_path = base.with_suffix(".npy")
+        self.summaries_path = base.with_suffix(".json")
+        self.threshold = threshold
+
+    def _load(self) -> Tuple[Optional["np.ndarray"], List[str]]:
+        """Load the stored vectors and summaries (None, [] if missing or corrupt)."""
+        import numpy as np
+
+        try:
+            vectors = np.load(self.vectors_path)
+            with open(self.summaries_path, encoding="utf-8") as f:
+                summaries = json.load(f)
+        except (OSError, ValueError):
+            return None, []
+        if len(vectors) != len(summaries):
+            return None, []
+        return vectors, summaries
+
+    def lookup(self, embedding: List[float]) -> Optional[str]:
+        """Return the summary of the most similar cached section above the threshold."""
+        import numpy as np
+
+        vectors, summaries = self._load()
+        if vectors is None or not summaries:
+            return None
+        scores = vectors @ _normalize(embedding)
+        best = int(np.argmax(scores))
+        return summaries[best] if scores[best] >= self.threshold else None
+
+    def add(self, embedding: List[float], summary: str) -> None:
+        """Add a section embedding and its summary, ignoring write errors."""
+        import numpy as np
+
+        vectors, summaries = self._load()
+        vector = _normalize(embedding)[np.newaxis, :]
+        if vectors is not None and vectors.shape[1] == vector.shape[1]:
+            vector = np.vstack([vectors, vector])
+        else:
+            summaries = []
+        summaries.append(summary)
+
+        tmp_path = self.vectors_path.with_suffix(f".{os.getpid()}.tmp.npy")
+        try:
+            self.vectors_path.parent.mkdir(parents=True, exist_ok=True)
+            np.save(tmp_path, vector)
+            os.replace(tmp_path, self.vectors_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            return
+        _write_atomic(self.summaries_path, json.dumps(summaries, ensure_ascii=False))
+
+
+def _safe_name(name: str) -> str:
+    """Turn a model or section name into a safe file name."""
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in name) or "_"
+
+
+def _normalize(embedding: List[float]) -> "np.ndarray":
+    """Return an embedding as a unit-length float32 vector."""
+    import numpy as np
+
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def cached_step(
+    field: str,
+    should_cache: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    llm_settings: Optional[
+        Callable[[Dict[str, Any]], Tuple[Optional[str], Optional[str]]]
+    ] = None,
+) -> Callable:
+    """
+    Cache one output field of a pipeline step on disk.
+
+    The wrapped step (sync or async) is skipped when ``field`` is already cached
+    for the input document's PDF; the cached value is stored into the inputs.
+    Fresh values are stored only if ``should_cache(result)`` is true (by default,
+    if the value is truthy), so failed LLM results are retried on the next run.
+
+    Args:
+        field: Key of the step output to cache (e.g. "overall_summary")
+        should_cache: Predicate on the step's result dict deciding whether the
+            fresh value is complete enough to store
+        llm_settings: Returns the (model deployment, API version) the step will
+            use for the given inputs; both are part of the cache key
+
+    Returns:
+        Decorator for a step taking and returning a pipeline dict
+    """
+
+    def lookup(inputs: Dict[str, Any]):
+        if not cache_enabled():
+            return None, None
+        model, api_version = llm_settings(inputs) if llm_settings else (None, None)
+        key = cache_key(Path(inputs["document"].source_file), model, api_version)
+        if key is None:
+            return None, None
+        entry = load_cache_entry(key)
+        if field in entry:
+            inputs[field] = entry[field]
+            return key, inputs
+        return key, None
+
+    def store(key: Optional[str], result: Dict[str, Any]) -> None:
+        if key is None:
+            return
+        if should_cache(result) if should_cache else result.get(field):
+            save_cache_entry(key, {field: result[field]})
+
+    def decorator(step: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(step):
+
+            @functools.wraps(step)
+            async def async_wrapper(inputs: Dict[str, Any]) -> Dict[str, Any]:
+                key, cached = lookup(inputs)
+                if cached is not None:
+                    return cached
+                result = await step(inputs)
+                store(key, result)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(step)
+        def wrapper(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            key, cached = lookup(inputs)
+            if cached is not None:
+                return cached
+            result = step(inputs)
+            store(key, result)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -2,7 +2,7 @@
 LangChain LCEL pipeline for document extraction and summarization.
 
 This pipeline orchestrates the following steps:
-1. Extract PDF
+1. Extract PDF (pages are streamed straight into the section parser)
 2. Parse sections
 3. LLM summarize sections
 4. LLM summarize overall
@@ -15,23 +15,64 @@ Markdown output includes:
 - Application ideas
 - Chinese summary
 
+The first step creates a single state dict that every later step updates in
+place and passes on, so no per-step copies are made.
+
+The LLM-bound steps also provide async variants, so `DocExtractPipeline.ainvoke`
+summarizes sections concurrently and generates points and ideas in parallel; the
+sync steps get the same overlap from thread pools. `asummarize_documents` runs
+several PDFs through the same steps as a staged pipeline, so extracting one PDF
+overlaps the LLM calls for the previous one.
+
 See .github/copilot-instructions.md for prompt and output standards.
 """
 
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from langchain_core.runnables import Runnable, RunnableLambda
+
+from .cache import PROMPTS_DIR, cached_step
+from .parser import DEFAULT_PARSER
+from .summarizer import ChineseSummarizer, is_short_document
+
+if TYPE_CHECKING:
+    from .extract import PDFExtractor
 
-from langchain.schema import HumanMessage
-from langchain_core.runnables import RunnableLambda
+# Placeholder stored as `overall_summary` when the overall summary step fails
+OVERALL_SUMMARY_FAILED = "(Failed to generate overall summary)"
 
-from .extract import PDFExtractor
-from .parser import SectionParser
-from .summarizer import ChineseSummarizer
+
+@functools.cache
+def get_extractor() -> "PDFExtractor":
+    """
+    Return the PDF extractor shared by every document (it holds no state).
+
+    PyMuPDF is imported here, on first extraction, so importing this module
+    stays cheap.
+    """
+    from .extract import PDFExtractor
+
+    return PDFExtractor()
 
 
 def extract_pdf_step(pdf_path: Path) -> Dict[str, Any]:
     """Extract text and metadata from the PDF file."""
-    extractor = PDFExtractor()
+    extractor = get_extractor()
     try:
         doc = extractor.extract_document(pdf_path)
     except Exception as e:
@@ -39,60 +80,179 @@ def extract_pdf_step(pdf_path: Path) -> Dict[str, Any]:
     return {"document": doc}
 
 
+def extract_and_parse_step(pdf_path: Path) -> Dict[str, Any]:
+    """Extract the PDF and parse its sections in one streaming pass."""
+    extractor = get_extractor()
+    try:
+        doc = extractor.extract_document(pdf_path, parser=DEFAULT_PARSER)
+    except Exception as e:
+        raise RuntimeError(f"Failed to extract PDF: {e}")
+    return {"document": doc}
+
+
 def parse_sections_step(inputs: Dict[str, Any]) -> Dict[str, Any]:
     """Parse the document into logical sections."""
-    parser = SectionParser()
     try:
-        doc = parser.parse_document(inputs["document"])
+        inputs["document"] = DEFAULT_PARSER.parse_document(inputs["document"])
     except Exception as e:
         raise RuntimeError(f"Failed to parse sections: {e}")
-    return {"document": doc}
+    return inputs
+
+
+def get_summarizer(inputs: Dict[str, Any]) -> ChineseSummarizer:
+    """Reuse the summarizer created by an earlier step, or construct a new one."""
+    return inputs.get("summarizer") or ChineseSummarizer()
+
+
+def all_sections_summarized(result: Dict[str, Any]) -> bool:
+    """
+    Check that every core section with content got a summary.
+
+    Results with a failed section are not cached, so that section is retried on
+    the next run. Short documents have no section summaries and are not cached.
+    """
+    summaries = result["section_summaries"]
+    sent = [
+        section.title
+        for section in ChineseSummarizer.select_core_sections(
+            result["document"].sections
+        )
+        if section.content.strip()
+    ]
+    return bool(sent) and all(summaries.get(title) for title in sent)
+
 
+def overall_summary_complete(result: Dict[str, Any]) -> bool:
+    """Check that the overall summary succeeded and was built from every section."""
+    if not has_overall_summary(result["overall_summary"]):
+        return False
+    return is_short_document(result["document"]) or all_sections_summarized(result)
 
+
+def summarizer_settings(inputs: Dict[str, Any]) -> Tuple[str, str]:
+    """Attach the summarizer to the inputs and return its deployment and API version."""
+    summarizer = inputs["summarizer"] = get_summarizer(inputs)
+    return summarizer.deployment_name, summarizer.api_version
+
+
+@cached_step("section_summaries", all_sections_summarized, summarizer_settings)
 def summarize_sections_step(inputs: Dict[str, Any]) -> Dict[str, Any]:
     """Summarize each section using the LLM."""
-    summarizer = ChineseSummarizer()
+    summarizer = get_summarizer(inputs)
     doc = inputs["document"]
     try:
-        section_summaries = summarizer.summarize_all_sections(doc)
+        # Short documents skip the per-section map and are summarized in one call
+        if is_short_document(doc):
+            section_summaries = {}
+        else:
+            section_summaries = summarizer.summarize_all_sections(doc)
     except Exception as e:
         raise RuntimeError(f"Failed to summarize sections: {e}")
-    return {"document": doc, "section_summaries": section_summaries}
+    inputs.update(summarizer=summarizer, section_summaries=section_summaries)
+    return inputs
 
 
-def summarize_overall_step(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    """Generate an overall summary from all section summaries."""
-    summarizer = ChineseSummarizer()
+@cached_step("section_summaries", all_sections_summarized, summarizer_settings)
+async def asummarize_sections_step(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarize all core sections concurrently using the LLM."""
+    summarizer = get_summarizer(inputs)
     doc = inputs["document"]
-    section_summaries = inputs["section_summaries"]
     try:
-        overall_summary = summarizer.summarize_overall(section_summaries, doc.title)
+        if is_short_document(doc):
+            section_summaries = {}
+        else:
+            section_summaries = await summarizer.asummarize_all_sections(doc)
     except Exception as e:
-        overall_summary = "(Failed to generate overall summary)"
-    return {
-        "document": doc,
-        "section_summaries": section_summaries,
-        "overall_summary": overall_summary,
-    }
+        raise RuntimeError(f"Failed to summarize sections: {e}")
+    inputs.update(summarizer=summarizer, section_summaries=section_summaries)
+    return inputs
 
 
+@cached_step("overall_summary", overall_summary_complete, summarizer_settings)
+def summarize_overall_step(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate an overall summary from section summaries (or directly, if short)."""
+    summarizer = get_summarizer(inputs)
+    doc = inputs["document"]
+    section_summaries = inputs["section_summaries"]
+    if not summarizer.is_configured():
+        # Nothing to call: skip the summarizer (and its event loop) entirely
+        overall_summary = OVERALL_SUMMARY_FAILED
+    else:
+        try:
+            if is_short_document(doc):
+                overall_summary = summarizer.summarize_document(doc)
+            else:
+                overall_summary = summarizer.summarize_overall(
+                    section_summaries, doc.title
+                )
+        except Exception:
+            overall_summary = OVERALL_SUMMARY_FAILED
+    inputs.update(summarizer=summarizer, overall_summary=overall_summary)
+    return inputs
+
+
+@cached_step("overall_summary", overall_summary_complete, summarizer_settings)
+async def asummarize_overall_step(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Asynchronously generate an overall summary from all section summaries."""
+    summarizer = get_summarizer(inputs)
+    doc = inputs["document"]
+    section_summaries = inputs["section_summaries"]
+    if not summarizer.is_configured():
+        overall_summary = OVERALL_SUMMARY_FAILED
+    else:
+        try:
+            if is_short_document(doc):
+                overall_summary = await summarizer.asummarize_document(doc)
+            else:
+                overall_summary = await summarizer.asummarize_overall(
+                    section_summaries, doc.title
+                )
+        except Exception:
+            overall_summary = OVERALL_SUMMARY_FAILED
+    inputs.update(summarizer=summarizer, overall_summary=overall_summary)
+    return inputs
+
+
+TAKE_AWAY_PROMPT_PATH = PROMPTS_DIR / "take_away_prompt.md"
+IDEAS_PROMPT_PATH = PROMPTS_DIR / "generate_ideas_prompt.md"
+
+
+@functools.lru_cache(maxsize=16)
 def load_prompt_template(path: Path) -> str:
-    """Load prompt template from file."""
+    """Load prompt template from file (cached, templates are static at runtime)."""
     return path.read_text(encoding="utf-8").strip()
 
 
-def get_take_away_prompt(summary: str) -> str:
-    template = load_prompt_template(
-        Path(__file__).parent / "prompts" / "take_away_prompt.md"
+@functools.lru_cache(maxsize=16)
+def _template_parts(template: str) -> Tuple[str, ...]:
+    """Split a template around its `{summary}` fields (computed once per template)."""
+    return tuple(
+        part.replace("{{", "{").replace("}}", "}")
+        for part in template.split("{summary}")
     )
-    return template.format(summary=summary)
+
+
+def preload_prompt_templates() -> None:
+    """Load and split the bundled prompt templates ahead of the first LLM call."""
+    for path in (TAKE_AWAY_PROMPT_PATH, IDEAS_PROMPT_PATH):
+        _template_parts(load_prompt_template(path))
+
+
+def get_take_away_prompt(summary: str) -> str:
+    """
+    Build the important-points prompt.
+
+    The template keeps `{summary}` at its tail so the static instructions form a
+    stable prefix that the provider can serve from its prompt cache.
+    """
+    template = load_prompt_template(TAKE_AWAY_PROMPT_PATH)
+    return summary.join(_template_parts(template))
 
 
 def get_ideas_prompt(summary: str) -> str:
-    template = load_prompt_template(
-        Path(__file__).parent / "prompts" / "generate_ideas_prompt.md"
-    )
-    return template.format(summary=summary)
+    """Build the application-ideas prompt (static instructions first, summary last)."""
+    template = load_prompt_template(IDEAS_PROMPT_PATH)
+    return summary.join(_template_parts(template))
 
 
 def generate_important_points(
@@ -100,12 +260,10 @@ def generate_important_points(
 ) -> str:
     """Generate important points using the LLM."""
     try:
-        if not summarizer.llm:
+        if not summarizer.llm or not overall_summary:
             return ""
 
-        points_prompt = get_take_away_prompt(overall_summary)
-        response = summarizer.llm.invoke([HumanMessage(content=points_prompt)])
-        return response.content.strip()
+        return summarizer.invoke_prompt(get_take_away_prompt(overall_summary))
     except Exception:
         return "(Failed to generate important points)"
 
@@ -115,69 +273,239 @@ def generate_application_ideas(
 ) -> str:
     """Generate application ideas using the LLM."""
     try:
-        if not summarizer.llm:
+        if not summarizer.llm or not overall_summary:
             return ""
 
-        ideas_prompt = get_ideas_prompt(overall_summary)
-        response = summarizer.llm.invoke([HumanMessage(content=ideas_prompt)])
-        return response.content.strip()
+        return summarizer.invoke_prompt(get_ideas_prompt(overall_summary))
     except Exception:
         return "(Failed to generate application ideas)"
 
 
+async def agenerate_important_points(
+    summarizer: ChineseSummarizer, overall_summary: str
+) -> str:
+    """Asynchronously generate important points using the LLM."""
+    try:
+        if not summarizer.llm or not overall_summary:
+            return ""
+
+        return await summarizer.ainvoke_prompt(get_take_away_prompt(overall_summary))
+    except Exception:
+        return "(Failed to generate important points)"
+
+
+async def agenerate_application_ideas(
+    summarizer: ChineseSummarizer, overall_summary: str
+) -> str:
+    """Asynchronously generate application ideas using the LLM."""
+    try:
+        if not summarizer.llm or not overall_summary:
+            return ""
+
+        return await summarizer.ainvoke_prompt(get_ideas_prompt(overall_summary))
+    except Exception:
+        return "(Failed to generate application ideas)"
+
+
+def has_overall_summary(overall_summary: str) -> bool:
+    """Return True if there is a real overall summary to build points and ideas from."""
+    return bool(overall_summary) and overall_summary != OVERALL_SUMMARY_FAILED
+
+
 def important_points_and_ideas_step(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    """Generate top-5 important points and application ideas using the LLM."""
-    summarizer = ChineseSummarizer()
-    doc = inputs["document"]
+    """
+    Generate top-5 important points and application ideas using the LLM.
+
+    Both only depend on the overall summary, so the two blocking calls run in
+    parallel threads (the async variant gathers them on the event loop instead).
+    """
+    summarizer = get_summarizer(inputs)
     overall_summary = inputs["overall_summary"]
 
-    points = generate_important_points(summarizer, overall_summary)
-    ideas = generate_application_ideas(summarizer, overall_summary)
+    if has_overall_summary(overall_summary):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            points_future = executor.submit(
+                generate_important_points, summarizer, overall_summary
+            )
+            ideas_future = executor.submit(
+                generate_application_ideas, summarizer, overall_summary
+            )
+            points, ideas = points_future.result(), ideas_future.result()
+    else:
+        points = ideas = ""
+
+    inputs.update(summarizer=summarizer, important_points=points, ideas=ideas)
+    return inputs
+
+
+async def aimportant_points_and_ideas_step(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate top-5 important points and application ideas concurrently."""
+    summarizer = get_summarizer(inputs)
+    overall_summary = inputs["overall_summary"]
+
+    if has_overall_summary(overall_summary):
+        points, ideas = await asyncio.gather(
+            agenerate_important_points(summarizer, overall_summary),
+            agenerate_application_ideas(summarizer, overall_summary),
+        )
+    else:
+        points = ideas = ""
+
+    inputs.update(summarizer=summarizer, important_points=points, ideas=ideas)
+    return inputs
+
+
+def to_markdown_step(inputs: Dict[str, Any], writer: Optional[TextIO] = None) -> str:
+    """
+    Assemble the final Markdown output from all pipeline results.
+
+    The optional blocks are rendered (or left empty) first and the fixed skeleton
+    is a single f-string, so the document is built in one pass and handed to
+    ``writer`` (e.g. an open output file) in one write. With a writer, an empty
+    string is returned.
+    """
+    title = inputs["document"].title
+    important_points = inputs.get("important_points")
+    ideas = inputs.get("ideas")
+    overall_summary = inputs.get("overall_summary") or OVERALL_SUMMARY_FAILED
+
+    title_block = f"# {title}\n\n" if title else ""
+    points_block = (
+        f"## Top-5 Important Points\n\n{important_points}\n\n"
+        if important_points
+        else ""
+    )
+    ideas_block = f"## Application Ideas\n\n{ideas}\n\n" if ideas else ""
+    markdown = (
+        f"{title_block}{points_block}{ideas_block}"
+        f"## Chinese Summary\n\n{overall_summary}\n\n"
+        "---\n\n*Chinese summary generated using GPT-4.1*"
+    )
+    if writer is None:
+        return markdown
+    writer.write(markdown)
+    return ""
 
-    return {
-        "document": doc,
-        "section_summaries": inputs["section_summaries"],
-        "overall_summary": overall_summary,
-        "important_points": points,
-        "ideas": ideas,
-    }
 
+# Bound on documents waiting between two stages of `asummarize_documents`
+STAGE_QUEUE_SIZE = 4
 
-def to_markdown_step(inputs: Dict[str, Any]) -> str:
-    """Assemble the final Markdown output from all pipeline results."""
-    doc = inputs["document"]
-    lines = []
-    if doc.title:
-        lines.append(f"# {doc.title}")
-        lines.append("")
-    if inputs.get("important_points"):
-        lines.append("## Top-5 Important Points")
-        lines.append("")
-        lines.append(inputs["important_points"])
-        lines.append("")
-    if inputs.get("ideas"):
-        lines.append("## Application Ideas")
-        lines.append("")
-        lines.append(inputs["ideas"])
-        lines.append("")
-    lines.append("## Chinese Summary")
-    lines.append("")
-    lines.append(
-        inputs.get("overall_summary") or "(Failed to generate overall summary)"
+
+async def asummarize_documents(
+    pdf_paths: Iterable[Path], queue_size: int = STAGE_QUEUE_SIZE
+) -> List[Union[Dict[str, Any], Exception]]:
+    """
+    Run several PDFs through the summary pipeline as overlapping stages.
+
+    Extraction (in a worker thread), section and overall summaries, and points
+    and ideas each run in their own task, connected by bounded queues, so stage
+    N of one document runs while stage N+1 handles the previous one. All
+    documents share one summarizer and its HTTP connection pool.
+
+    Args:
+        pdf_paths: PDF files to summarize
+        queue_size: Maximum number of documents waiting between two stages
+
+    Returns:
+        One entry per path, in input order: the pipeline results (as returned by
+        `DocSummaryPipeline`) or the exception that stopped that document
+
+    Raises:
+        RuntimeError: If a stage ended without producing a result for every path
+    """
+    paths = list(pdf_paths)
+    # Filled by the last stage; every slot is set once all stages finish
+    results: List[Optional[Union[Dict[str, Any], Exception]]] = [None] * len(paths)
+    summarizer = ChineseSummarizer()
+
+    async def extract(out: asyncio.Queue) -> None:
+        for index, path in enumerate(paths):
+            try:
+                inputs = await asyncio.to_thread(extract_and_parse_step, path)
+                inputs["summarizer"] = summarizer
+            except Exception as e:
+                inputs = e
+            await out.put((index, inputs))
+        await out.put(None)
+
+    def stage(*steps: Callable) -> Callable:
+        async def run(inp: asyncio.Queue, out: Optional[asyncio.Queue]) -> None:
+            while (item := await inp.get()) is not None:
+                index, inputs = item
+                if not isinstance(inputs, Exception):
+                    try:
+                        for step in steps:
+                            inputs = await step(inputs)
+                    except Exception as e:
+                        inputs = e
+                if out is None:
+                    results[index] = inputs
+                else:
+                    await out.put((index, inputs))
+            if out is not None:
+                await out.put(None)
+
+        return run
+
+    extracted = asyncio.Queue(maxsize=queue_size)
+    summarized = asyncio.Queue(maxsize=queue_size)
+    try:
+        await asyncio.gather(
+            extract(extracted),
+            stage(asummarize_sections_step, asummarize_overall_step)(
+                extracted, summarized
+            ),
+            stage(aimportant_points_and_ideas_step)(summarized, None),
+        )
+    finally:
+        await summarizer.aclose()
+    missing = [str(path) for path, result in zip(paths, results) if result is None]
+    if missing:
+        raise RuntimeError(f"No pipeline result for: {', '.join(missing)}")
+    return results
+
+
+# LCEL pipeline definition (LLM steps carry async variants for `.ainvoke`).
+# Pipelines are built on first use; `DocExtractPipeline` and `DocSummaryPipeline`
+# remain importable as module attributes via `__getattr__`.
+@functools.cache
+def build_llm_pipeline() -> Runnable:
+    """
+    Build the LLM steps, taking the state dict returned by `extract_and_parse_step`.
+
+    Callers that own the summarizer put it in that dict under "summarizer" and
+    close it themselves once the pipeline has run.
+    """
+    return (
+        RunnableLambda(summarize_sections_step, afunc=asummarize_sections_step)
+        | RunnableLambda(summarize_overall_step, afunc=asummarize_overall_step)
+        | RunnableLambda(
+            important_points_and_ideas_step, afunc=aimportant_points_and_ideas_step
+        )
     )
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    lines.append("*Chinese summary generated using GPT-4.1*")
-    return "\n".join(lines)
-
-
-# LCEL pipeline definition
-DocExtractPipeline = (
-    RunnableLambda(extract_pdf_step)
-    | RunnableLambda(parse_sections_step)
-    | RunnableLambda(summarize_sections_step)
-    | RunnableLambda(summarize_overall_step)
-    | RunnableLambda(important_points_and_ideas_step)
-    | RunnableLambda(to_markdown_step)
-)
+
+
+@functools.cache
+def build_summary_pipeline() -> Runnable:
+    """
+    Build the pipeline up to (but excluding) Markdown rendering.
+
+    Callers can stream its results straight to a file with
+    `to_markdown_step(results, writer)`.
+    """
+    return RunnableLambda(extract_and_parse_step) | build_llm_pipeline()
+
+
+@functools.cache
+def build_pipeline() -> Runnable:
+    """Build the full pipeline, returning the Markdown summary string."""
+    return build_summary_pipeline() | RunnableLambda(to_markdown_step)
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily construct the module-level pipeline objects."""
+    if name == "DocExtractPipeline":
+        return build_pipeline()
+    if name == "DocSummaryPipeline":
+        return build_summary_pipeline()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
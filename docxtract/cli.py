@@ -5,14 +5,13 @@ Output includes: title, top-5 points, application ideas, and a Chinese summary.
 See .github/copilot-instructions.md for prompt and output standards.
 """
 
+import asyncio
+import os
 from pathlib import Path
 from typing import Optional
 
 import typer
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-
-from .chain import DocExtractPipeline
 
 # Initialize Typer app and Rich console
 app = typer.Typer(
@@ -39,6 +38,9 @@ def summary(
     preview: bool = typer.Option(
         False, "--preview", "-p", help="Preview the output without saving to file"
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Ignore and don't write the on-disk LLM cache"
+    ),
 ) -> None:
     """
     Extract and summarize an academic PDF, outputting a Markdown summary.
@@ -46,6 +48,26 @@ def summary(
     Output includes: title, top-5 points, application ideas, and a Chinese summary.
     See .github/copilot-instructions.md for prompt and output standards.
     """
+    # Imported here so `version` and `--help` don't load LangChain and PyMuPDF
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    from .chain import build_llm_pipeline, extract_and_parse_step, to_markdown_step
+    from .summarizer import ChineseSummarizer
+
+    if no_cache:
+        os.environ["DOCXTRACT_NO_CACHE"] = "1"
+
+    async def run_pipeline():
+        summarizer = ChineseSummarizer()
+        try:
+            inputs = await asyncio.to_thread(extract_and_parse_step, pdf_path)
+            inputs["summarizer"] = summarizer
+            return await build_llm_pipeline().ainvoke(inputs)
+        finally:
+            # Close the summarizer's shared HTTP client on the loop that used it,
+            # whether or not the pipeline succeeded
+            await summarizer.aclose()
+
     # Determine output path if not provided
     if not output and not preview:
         output_dir = Path("summaries")
@@ -61,18 +83,21 @@ def summary(
             # Step 1: Run the summary pipeline
             task = progress.add_task("Generating Chinese summary...", total=None)
             try:
-                summary_md = DocExtractPipeline.invoke(pdf_path)
-                if summary_md:
+                results = asyncio.run(run_pipeline())
+                if results:
                     if not preview:
-                        with open(output, "w", encoding="utf-8") as f:
-                            f.write(summary_md)
+                        # Stream the Markdown straight into a buffered file
+                        with open(
+                            output, "w", encoding="utf-8", buffering=64 * 1024
+                        ) as f:
+                            to_markdown_step(results, f)
                         progress.update(task, description=f"✓ Saved to {output}")
                         console.print(
                             f"\n[green]✓ Successfully extracted to: {output}[/green]"
                         )
                     else:
                         console.print("\n[bold]Preview of summary markdown:[/bold]")
-                        console.print(summary_md)
+                        console.print(to_markdown_step(results))
                     progress.update(
                         task, description="✓ Chinese summary generated (pipeline)"
                     )
@@ -9,12 +9,55 @@ This module provides the PDFExtractor class, which handles:
 See .github/copilot-instructions.md for documentation and code style standards.
 """
 
+import itertools
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 import fitz  # PyMuPDF
 
 from .models import DocumentSection, ExtractedDocument
+from .parser import SectionParser
+
+# Plain-text extraction flags: no sort pass and ligatures expanded ("ﬁ" -> "fi"),
+# which is cheaper and keeps regex-based header detection reliable. Reading order
+# is still the PDF content order, so top-of-page title lines stay first.
+TEXT_FLAGS = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES
+
+# Minimum pages per worker before extraction is split across processes.
+# PyMuPDF is not thread-safe and holds the GIL, so parallelism needs processes,
+# each opening its own document handle. Starting workers and reopening the
+# document outweighs the gain on typical papers, so only very large PDFs qualify.
+PARALLEL_PAGE_THRESHOLD = 256
+
+# Pages per worker task; results are yielded batch by batch in page order
+PARALLEL_BATCH_PAGES = 32
+
+# Title detection stop lines: lowercase prefixes and substrings marking author,
+# affiliation or keyword lines (plain str checks, no regex needed) ...
+_AUTHOR_PREFIXES = ("author", "email", "university", "department", "keywords")
+_AFFILIATION_WORDS = ("research", "institute", "lab", "group")
+
+# ... plus, compiled once, comma-separated author lists or a single "First Last" name
+_TITLE_STOP_RE = re.compile(
+    r"[a-zA-Z .,'-]+\d?(?:,\s*[a-zA-Z .,'-]+\d?)+$"
+    r"|[A-Z][a-zA-Z'`-]+ [A-Z][a-zA-Z'`-]+$"
+)
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Extract text for pages [start, stop) using a private document handle."""
+    doc = fitz.open(pdf_path)
+    try:
+        return [
+            doc.load_page(page_num).get_text("text", sort=False, flags=TEXT_FLAGS)
+            for page_num in range(start, stop)
+        ]
+    finally:
+        doc.close()
 
 
 class PDFExtractor:
@@ -34,6 +77,26 @@ class PDFExtractor:
         Returns:
             Full text content of the PDF
 
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            Exception: If PDF cannot be read
+        """
+        # Collect page texts and join once (linear, unlike repeated +=)
+        return "\n".join(self.iter_page_texts(pdf_path)).strip()
+
+    def iter_page_texts(self, pdf_path: Path) -> Iterator[str]:
+        """
+        Yield the text of each PDF page in order.
+
+        Pages are read one at a time, so only the current page is held in memory;
+        very large PDFs are extracted across worker processes in page batches.
+
+        Args:
+            pdf_path: Path to the PDF file
+
+        Yields:
+            Text content of each page
+
         Raises:
             FileNotFoundError: If PDF file doesn't exist
             Exception: If PDF cannot be read
@@ -43,21 +106,57 @@ class PDFExtractor:
 
         try:
             doc = fitz.open(pdf_path)
-            full_text = ""
-
-            for page_num in range(doc.page_count):
-                page = doc.load_page(page_num)
-                text = page.get_text()
-                full_text += text + "\n"
+            page_count = doc.page_count
+            workers = min(os.cpu_count() or 1, page_count // PARALLEL_PAGE_THRESHOLD)
 
-            doc.close()
-            return full_text.strip()
+            if workers > 1:
+                doc.close()
+                yield from self._extract_pages_parallel(pdf_path, page_count, workers)
+            else:
+                try:
+                    for page_num in range(page_count):
+                        page = doc.load_page(page_num)
+                        yield page.get_text("text", sort=False, flags=TEXT_FLAGS)
+                finally:
+                    doc.close()
 
         except Exception as e:
             raise Exception(
                 f"Failed to extract text from PDF: {str(e)}. Check if the file is corrupted, encrypted, or not a valid PDF."
             )
 
+    def _extract_pages_parallel(
+        self, pdf_path: Path, page_count: int, workers: int
+    ) -> Iterator[str]:
+        """
+        Extract page texts across worker processes, yielding them in page order.
+
+        Workers are spawned rather than forked: extraction runs on pipeline worker
+        threads, and forking a multithreaded process can deadlock the child.
+
+        Args:
+            pdf_path: Path to the PDF file
+            page_count: Total number of pages in the document
+            workers: Number of worker processes
+
+        Yields:
+            Text content of each page
+        """
+        starts = range(0, page_count, PARALLEL_BATCH_PAGES)
+        stops = [min(start + PARALLEL_BATCH_PAGES, page_count) for start in starts]
+        pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        try:
+            # map yields batches in submission order as they complete
+            for chunk in pool.map(
+                _extract_page_range, [str(pdf_path)] * len(starts), starts, stops
+            ):
+                yield from chunk
+        finally:
+            # Don't run the remaining batches if the consumer stops early
+            pool.shutdown(cancel_futures=True)
+
     def detect_title(self, text: str) -> Optional[str]:
         """
         Heuristic-based title detection from the top of the document.
@@ -65,8 +164,6 @@ class PDFExtractor:
         - Stop at section headers, author/affiliation/keywords lines, or single name lines
         - Only return title if length is between 10 and 120 chars (inclusive)
         """
-        import re
-
         lines = text.split("\n")
         title_lines = []
         non_empty_count = 0
@@ -81,24 +178,13 @@ class PDFExtractor:
             if lower in ("abstract", "introduction", "keywords"):
                 break
 
-            if re.match(r"^keywords\s*:?", line, re.IGNORECASE):
-                break
-
-            # If line is likely author/affiliation, break but do not append
+            # If line is likely keywords/author/affiliation, break but do not append
             if (
                 "@" in line
-                or lower.startswith(("author", "email", "university", "department"))
-                or any(
-                    word in lower for word in ["research", "institute", "lab", "group"]
-                )
-                or re.match(r"^authors?\s*:?", line, re.IGNORECASE)
-                or re.match(
-                    r"^[a-zA-Z .,'-]+\d?(,\s*[a-zA-Z .,'-]+\d?)+$", line
-                )  # author list
-                or ("," in line and len(line.split(",")) > 1 and len(line) < 80)
-                or re.match(
-                    r"^[A-Z][a-zA-Z'`-]+ [A-Z][a-zA-Z'`-]+$", line
-                )  # single name
+                or lower.startswith(_AUTHOR_PREFIXES)
+                or any(word in lower for word in _AFFILIATION_WORDS)
+                or ("," in line and len(line) < 80)
+                or _TITLE_STOP_RE.match(line)
             ):
                 break
 
@@ -116,16 +202,24 @@ class PDFExtractor:
 
         return None
 
-    def extract_document(self, pdf_path: Path) -> ExtractedDocument:
+    def extract_document(
+        self, pdf_path: Path, parser: Optional[SectionParser] = None
+    ) -> ExtractedDocument:
         """
         Extract complete document structure from PDF.
 
         Args:
             pdf_path: Path to the PDF file
+            parser: Optional section parser; when given, pages are streamed into
+                it and the returned document already holds the parsed sections
 
         Returns:
-            ExtractedDocument with basic text extraction and detected title
+            ExtractedDocument with the detected title and either a single
+            "Full Content" section or the parsed sections
         """
+        if parser is not None:
+            return self._extract_parsed_document(pdf_path, parser)
+
         full_text = self.extract_text_from_pdf(pdf_path)
         title = self.detect_title(full_text)
 
@@ -135,3 +229,33 @@ class PDFExtractor:
         return ExtractedDocument(
             title=title, sections=[main_section], source_file=str(pdf_path)
         )
+
+    def _extract_parsed_document(
+        self, pdf_path: Path, parser: SectionParser
+    ) -> ExtractedDocument:
+        """
+        Stream page texts into the section parser without building the full text.
+
+        The title is detected from the leading pages up to the first 3 non-empty
+        lines (all `detect_title` reads), so blank cover pages are skipped and
+        peak memory stays around the largest section.
+        """
+        pages = self.iter_page_texts(pdf_path)
+        head_pages = []
+        non_empty_count = 0
+        for page in pages:
+            head_pages.append(page)
+            non_empty_count += sum(1 for line in page.split("\n") if line.strip())
+            if non_empty_count >= 3:
+                break
+        title = self.detect_title("\n".join(head_pages).strip())
+        lines = (
+            line
+            for page in itertools.chain(head_pages, pages)
+            for line in page.split("\n")
+        )
+        sections = parser.extract_sections_from_lines(lines)
+
+        return ExtractedDocument(
+            title=title, sections=sections, source_file=str(pdf_path)
+        )
@@ -11,10 +11,13 @@ These models are used for validation, type safety, and data interchange across t
 See .github/copilot-instructions.md for documentation and code style standards.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
+# Default SummaryRequest focus areas; each request gets its own list copy.
+DEFAULT_FOCUS_AREAS: Tuple[str, ...] = ("main contributions", "methodology", "results")
+
 
 class DocumentSection(BaseModel):
     """Represents a section of an academic paper."""
@@ -40,10 +43,13 @@ class ExtractedDocument(BaseModel):
 
     def get_section(self, section_name: str) -> Optional[DocumentSection]:
         """Get a specific section by name."""
-        for section in self.sections:
-            if section.title.lower() == section_name.lower():
-                return section
-        return None
+        # Lower the query once; documents have only a handful of sections, so a
+        # scan beats keeping an index in sync with in-place edits.
+        name = section_name.lower()
+        return next(
+            (section for section in self.sections if section.title.lower() == name),
+            None,
+        )
 
     def has_section(self, section_name: str) -> bool:
         """Check if document has a specific section."""
@@ -57,6 +63,6 @@ class SummaryRequest(BaseModel):
     title: Optional[str] = Field(default=None, description="Document title")
     focus_areas: Optional[List[str]] = Field(
         # Use default_factory for mutable defaults per Pydantic best practices.
-        default_factory=lambda: ["main contributions", "methodology", "results"],
+        default_factory=lambda: list(DEFAULT_FOCUS_AREAS),
         description="Key areas to focus on in the summary",
     )
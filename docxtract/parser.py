@@ -1,18 +1,104 @@
 """
 Section header detection and content parsing for docxtract.
 
-This module provides the SectionParser class, which:
+This module provides the SectionParser class (and a shared DEFAULT_PARSER), which:
 - Detects common academic section headers using regex patterns
 - Splits raw document text into structured sections for downstream processing
 
 See .github/copilot-instructions.md for documentation and code style standards.
 """
 
+import functools
+import io
 import re
-from typing import Dict, List, Optional, Tuple
+import sys
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 from .models import DocumentSection, ExtractedDocument
 
+# A line starting with "Keywords:" ends the Abstract section.
+_KEYWORDS_RE = re.compile(r"^[^\S\n]*keywords[^\S\n]*:", re.IGNORECASE | re.MULTILINE)
+
+# Flags (besides IGNORECASE) carried over from pre-compiled header patterns
+_SCOPED_FLAGS = (
+    (re.MULTILINE, "m"),
+    (re.DOTALL, "s"),
+    (re.VERBOSE, "x"),
+)
+
+# Leading inline flags such as "(?x)", which are only valid at the start of a regex
+_GLOBAL_FLAGS_RE = re.compile(r"\(\?[aiLmsux]+\)")
+
+
+def _pattern_source(pattern: Union[str, re.Pattern]) -> str:
+    """
+    Return regex source for the combined header regex.
+
+    Pre-compiled patterns keep their own flags via a scoped ``(?flags-flags:...)``
+    group, since the combined regex is otherwise case-insensitive.
+    """
+    if isinstance(pattern, str):
+        return pattern
+    on = "".join(c for flag, c in _SCOPED_FLAGS if pattern.flags & flag)
+    off = "" if pattern.flags & re.IGNORECASE else "-i"
+    return f"(?{on}{off}:{pattern.pattern})" if on or off else pattern.pattern
+
+
+def _combinable(pattern: re.Pattern) -> bool:
+    """
+    Return True if a pattern can be wrapped in the combined header regex.
+
+    Groups (named groups clash across patterns, and numbered backreferences
+    shift) and global inline flags don't survive being wrapped.
+    """
+    return not pattern.groups and not _GLOBAL_FLAGS_RE.match(pattern.pattern)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_patterns(
+    patterns: Tuple[Tuple[Union[str, re.Pattern], str], ...],
+) -> Tuple[Tuple[Tuple[re.Pattern, str], ...], Optional[re.Pattern], Dict[str, str]]:
+    """
+    Compile section patterns once per distinct pattern set.
+
+    Returns:
+        Tuple of (compiled (pattern, name) pairs, combined header regex or None
+        if the patterns can't be combined, mapping of combined-regex group names
+        to section names)
+    """
+    # Section names become every DocumentSection.title; interning them means
+    # titles from custom (e.g. config-loaded) patterns share one object too.
+    patterns = tuple((pattern, sys.intern(name)) for pattern, name in patterns)
+    # Already-compiled patterns are used as-is rather than recompiled
+    compiled = tuple(
+        (
+            pattern
+            if isinstance(pattern, re.Pattern)
+            else re.compile(pattern, re.IGNORECASE),
+            name,
+        )
+        for pattern, name in patterns
+    )
+    # All patterns merged into one alternation so each line is matched once;
+    # group g<i> corresponds to patterns[i] and earlier patterns win ties.
+    # Patterns that can't be wrapped fall back to matching one by one.
+    combined = None
+    if all(_combinable(pattern) for pattern, _ in compiled):
+        try:
+            combined = re.compile(
+                "|".join(
+                    f"(?P<g{i}>{_pattern_source(pattern)})"
+                    for i, (pattern, _) in enumerate(patterns)
+                )
+                or r"(?!)",
+                re.IGNORECASE,
+            )
+        except re.error:
+            pass
+    group_names = {f"g{i}": name for i, (_, name) in enumerate(patterns)}
+    return compiled, combined, group_names
+
 
 class SectionParser:
     """
@@ -35,17 +121,43 @@ class SectionParser:
         (r"^Bibliography\s*$", "References"),
     ]
 
-    def __init__(self, section_patterns: Optional[List[Tuple[str, str]]] = None):
+    def __init__(
+        self,
+        section_patterns: Optional[List[Tuple[Union[str, re.Pattern], str]]] = None,
+    ):
         """
         Initialize the section parser.
         Optionally accept custom section patterns for extensibility.
+
+        Patterns may be regex strings (compiled case-insensitively) or
+        pre-compiled ``re.Pattern`` objects, which are used with their own flags.
         """
         patterns = (
             section_patterns if section_patterns is not None else self.SECTION_PATTERNS
         )
-        self.compiled_patterns = [
-            (re.compile(pattern, re.IGNORECASE), name) for pattern, name in patterns
-        ]
+        # Compiled regexes are shared by every parser using the same patterns
+        self.compiled_patterns, self._combined_pattern, self._group_names = (
+            _compile_patterns(tuple(map(tuple, patterns)))
+        )
+
+    def _match_header(self, line: str) -> Optional[str]:
+        """
+        Return the section name if a stripped line is a section header.
+
+        Args:
+            line: Non-blank document line
+
+        Returns:
+            Name of the first matching section pattern, or None
+        """
+        stripped = line.strip()
+        if self._combined_pattern is not None:
+            match = self._combined_pattern.match(stripped)
+            return self._group_names[match.lastgroup] if match else None
+        for pattern, name in self.compiled_patterns:
+            if pattern.match(stripped):
+                return name
+        return None
 
     def detect_section_boundaries(self, text: str) -> List[Tuple[str, int]]:
         """
@@ -57,18 +169,31 @@ class SectionParser:
         Returns:
             List of tuples (section_name, line_number)
         """
-        lines = text.split("\n")
+        return self.detect_section_boundaries_from_lines(text.split("\n"))
+
+    def detect_section_boundaries_from_lines(
+        self, lines: List[str]
+    ) -> List[Tuple[str, int]]:
+        """
+        Detect section boundaries in text that has already been split into lines.
+
+        Args:
+            lines: Document lines
+
+        Returns:
+            List of tuples (section_name, line_number)
+        """
         boundaries = []
 
         for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
+            # Blank lines can't be headers; skip them before making a stripped copy.
+            # Indented lines are still checked, since extracted headers may be indented.
+            if not line or line.isspace():
                 continue
 
-            for pattern, section_name in self.compiled_patterns:
-                if pattern.match(line):
-                    boundaries.append((section_name, i))
-                    break
+            name = self._match_header(line)
+            if name is not None:
+                boundaries.append((name, i))
 
         return boundaries
 
@@ -83,12 +208,15 @@ class SectionParser:
             List of DocumentSection objects
         """
         lines = text.split("\n")
-        boundaries = self.detect_section_boundaries(text)
+        boundaries = self.detect_section_boundaries_from_lines(lines)
 
         if not boundaries:
             # No section headers detected; treat the entire document as a single section.
-            return [DocumentSection(title="Full Content", content=text)]
+            return [DocumentSection(title="Full Content", content=text.strip())]
 
+        # Character offset of the start of each line (plus one past the end), so
+        # section content can be sliced straight out of ``text``.
+        line_offsets = list(accumulate((len(line) + 1 for line in lines), initial=0))
         sections = []
 
         for i, (section_name, start_line) in enumerate(boundaries):
@@ -98,25 +226,82 @@ class SectionParser:
             else:
                 end_line = len(lines)
 
-            # Extract content (skip the header line)
-            section_lines = lines[start_line + 1 : end_line]
+            # Content runs from the line after the header to the next header
+            start = line_offsets[start_line + 1]
+            end = line_offsets[end_line]
 
             # Special handling: For Abstract, stop at 'Keywords:'
             if section_name.lower() == "abstract":
-                filtered_lines = []
-                for line in section_lines:
-                    if re.match(r"^keywords\s*:", line.strip(), re.IGNORECASE):
-                        break
-                    filtered_lines.append(line)
-                content = "\n".join(filtered_lines).strip()
-            else:
-                content = "\n".join(section_lines).strip()
+                keywords = _KEYWORDS_RE.search(text, start, end)
+                if keywords:
+                    end = keywords.start()
 
+            content = text[start:end].strip()
             if content:  # Only add sections with content
                 sections.append(DocumentSection(title=section_name, content=content))
 
         return sections
 
+    def extract_sections_from_lines(
+        self, lines: Iterable[str]
+    ) -> List[DocumentSection]:
+        """
+        Extract structured sections from a stream of lines in a single pass.
+
+        Produces the same sections as `extract_sections`, but only the section
+        being read is buffered, so lines can come straight from a page iterator.
+
+        Args:
+            lines: Document lines (without trailing newlines)
+
+        Returns:
+            List of DocumentSection objects
+        """
+        sections = []
+        preamble: Optional[List[str]] = []  # kept until the first header is seen
+        section_name: Optional[str] = None
+        buffer = io.StringIO()
+        truncated = False
+
+        for line in lines:
+            if not line or line.isspace():
+                name = None
+            else:
+                name = self._match_header(line)
+            if name is not None:
+                if section_name is not None:
+                    self._append_section(sections, section_name, buffer)
+                section_name = name
+                preamble = None
+                buffer = io.StringIO()
+                truncated = False
+            elif section_name is None:
+                preamble.append(line)
+            elif not truncated:
+                # Special handling: For Abstract, stop at 'Keywords:'
+                if section_name.lower() == "abstract" and _KEYWORDS_RE.match(line):
+                    truncated = True
+                    continue
+                buffer.write(line)
+                buffer.write("\n")
+
+        if section_name is None:
+            # No section headers detected; treat the entire document as a single section.
+            content = "\n".join(preamble).strip()
+            return [DocumentSection(title="Full Content", content=content)]
+
+        self._append_section(sections, section_name, buffer)
+        return sections
+
+    @staticmethod
+    def _append_section(
+        sections: List[DocumentSection], section_name: str, buffer: io.StringIO
+    ) -> None:
+        """Append a section built from a content buffer, skipping empty content."""
+        content = buffer.getvalue().strip()
+        if content:  # Only add sections with content
+            sections.append(DocumentSection(title=section_name, content=content))
+
     def parse_document(self, document: ExtractedDocument) -> ExtractedDocument:
         """
         Parse an extracted document to identify sections.
@@ -137,3 +322,8 @@ class SectionParser:
         # Update the document with parsed sections
         document.sections = parsed_sections
         return document
+
+
+# Parsers hold no per-document state, so callers using the built-in patterns
+# can share this instance instead of constructing their own.
+DEFAULT_PARSER = SectionParser()
@@ -9,22 +9,193 @@ This module provides the ChineseSummarizer class, which:
 See .github/copilot-instructions.md for prompt and documentation standards.
 """
 
+import asyncio
+import functools
+import importlib.util
+import io
+import json
 import os
-from typing import Dict, Optional
+import threading
+import time
+import weakref
+from typing import Awaitable, Dict, List, Optional, TextIO, Tuple, TypeVar
 
-from dotenv import load_dotenv
+from langchain_core.messages import HumanMessage
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
 
-load_dotenv()  # Auto-load .env at import time
-from langchain.schema import HumanMessage
-from langchain_openai import AzureChatOpenAI
+from .cache import (
+    SemanticCache,
+    cache_enabled,
+    load_response,
+    response_cache_key,
+    save_response,
+)
+from .models import DocumentSection, ExtractedDocument, SummaryRequest
 
-from .models import ExtractedDocument, SummaryRequest
+try:  # Optional fast JSON for the Batch API JSONL files
+    import orjson
+except ImportError:
+    orjson = None
+
+T = TypeVar("T")
+
+# Documents whose core sections fit in this many tokens are summarized in a
+# single LLM call instead of per-section summaries followed by a merge.
+SINGLE_CALL_TOKEN_LIMIT = 8000
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of text (about 4 characters per token)."""
+    return len(text) // 4
+
+
+@functools.cache
+def _load_env() -> None:
+    """Load .env into the environment once, on first summarizer construction."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@functools.cache
+def _token_encoder():
+    """
+    Return the GPT-4 tiktoken encoding, or None if it cannot be loaded.
+
+    tiktoken downloads its vocabulary on first use, so offline environments fall
+    back to the character-based estimate.
+    """
+    try:
+        import tiktoken
+
+        return tiktoken.encoding_for_model("gpt-4")
+    except Exception:
+        return None
+
+
+def _stop_loop(loop: asyncio.AbstractEventLoop, thread: threading.Thread) -> None:
+    """Stop an event loop running on a background thread and wait for the thread."""
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not threading.current_thread():
+        thread.join()
+        loop.close()
+
+
+# HTTP statuses worth retrying besides 5xx (the same set the openai client retries)
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429})
+
+
+def _is_transient_error(error: BaseException) -> bool:
+    """Check whether an Azure OpenAI error is transient (connection, 408/409/429, 5xx)."""
+    from openai import APIConnectionError, APIStatusError
+
+    # APITimeoutError is a subclass of APIConnectionError
+    if isinstance(error, APIConnectionError):
+        return True
+    return isinstance(error, APIStatusError) and (
+        error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    )
+
+
+def _retry_policy(max_attempts: int, base_delay: float) -> dict:
+    """
+    Build tenacity arguments that retry transient Azure OpenAI errors.
+
+    Rate limits, timeouts, conflicts, server errors and connection errors are
+    retried with jittered exponential backoff (capped at 30 seconds); other
+    errors are raised at once.
+    """
+    return {
+        "retry": retry_if_exception(_is_transient_error),
+        "wait": wait_random_exponential(multiplier=base_delay, max=30),
+        "stop": stop_after_attempt(max_attempts),
+        "reraise": True,
+    }
+
+
+def _dumps_jsonl(records: List[dict]) -> bytes:
+    """Serialize records as UTF-8 JSON Lines, using orjson when installed."""
+    if orjson is not None:
+        buf = bytearray()
+        for record in records:
+            buf += orjson.dumps(record)
+            buf += b"\n"
+        return bytes(buf)
+    return "".join(
+        json.dumps(record, ensure_ascii=False) + "\n" for record in records
+    ).encode("utf-8")
+
+
+def _loads_json(data: bytes):
+    """Parse one JSON document, using orjson when installed."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """
+    Truncate text to at most max_tokens tokens.
+
+    Uses tiktoken when available; otherwise keeps about 4 characters per token,
+    matching estimate_tokens.
+    """
+    encoder = _token_encoder()
+    if encoder is None:
+        return text[: max_tokens * 4]
+    ids = encoder.encode(text, disallowed_special=())
+    if len(ids) <= max_tokens:
+        return text
+    return encoder.decode(ids[:max_tokens])
+
+
+def is_short_document(document: ExtractedDocument) -> bool:
+    """
+    Check whether a document's core sections are short enough for one LLM call.
+
+    Documents without any core section content are never considered short, so
+    they keep the regular per-section flow.
+    """
+    tokens = sum(
+        estimate_tokens(section.content)
+        for section in ChineseSummarizer.select_core_sections(document.sections)
+    )
+    return 0 < tokens <= SINGLE_CALL_TOKEN_LIMIT
 
 
 class ChineseSummarizer:
     """Handles Chinese summary generation using GPT-4.1, with per-section summarization and specialized prompts."""
 
-    PRIORITY_SECTIONS = ["Abstract", "Conclusion", "Introduction", "Method", "Results"]
+    PRIORITY_ORDER = ("Abstract", "Conclusion", "Introduction", "Method", "Results")
+    PRIORITY_SECTIONS = frozenset(PRIORITY_ORDER)
+
+    # Highest-signal sections; agenerate_summary starts the overall summary as
+    # soon as these are summarized instead of waiting for every section
+    EARLY_OVERALL_SECTIONS = frozenset({"Abstract", "Conclusion"})
+
+    # Upper bound on concurrent LLM requests issued by the async batch helpers
+    MAX_CONCURRENCY = 5
+
+    # Connection pool of the HTTP client shared by all async Azure calls
+    HTTP_MAX_CONNECTIONS = 32
+    HTTP_TIMEOUT = 60  # seconds
+
+    # Retries of transient errors (rate limits, timeouts) on single LLM calls
+    RETRY_ATTEMPTS = 3
+    RETRY_BASE_DELAY = 1.0  # seconds, doubled (with jitter) on each retry
+
+    # Event loop on a background thread that runs the synchronous API, started
+    # on first use so the HTTP and Azure clients bound to it are reused
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _loop_finalizer: Optional[weakref.finalize] = None
+    _loop_lock = threading.Lock()
+
+    # Azure OpenAI Batch API settings used by generate_summary_batch
+    BATCH_COMPLETION_WINDOW = "24h"
+    BATCH_POLL_INTERVAL = 60  # seconds between batch status checks
 
     @classmethod
     def select_core_sections(cls, sections):
@@ -80,12 +251,42 @@ class ChineseSummarizer:
         "請將以下章節內容以繁體中文摘要，重點整理章節核心內容，適合學術背景讀者。"
     )
 
+    # Legacy single-prompt summary used by _create_summary_prompt
+    SUMMARY_PROMPT_TEMPLATE = """請為以下學術論文提供一個簡潔的中文摘要。
+
+{title_part}請重點關注：{focus_areas}
+
+論文內容：
+{document_content}
+
+請以以下格式提供摘要：
+這篇論文探討了...主要貢獻包括：
+1. [第一個貢獻]
+2. [第二個貢獻] 
+3. [第三個貢獻]
+
+摘要應該：
+- 用繁體中文撰寫
+- 突出主要方法和發現
+- 保持簡潔但信息豐富
+- 適合學術背景的讀者
+"""
+
+    # Static instruction block of each section prompt, joined with its separator once
+    SECTION_PROMPT_PREFIXES = {
+        title: f"{prompt}\n\n" for title, prompt in SECTION_PROMPTS.items()
+    }
+    DEFAULT_PROMPT_PREFIX = f"{DEFAULT_PROMPT}\n\n"
+
     def __init__(
         self,
         azure_endpoint: Optional[str] = None,
         api_key: Optional[str] = None,
         api_version: Optional[str] = None,
         deployment_name: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        use_cache: bool = True,
+        semantic_threshold: float = 0.95,
     ):
         """
         Initialize the Chinese summarizer.
@@ -95,29 +296,99 @@ class ChineseSummarizer:
             api_key: Azure OpenAI API key
             api_version: API version to use
             deployment_name: Azure deployment name for GPT-4.1
+            max_concurrency: Maximum number of concurrent LLM requests in async mode
+            use_cache: Reuse on-disk responses for identical prompts (see cache.py)
+            semantic_threshold: Minimum cosine similarity for a near-duplicate
+                section to reuse a cached summary (needs an embedding deployment)
         """
+        _load_env()
+        self.max_concurrency = max_concurrency or self.MAX_CONCURRENCY
+        self.use_cache = use_cache
+        self.semantic_threshold = semantic_threshold
         self.azure_endpoint = azure_endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
         self.api_key = api_key or os.getenv("AZURE_OPENAI_API_KEY")
         self.api_version = os.getenv("AZURE_OPENAI_API_VERSION")
         self.deployment_name = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
+        self.embedding_deployment = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
 
-        # Initialize the Azure ChatOpenAI client
-        if (
+    def _has_azure_config(self) -> bool:
+        """Check whether every Azure OpenAI setting needed by the LLM is present."""
+        return bool(
             self.azure_endpoint
             and self.api_key
             and self.api_version
             and self.deployment_name
-        ):
-            self.llm = AzureChatOpenAI(
-                azure_endpoint=self.azure_endpoint,
-                api_key=self.api_key,
-                api_version=self.api_version,
-                azure_deployment=self.deployment_name,
-                temperature=0.3,
-                max_tokens=4096,
-            )
-        else:
-            self.llm = None
+        )
+
+    @functools.cached_property
+    def _http_async_client(self):
+        """
+        Keep-alive HTTP client shared by the async chat and embedding calls.
+
+        HTTP/2 is used when the optional ``h2`` package is installed.
+        """
+        import httpx
+
+        return httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=self.HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=self.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=self.HTTP_MAX_CONNECTIONS,
+            ),
+        )
+
+    @functools.cached_property
+    def llm(self):
+        """
+        Azure ChatOpenAI client, built on first use (None when not configured).
+
+        langchain_openai is imported here so importing this module stays cheap.
+        """
+        if not self._has_azure_config():
+            return None
+        from langchain_openai import AzureChatOpenAI
+
+        return AzureChatOpenAI(
+            azure_endpoint=self.azure_endpoint,
+            api_key=self.api_key,
+            api_version=self.api_version,
+            azure_deployment=self.deployment_name,
+            temperature=0.3,
+            max_tokens=4096,
+            # Retries are handled by _ainvoke_with_retry; don't stack openai's own
+            max_retries=0,
+            http_async_client=self._http_async_client,
+        )
+
+    @functools.cached_property
+    def embeddings(self):
+        """Optional embeddings client for the semantic section cache, built on first use."""
+        if not self.embedding_deployment or not self._has_azure_config():
+            return None
+        from langchain_openai import AzureOpenAIEmbeddings
+
+        return AzureOpenAIEmbeddings(
+            azure_endpoint=self.azure_endpoint,
+            api_key=self.api_key,
+            api_version=self.api_version,
+            azure_deployment=self.embedding_deployment,
+            http_async_client=self._http_async_client,
+        )
+
+    async def aclose(self) -> None:
+        """
+        Close the shared async HTTP client.
+
+        The client is tied to the event loop it ran on, so the Azure clients are
+        dropped too and rebuilt with a fresh HTTP client on next use.
+        """
+        client = self.__dict__.pop("_http_async_client", None)
+        if client is None:
+            return
+        self.__dict__.pop("llm", None)
+        self.__dict__.pop("embeddings", None)
+        await client.aclose()
 
     def _create_summary_prompt(self, request: SummaryRequest) -> str:
         """
@@ -129,134 +400,531 @@ class ChineseSummarizer:
         Returns:
             Formatted prompt for the LLM
         """
-        title_part = f"論文標題：{request.title}\n\n" if request.title else ""
-        focus_areas = "、".join(request.focus_areas)
+        return self.SUMMARY_PROMPT_TEMPLATE.format(
+            title_part=f"論文標題：{request.title}\n\n" if request.title else "",
+            focus_areas="、".join(request.focus_areas),
+            document_content=truncate_tokens(request.document_content, 4000),
+        )
 
-        prompt = f"""請為以下學術論文提供一個簡潔的中文摘要。
+    def _build_section_prompt(
+        self, section_title: str, section_content: str, paper_title: str = None
+    ) -> str:
+        """
+        Build the full prompt for a single section using a specialized or default prompt.
+        """
+        prefix = self.SECTION_PROMPT_PREFIXES.get(
+            section_title, self.DEFAULT_PROMPT_PREFIX
+        )
+        title_part = f"論文標題：{paper_title}\n\n" if paper_title else ""
+        return f"{prefix}{title_part}章節：{section_title}\n內容：\n{truncate_tokens(section_content, 3000)}"
 
-{title_part}請重點關注：{focus_areas}
+    def _response_cache_key(self, prompt: str) -> Optional[str]:
+        """Return the response cache key for a prompt, or None if caching is off."""
+        if not self.use_cache or not cache_enabled():
+            return None
+        return response_cache_key(self.deployment_name, self.api_version, prompt)
 
-論文內容：
-{request.document_content[:4000]}  # Limit content length for token management
+    def _load_cached_response(self, prompt: str) -> Optional[str]:
+        """Return the cached response for a prompt, if any."""
+        key = self._response_cache_key(prompt)
+        return load_response(key) if key else None
 
-請以以下格式提供摘要：
-這篇論文探討了...主要貢獻包括：
-1. [第一個貢獻]
-2. [第二個貢獻] 
-3. [第三個貢獻]
+    def _save_cached_response(self, prompt: str, response: str) -> None:
+        """Cache a non-empty response for a prompt."""
+        key = self._response_cache_key(prompt)
+        if key and response:
+            save_response(key, response)
 
-摘要應該：
-- 用繁體中文撰寫
-- 突出主要方法和發現
-- 保持簡潔但信息豐富
-- 適合學術背景的讀者
-"""
-        return prompt
+    async def _ainvoke_with_retry(
+        self,
+        prompt: str,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+    ) -> str:
+        """
+        Invoke the LLM with a single prompt, retrying transient errors with backoff.
+
+        Args:
+            prompt: Prompt to send
+            max_attempts: Total attempts (default: RETRY_ATTEMPTS)
+            base_delay: Initial backoff in seconds (default: RETRY_BASE_DELAY)
+
+        Returns:
+            Stripped response content
+        """
+        policy = _retry_policy(
+            max_attempts or self.RETRY_ATTEMPTS,
+            self.RETRY_BASE_DELAY if base_delay is None else base_delay,
+        )
+        async for attempt in AsyncRetrying(**policy):
+            with attempt:
+                response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        return response.content.strip()
+
+    def invoke_prompt(self, prompt: str) -> str:
+        """
+        Send a single prompt to the LLM and return the stripped response.
+
+        Runs `ainvoke_prompt` on the background event loop.
+        """
+        return self._run_sync(self.ainvoke_prompt(prompt))
+
+    async def ainvoke_prompt(self, prompt: str) -> str:
+        """
+        Asynchronously send a single prompt to the LLM.
+
+        A cached response is reused if present; otherwise transient errors are
+        retried and the response is cached. Other errors are raised.
+        """
+        cached = self._load_cached_response(prompt)
+        if cached is not None:
+            return cached
+        content = await self._ainvoke_with_retry(prompt)
+        self._save_cached_response(prompt, content)
+        return content
+
+    def _semantic_enabled(self) -> bool:
+        """Check whether near-duplicate sections may reuse cached summaries."""
+        return self.use_cache and cache_enabled() and self.embeddings is not None
+
+    def _semantic_cache(self, section_title: str) -> SemanticCache:
+        """Return the semantic summary index for a section title."""
+        return SemanticCache(
+            self.deployment_name,
+            self.api_version,
+            section_title,
+            self.semantic_threshold,
+        )
+
+    async def _aembed_sections(
+        self, sections: List[DocumentSection]
+    ) -> List[Optional[List[float]]]:
+        """Asynchronously embed section contents for the semantic cache."""
+        if not sections or not self._semantic_enabled():
+            return [None] * len(sections)
+        try:
+            return await self.embeddings.aembed_documents(
+                [section.content[:3000] for section in sections]
+            )
+        except Exception as e:
+            print(f"Error embedding sections: {str(e)}")
+            return [None] * len(sections)
+
+    def _sync_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the background event loop of the synchronous API, starting it once."""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="docxtract-summarizer", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+                # Stops the thread if the summarizer is dropped without close()
+                self._loop_finalizer = weakref.finalize(self, _stop_loop, loop, thread)
+            return self._loop
+
+    def _run_sync(self, coro: Awaitable[T]) -> T:
+        """
+        Run a coroutine on the summarizer's background event loop and wait for it.
+
+        Every synchronous call shares that loop, so the async HTTP client and the
+        Azure clients bound to it are built once and kept until `close`. This also
+        works when called from inside a running event loop, but blocks it; from
+        async code, await the `a`-prefixed method instead.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._sync_loop()).result()
+
+    def close(self) -> None:
+        """
+        Close the HTTP client used by the synchronous API and stop its event loop.
+
+        Safe to call more than once; a later synchronous call starts a new loop.
+        Code using the async API only should await `aclose` instead.
+        """
+        with self._loop_lock:
+            loop, finalizer = self._loop, self._loop_finalizer
+            self._loop = self._loop_finalizer = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+        finally:
+            finalizer()
 
     def summarize_section(
         self, section_title: str, section_content: str, paper_title: str = None
     ) -> str:
         """
         Summarize a single section using a specialized or default prompt.
+
+        Runs `asummarize_section` on the background event loop.
+        """
+        return self._run_sync(
+            self.asummarize_section(section_title, section_content, paper_title)
+        )
+
+    async def asummarize_section(
+        self, section_title: str, section_content: str, paper_title: str = None
+    ) -> str:
+        """
+        Asynchronously summarize a single section using a specialized or default prompt.
         """
         if not self.llm or not section_content.strip():
             return ""
-        prompt = self.SECTION_PROMPTS.get(section_title, self.DEFAULT_PROMPT)
-        title_part = f"論文標題：{paper_title}\n\n" if paper_title else ""
-        full_prompt = f"{prompt}\n\n{title_part}章節：{section_title}\n內容：\n{section_content[:3000]}"
-        message = HumanMessage(content=full_prompt)
+        full_prompt = self._build_section_prompt(
+            section_title, section_content, paper_title
+        )
+        cached = self._load_cached_response(full_prompt)
+        if cached is not None:
+            return cached
+        section = DocumentSection(title=section_title, content=section_content)
+        vector = (await self._aembed_sections([section]))[0]
+        if vector is not None:
+            cached = self._semantic_cache(section_title).lookup(vector)
+            if cached is not None:
+                return cached
         try:
-            response = self.llm.invoke([message])
-            return response.content.strip()
+            summary = await self.ainvoke_prompt(full_prompt)
         except Exception as e:
             print(f"Error summarizing section {section_title}: {str(e)}")
             return ""
+        if vector is not None and summary:
+            self._semantic_cache(section_title).add(vector, summary)
+        return summary
 
-    def summarize_all_sections(self, document: ExtractedDocument) -> Dict[str, str]:
+    def _section_batch(
+        self,
+        document: ExtractedDocument,
+        sections: Optional[List[DocumentSection]] = None,
+    ) -> Tuple[Dict[str, str], List[DocumentSection], List[str]]:
         """
-        Summarize only core sections and return a dict: {section_title: summary}
+        Prepare a batch of section prompts for the core sections of a document.
+
+        Args:
+            document: Document being summarized
+            sections: Subset of the core sections to summarize (default: all)
+
+        Returns:
+            Tuple of (summaries pre-filled with "" or cached responses, sections
+            to send, prompts), where prompts[i] is the prompt for sections[i]
         """
-        summaries: Dict[str, str] = {}
-        core_sections = self.select_core_sections(document.sections)
+        core_sections = (
+            self.select_core_sections(document.sections)
+            if sections is None
+            else sections
+        )
+        summaries: Dict[str, str] = {section.title: "" for section in core_sections}
+        if not self.llm:
+            return summaries, [], []
+
+        pending: List[DocumentSection] = []
+        prompts: List[str] = []
         for section in core_sections:
-            summary = self.summarize_section(
+            if not section.content.strip():
+                continue
+            prompt = self._build_section_prompt(
                 section.title, section.content, document.title
             )
-            summaries[section.title] = summary
+            cached = self._load_cached_response(prompt)
+            if cached is not None:
+                summaries[section.title] = cached
+                continue
+            pending.append(section)
+            prompts.append(prompt)
+        return summaries, pending, prompts
+
+    def _semantic_filter(
+        self,
+        summaries: Dict[str, str],
+        pending: List[DocumentSection],
+        prompts: List[str],
+        vectors: List[Optional[List[float]]],
+    ) -> Tuple[List[DocumentSection], List[str], List]:
+        """
+        Answer pending sections from the semantic cache where possible.
+
+        Returns:
+            The (sections, prompts, vectors) still to be sent to the LLM
+        """
+        remaining_sections, remaining_prompts, remaining_vectors = [], [], []
+        for section, prompt, vector in zip(pending, prompts, vectors):
+            if vector is not None:
+                cached = self._semantic_cache(section.title).lookup(vector)
+                if cached is not None:
+                    summaries[section.title] = cached
+                    continue
+            remaining_sections.append(section)
+            remaining_prompts.append(prompt)
+            remaining_vectors.append(vector)
+        return remaining_sections, remaining_prompts, remaining_vectors
+
+    def _collect_section_responses(
+        self,
+        summaries: Dict[str, str],
+        pending: List[DocumentSection],
+        prompts: List[str],
+        responses: List,
+        vectors: List[Optional[List[float]]],
+    ) -> Dict[str, str]:
+        """Fill summaries from batch responses; failed sections stay empty."""
+        for section, prompt, response, vector in zip(
+            pending, prompts, responses, vectors
+        ):
+            if isinstance(response, Exception):
+                print(f"Error summarizing section {section.title}: {str(response)}")
+                continue
+            summaries[section.title] = response
+            self._save_cached_response(prompt, response)
+            if vector is not None and response:
+                self._semantic_cache(section.title).add(vector, response)
         return summaries
 
-    def summarize_overall(
+    def summarize_all_sections(self, document: ExtractedDocument) -> Dict[str, str]:
+        """
+        Summarize only core sections and return a dict: {section_title: summary}
+
+        Runs `asummarize_all_sections`, so the section prompts go out concurrently
+        over the shared connection pool. Failed or empty sections map to "".
+        """
+        return self._run_sync(self.asummarize_all_sections(document))
+
+    async def asummarize_all_sections(
+        self,
+        document: ExtractedDocument,
+        sections: Optional[List[DocumentSection]] = None,
+    ) -> Dict[str, str]:
+        """
+        Summarize core sections concurrently and return a dict: {section_title: summary}
+
+        Section prompts are sent concurrently, at most `max_concurrency` at a
+        time, so wall-clock time tracks the slowest section instead of the sum of
+        all sections. Each call retries transient errors; failed or empty
+        sections map to "".
+
+        Args:
+            document: Document being summarized
+            sections: Subset of the core sections to summarize (default: all)
+        """
+        summaries, pending, prompts = self._section_batch(document, sections)
+        pending, prompts, vectors = self._semantic_filter(
+            summaries, pending, prompts, await self._aembed_sections(pending)
+        )
+        if not prompts:
+            return summaries
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def invoke(prompt: str) -> str:
+            async with semaphore:
+                return await self._ainvoke_with_retry(prompt)
+
+        responses = await asyncio.gather(
+            *(invoke(prompt) for prompt in prompts), return_exceptions=True
+        )
+        return self._collect_section_responses(
+            summaries, pending, prompts, responses, vectors
+        )
+
+    def _build_overall_prompt(
         self, section_summaries: Dict[str, str], paper_title: str = None
     ) -> str:
         """
-        Generate an overall summary from all section summaries.
+        Build the prompt that merges all section summaries into an overall summary.
         """
-        if not self.llm:
-            return ""
         # Combine all section summaries
         combined = "\n\n".join(
             [f"{k}:\n{v}" for k, v in section_summaries.items() if v]
         )
         prompt = "請根據下列各章節的繁體中文摘要，彙整出一份完整的論文總結，強調研究動機、方法、主要發現與貢獻，適合學術背景讀者。"
         title_part = f"論文標題：{paper_title}\n\n" if paper_title else ""
-        full_prompt = f"{prompt}\n\n{title_part}章節摘要彙整如下：\n{combined[:6000]}"
-        message = HumanMessage(content=full_prompt)
+        return f"{prompt}\n\n{title_part}章節摘要彙整如下：\n{truncate_tokens(combined, 6000)}"
+
+    def summarize_overall(
+        self, section_summaries: Dict[str, str], paper_title: str = None
+    ) -> str:
+        """
+        Generate an overall summary from all section summaries.
+
+        Runs `asummarize_overall` on the background event loop.
+        """
+        return self._run_sync(self.asummarize_overall(section_summaries, paper_title))
+
+    async def asummarize_overall(
+        self, section_summaries: Dict[str, str], paper_title: str = None
+    ) -> str:
+        """
+        Asynchronously generate an overall summary from all section summaries.
+        """
+        if not self.llm:
+            return ""
+        full_prompt = self._build_overall_prompt(section_summaries, paper_title)
+        try:
+            return await self.ainvoke_prompt(full_prompt)
+        except Exception as e:
+            print(f"Error generating overall summary: {str(e)}")
+            return ""
+
+    def _build_document_prompt(self, document: ExtractedDocument) -> str:
+        """
+        Build the prompt that summarizes a short document's core sections directly.
+        """
+        combined = "\n\n".join(
+            f"{section.title}:\n{section.content}"
+            for section in self.select_core_sections(document.sections)
+            if section.content.strip()
+        )
+        prompt = "請閱讀下列論文各章節內容，以繁體中文彙整出一份完整的論文總結，強調研究動機、方法、主要發現與貢獻，適合學術背景讀者。"
+        title_part = f"論文標題：{document.title}\n\n" if document.title else ""
+        return f"{prompt}\n\n{title_part}論文內容如下：\n{combined}"
+
+    def summarize_document(self, document: ExtractedDocument) -> str:
+        """
+        Generate an overall summary of a short document in a single LLM call.
+
+        Runs `asummarize_document` on the background event loop.
+        """
+        return self._run_sync(self.asummarize_document(document))
+
+    async def asummarize_document(self, document: ExtractedDocument) -> str:
+        """
+        Asynchronously generate an overall summary of a short document in one call.
+        """
+        if not self.llm:
+            return ""
+        full_prompt = self._build_document_prompt(document)
         try:
-            response = self.llm.invoke([message])
-            return response.content.strip()
+            return await self.ainvoke_prompt(full_prompt)
         except Exception as e:
             print(f"Error generating overall summary: {str(e)}")
             return ""
 
-    def generate_summary(self, document: ExtractedDocument) -> str:
+    def generate_summary(
+        self, document: ExtractedDocument, strict: bool = False
+    ) -> str:
         """
         Summarize only core sections, then generate an overall summary, and return Markdown string.
         The output Markdown's title will always be the paper's title.
+
+        Runs `agenerate_summary` on the background event loop; call that directly from async code.
+        """
+        return self._run_sync(self.agenerate_summary(document, strict=strict))
+
+    async def agenerate_summary(
+        self, document: ExtractedDocument, strict: bool = False
+    ) -> str:
+        """
+        Asynchronously build the Markdown summary of a document.
+
+        Section summaries run concurrently. The overall summary starts as soon as
+        the EARLY_OVERALL_SECTIONS are summarized, overlapping the remaining
+        sections; the top takeaways and extended applications only depend on the
+        overall summary, so both are generated in parallel.
+
+        Args:
+            document: Document to summarize
+            strict: Re-issue the overall summary once every section is done if
+                later sections added content the early summary did not see
         """
         if not self.llm:
             print("Warning: Azure OpenAI not configured. Skipping summary generation.")
             return ""
-        # 1. Summarize only core sections
-        section_summaries = self.summarize_all_sections(document)
-        # 2. Generate overall summary
-        overall_summary = self.summarize_overall(section_summaries, document.title)
-        # 3. Assemble Markdown output
-        lines = []
+        # 1-2. Summarize core sections, starting the overall summary early
+        section_summaries, overall_summary = await self._asummarize_sections_overall(
+            document, strict
+        )
+        # 3. Generate takeaways and applications concurrently
+        if overall_summary:
+            takeaways, applications = await asyncio.gather(
+                self.agenerate_top_takeaways(overall_summary),
+                self.agenerate_extended_applications(overall_summary),
+            )
+        else:
+            takeaways = applications = ""
+        # 4. Assemble Markdown output
+        return self._format_summary_markdown(
+            document, section_summaries, overall_summary, takeaways, applications
+        )
+
+    async def _asummarize_sections_overall(
+        self, document: ExtractedDocument, strict: bool
+    ) -> Tuple[Dict[str, str], str]:
+        """
+        Summarize core sections and the overall summary with overlapping requests.
+
+        Returns:
+            Tuple of (section summaries in core-section order, overall summary)
+        """
+        core_sections = self.select_core_sections(document.sections)
+        early = [s for s in core_sections if s.title in self.EARLY_OVERALL_SECTIONS]
+        rest = [s for s in core_sections if s.title not in self.EARLY_OVERALL_SECTIONS]
+
+        rest_task = asyncio.create_task(self.asummarize_all_sections(document, rest))
+        early_summaries = await self.asummarize_all_sections(document, early)
+        if any(early_summaries.values()):
+            overall_task = asyncio.create_task(
+                self.asummarize_overall(early_summaries, document.title)
+            )
+            rest_summaries, overall_summary = await asyncio.gather(
+                rest_task, overall_task
+            )
+        else:
+            rest_summaries = await rest_task
+            overall_summary = None
+
+        merged = {**early_summaries, **rest_summaries}
+        section_summaries = {s.title: merged[s.title] for s in core_sections}
+        if overall_summary is None or (strict and any(rest_summaries.values())):
+            overall_summary = await self.asummarize_overall(
+                section_summaries, document.title
+            )
+        return section_summaries, overall_summary
+
+    def _format_summary_markdown(
+        self,
+        document: ExtractedDocument,
+        section_summaries: Dict[str, str],
+        overall_summary: str,
+        takeaways: str,
+        applications: str,
+        out: Optional[TextIO] = None,
+    ) -> str:
+        """
+        Assemble the Markdown summary; the title is always the paper's title.
+
+        Written to ``out`` when given (returning ""), otherwise to a new buffer
+        whose contents are returned.
+        """
+        buf = out if out is not None else io.StringIO()
         paper_title = document.title or "(Unknown Title)"
-        lines.append(f"# {paper_title}")
-        lines.append("")
-        lines.append("## 中文摘要")
-        lines.append("")
-        lines.append(overall_summary or "(總體摘要產生失敗)")
-        lines.append("")
+        buf.write(
+            f"# {paper_title}\n\n"
+            f"## 中文摘要\n\n{overall_summary or '(總體摘要產生失敗)'}\n\n"
+            f"## 重點摘要\n\n{takeaways or '(重點摘要產生失敗)'}\n\n"
+            f"## 應用發想\n\n{applications or '(應用發想產生失敗)'}\n\n"
+        )
         for section in document.sections:
-            if section.title in section_summaries:
-                lines.append(f"## {section.title}")
-                lines.append("")
-                lines.append(
-                    section_summaries.get(section.title, "(本章節摘要產生失敗)")
-                )
-                lines.append("")
-        lines.append("---")
-        lines.append("")
-        lines.append(f"*Extracted from: {document.source_file}*")
-        lines.append(
+            summary = section_summaries.get(section.title)
+            if summary is None:
+                continue
+            buf.write(f"## {section.title}\n\n{summary or '(本章節摘要產生失敗)'}\n\n")
+        buf.write(f"---\n\n*Extracted from: {document.source_file}*\n")
+        buf.write(
             "*Chinese summary generated using GPT-4.1, core-section summarization mode*"
         )
-        return "\n".join(lines)
+        return buf.getvalue() if out is None else ""
 
     def is_configured(self) -> bool:
-        """Check if the summarizer is properly configured."""
-        return self.llm is not None
+        """Check if the summarizer is properly configured (without building the client)."""
+        if "llm" in self.__dict__:
+            return self.llm is not None
+        return self._has_azure_config()
 
-    def generate_top_takeaways(self, summary: str) -> str:
+    def _build_takeaways_prompt(self, summary: str) -> str:
         """
-        Generate top-5 important takeaways from the summary using the LLM.
+        Build the prompt for the top-5 takeaways (summary last, after the static text).
         """
-        prompt = f"""以下是論文的總體摘要內容，請從中整理出五個最重要的重點：
-
-        摘要內容：
-        {summary[:3000]}
+        return f"""以下是論文的總體摘要內容，請從中整理出五個最重要的重點。
 
         請以條列方式回答：
         1. 
@@ -264,9 +932,41 @@ class ChineseSummarizer:
         3. 
         4. 
         5. 
+
+        摘要內容：
+        {truncate_tokens(summary, 3000)}
+        """
+
+    def _build_applications_prompt(self, summary: str) -> str:
+        """
+        Build the prompt for extended applications (summary last, after the static text).
+        """
+        return f"""你是一位具備研究與創新能力的AI助手，請根據下列論文摘要，提出可能的應用方向或後續研究發展。
+
+        請以條列方式提供：
+        1. 
+        2. 
+        3. 
+
+        摘要內容：
+        {truncate_tokens(summary, 3000)}
         """
+
+    def generate_top_takeaways(self, summary: str) -> str:
+        """
+        Generate top-5 important takeaways from the summary using the LLM.
+
+        Runs `agenerate_top_takeaways` on the background event loop.
+        """
+        return self._run_sync(self.agenerate_top_takeaways(summary))
+
+    async def agenerate_top_takeaways(self, summary: str) -> str:
+        """
+        Asynchronously generate top-5 important takeaways from the summary.
+        """
+        prompt = self._build_takeaways_prompt(summary)
         try:
-            return self.llm.invoke([HumanMessage(content=prompt)]).content.strip()
+            return await self.ainvoke_prompt(prompt)
         except Exception as e:
             print(f"Error generating top takeaways: {e}")
             return "(重點摘要產生失敗)"
@@ -274,19 +974,165 @@ class ChineseSummarizer:
     def generate_extended_applications(self, summary: str) -> str:
         """
         Generate possible application directions or future research ideas from the summary using the LLM.
-        """
-        prompt = f"""你是一位具備研究與創新能力的AI助手，請根據下列論文摘要，提出可能的應用方向或後續研究發展。
 
-        摘要內容：
-        {summary[:3000]}
+        Runs `agenerate_extended_applications` on the background event loop.
+        """
+        return self._run_sync(self.agenerate_extended_applications(summary))
 
-        請以條列方式提供：
-        1. 
-        2. 
-        3. 
+    async def agenerate_extended_applications(self, summary: str) -> str:
+        """
+        Asynchronously generate application directions or research ideas from the summary.
         """
+        prompt = self._build_applications_prompt(summary)
         try:
-            return self.llm.invoke([HumanMessage(content=prompt)]).content.strip()
+            return await self.ainvoke_prompt(prompt)
         except Exception as e:
             print(f"Error generating extended applications: {e}")
             return "(應用發想產生失敗)"
+
+    def _batch_client(self):
+        """Create the Azure OpenAI client used for Files and Batch API calls."""
+        from openai import AzureOpenAI
+
+        return AzureOpenAI(
+            azure_endpoint=self.azure_endpoint,
+            api_key=self.api_key,
+            api_version=self.api_version,
+        )
+
+    def _run_batch(self, client, prompts: Dict[str, str]) -> Dict[str, str]:
+        """
+        Run prompts as one Azure OpenAI batch job and wait for the results.
+
+        Args:
+            client: Azure OpenAI client
+            prompts: Mapping of custom_id to prompt text
+
+        Returns:
+            Mapping of custom_id to response text ("" for failed requests)
+        """
+        if not prompts:
+            return {}
+        requests = [
+            {
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/chat/completions",
+                "body": {
+                    "model": self.deployment_name,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "temperature": 0.3,
+                    "max_tokens": 4096,
+                },
+            }
+            for custom_id, prompt in prompts.items()
+        ]
+        input_file = client.files.create(
+            file=("batch.jsonl", _dumps_jsonl(requests)), purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/chat/completions",
+            completion_window=self.BATCH_COMPLETION_WINDOW,
+        )
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(self.BATCH_POLL_INTERVAL)
+            batch = client.batches.retrieve(batch.id)
+
+        results = {custom_id: "" for custom_id in prompts}
+        if batch.status != "completed" or not batch.output_file_id:
+            print(f"Batch {batch.id} ended with status {batch.status}")
+            return results
+
+        output = client.files.content(batch.output_file_id).content
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = _loads_json(line)
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                print(f"Batch request {record.get('custom_id')} failed")
+                continue
+            content = response["body"]["choices"][0]["message"]["content"] or ""
+            results[record["custom_id"]] = content.strip()
+        return results
+
+    def generate_summary_batch(self, documents: List[ExtractedDocument]) -> List[str]:
+        """
+        Summarize many documents through the Azure OpenAI Batch API.
+
+        Batch jobs are cheaper and not bound by per-request rate limits, but can
+        take up to the 24h completion window, so this suits offline bulk runs. The
+        steps depend on each other, so three batch jobs run in turn: all section
+        summaries, then all overall summaries, then takeaways and applications.
+
+        Args:
+            documents: Documents with parsed sections
+
+        Returns:
+            Markdown summaries in the same order as documents ("" if not configured)
+        """
+        if not self.is_configured():
+            print("Warning: Azure OpenAI not configured. Skipping summary generation.")
+            return ["" for _ in documents]
+        client = self._batch_client()
+
+        # 1. Section summaries for every document; custom_id is "<doc>:section:<title>"
+        section_prompts: Dict[str, str] = {}
+        for index, document in enumerate(documents):
+            for section in self.select_core_sections(document.sections):
+                if section.content.strip():
+                    section_prompts[f"{index}:section:{section.title}"] = (
+                        self._build_section_prompt(
+                            section.title, section.content, document.title
+                        )
+                    )
+        section_results = self._run_batch(client, section_prompts)
+        all_section_summaries = []
+        for index, document in enumerate(documents):
+            all_section_summaries.append(
+                {
+                    section.title: section_results.get(
+                        f"{index}:section:{section.title}", ""
+                    )
+                    for section in self.select_core_sections(document.sections)
+                }
+            )
+
+        # 2. Overall summaries
+        overall_results = self._run_batch(
+            client,
+            {
+                f"{index}:overall": self._build_overall_prompt(
+                    all_section_summaries[index], document.title
+                )
+                for index, document in enumerate(documents)
+            },
+        )
+        overall_summaries = [
+            overall_results.get(f"{index}:overall", "")
+            for index in range(len(documents))
+        ]
+
+        # 3. Takeaways and applications from each successful overall summary
+        followup_prompts: Dict[str, str] = {}
+        for index, overall_summary in enumerate(overall_summaries):
+            if overall_summary:
+                followup_prompts[f"{index}:takeaways"] = self._build_takeaways_prompt(
+                    overall_summary
+                )
+                followup_prompts[f"{index}:applications"] = (
+                    self._build_applications_prompt(overall_summary)
+                )
+        followup_results = self._run_batch(client, followup_prompts)
+
+        return [
+            self._format_summary_markdown(
+                document,
+                all_section_summaries[index],
+                overall_summaries[index],
+                followup_results.get(f"{index}:takeaways", ""),
+                followup_results.get(f"{index}:applications", ""),
+            )
+            for index, document in enumerate(documents)
+        ]
@@ -1,6 +1,7 @@
 """Shared utility functions for docxtract."""
 
 import os
+import stat
 from pathlib import Path
 from typing import Optional
 
@@ -19,23 +20,24 @@ def validate_pdf_file(file_path: Path) -> bool:
     """
     Validate that a file is a readable PDF.
 
+    Checks the extension first and then does a single ``os.stat``, so scanning
+    many candidate files costs at most one syscall each.
+
     Args:
         file_path: Path to the file to validate
 
     Returns:
         True if file is a valid PDF, False otherwise
     """
-    if not file_path.exists():
-        return False
-
-    if not file_path.is_file():
+    path = os.fspath(file_path)
+    if os.path.splitext(path)[1].lower() != ".pdf":
         return False
 
-    if file_path.suffix.lower() != ".pdf":
+    try:
+        return stat.S_ISREG(os.stat(path).st_mode)
+    except (OSError, ValueError):
         return False
 
-    return True
-
 
 def get_default_output_path(input_path: Path) -> Path:
     """
@@ -63,6 +65,10 @@ def check_azure_config() -> bool:
     return bool(endpoint and api_key)
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+_UNIT_BYTES = tuple(1024**i for i in range(len(_SIZE_UNITS)))
+
+
 def format_file_size(size_bytes: int) -> str:
     """
     Format file size in human-readable format.
@@ -73,8 +79,8 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         Formatted file size string
     """
-    for unit in ["B", "KB", "MB", "GB"]:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} TB"
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f} B"
+    # Each unit spans 10 bits: pick it from the bit length instead of dividing in a loop
+    unit = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / _UNIT_BYTES[unit]:.1f} {_SIZE_UNITS[unit]}"
@@ -8,18 +8,38 @@ This module provides the MarkdownWriter class, which:
 See .github/copilot-instructions.md for documentation and code style standards.
 """
 
+import hashlib
+import io
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, TextIO
 
-from .models import ExtractedDocument
+from .models import DocumentSection, ExtractedDocument
 
 
 class MarkdownWriter:
     """Handles writing extracted documents to Markdown format."""
 
+    # Number of formatted documents kept for preview-then-write flows
+    FORMAT_CACHE_SIZE = 8
+
+    # Output file buffer; the Markdown is written in many small pieces
+    WRITE_BUFFER_SIZE = 1 << 20
+
     def __init__(self):
         """Initialize the Markdown writer."""
-        pass
+        self._format_cache: Dict[bytes, str] = {}
+
+    @staticmethod
+    def _document_key(document: ExtractedDocument) -> bytes:
+        """Hash every field that affects the formatted Markdown."""
+        digest = hashlib.blake2b(digest_size=16)
+        fields = [document.title, document.summary_zh, str(document.source_file)]
+        for section in document.sections:
+            fields.extend((section.title, section.content))
+        for field in fields:
+            digest.update((field or "").encode("utf-8"))
+            digest.update(b"\0")
+        return digest.digest()
 
     def write_document(self, document: ExtractedDocument, output_path: Path) -> None:
         """
@@ -36,59 +56,61 @@ class MarkdownWriter:
             # Ensure output directory exists
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            content = self._format_document(document)
-
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            # Reuse a previewed document, otherwise stream it straight into the file
+            cached = self._format_cache.get(self._document_key(document))
+            with open(
+                output_path, "w", encoding="utf-8", buffering=self.WRITE_BUFFER_SIZE
+            ) as f:
+                if cached is not None:
+                    f.write(cached)
+                else:
+                    self._format_document(document, f)
 
         except Exception as e:
             raise Exception(
                 f"Failed to write Markdown file: {str(e)}. Please check the output path and permissions."
             )
 
-    def _format_document(self, document: ExtractedDocument) -> str:
+    @staticmethod
+    def _visible_sections(document: ExtractedDocument) -> List[DocumentSection]:
+        """Return the sections to render, dropping "Full Content" if sections were parsed."""
+        if len(document.sections) > 1:
+            return [s for s in document.sections if s.title != "Full Content"]
+        return document.sections
+
+    def _format_document(
+        self, document: ExtractedDocument, out: Optional[TextIO] = None
+    ) -> str:
         """
         Format an ExtractedDocument as Markdown content.
 
         Args:
             document: Document to format
+            out: Stream to write to (e.g. an open file); defaults to a new buffer
 
         Returns:
-            Markdown-formatted string
+            Markdown-formatted string, or "" when written to ``out``
         """
-        lines = []
+        buf = out if out is not None else io.StringIO()
 
         # Add title if available
         if document.title:
-            lines.append(f"# {document.title}")
-            lines.append("")
+            buf.write(f"# {document.title}\n\n")
 
         # Add Chinese summary if available
         if getattr(document, "summary_zh", None):
-            lines.append("## 中文摘要")
-            lines.append("")
-            lines.append(document.summary_zh)
-            lines.append("")
+            buf.write(f"## 中文摘要\n\n{document.summary_zh}\n\n")
 
         # Add all sections
-        for section in document.sections:
-            # Skip "Full Content" section if we have parsed sections
-            if section.title == "Full Content" and len(document.sections) > 1:
-                continue
-
-            lines.append(f"## {section.title}")
-            lines.append("")
-            lines.append(section.content)
-            lines.append("")
+        for section in self._visible_sections(document):
+            buf.write(f"## {section.title}\n\n{section.content}\n\n")
 
         # Add metadata footer
-        lines.append("---")
-        lines.append("")
-        lines.append(f"*Extracted from: {document.source_file}*")
+        buf.write(f"---\n\n*Extracted from: {document.source_file}*")
         if getattr(document, "summary_zh", None):
-            lines.append("*Chinese summary generated using GPT-4.1*")
+            buf.write("\n*Chinese summary generated using GPT-4.1*")
 
-        return "\n".join(lines)
+        return buf.getvalue() if out is None else ""
 
     def preview_content(self, document: ExtractedDocument) -> str:
         """
@@ -100,4 +122,12 @@ class MarkdownWriter:
         Returns:
             Markdown-formatted preview string
         """
-        return self._format_document(document)
+        key = self._document_key(document)
+        content = self._format_cache.get(key)
+        if content is None:
+            content = self._format_document(document)
+            if len(self._format_cache) >= self.FORMAT_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._format_cache[next(iter(self._format_cache))]
+            self._format_cache[key] = content
+        return content
@@ -140,8 +140,10 @@ def mock_azure_openai_config():
 
 
 @pytest.fixture(autouse=True)
-def setup_test_environment(monkeypatch):
+def setup_test_environment(monkeypatch, tmp_path):
     """Set up test environment variables."""
+    # Keep the LLM result cache out of the user's home directory
+    monkeypatch.setenv("DOCXTRACT_CACHE_DIR", str(tmp_path / "cache"))
     # Set test environment variables
     monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test-openai.openai.azure.com/")
     monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-api-key-12345")
@@ -165,5 +167,10 @@ def sample_section_headers():
     ]
 
 
-# Pytest markers for different test categories
-pytestmark = pytest.mark.unit
+def pytest_collection_modifyitems(items):
+    """Mark every test that isn't an integration test as a unit test."""
+    # A module-level pytestmark in conftest.py doesn't apply to test modules,
+    # so the unit marker is added per item instead.
+    for item in items:
+        if item.get_closest_marker("integration") is None:
+            item.add_marker(pytest.mark.unit)
@@ -0,0 +1,242 @@
+"""Unit tests for docxtract.cache module."""
+
+import asyncio
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from docxtract import cache
+from docxtract.cache import (
+    SemanticCache,
+    cache_key,
+    cached_step,
+    get_cache_dir,
+    load_cache_entry,
+    load_response,
+    response_cache_key,
+    save_cache_entry,
+    save_response,
+)
+from docxtract.models import ExtractedDocument
+
+
+@pytest.fixture
+def pdf_file(tmp_path):
+    """Create a small stand-in PDF file."""
+    path = tmp_path / "paper.pdf"
+    path.write_bytes(b"%PDF-1.4 test content")
+    return path
+
+
+class TestCacheKey:
+    """Test cases for cache key computation."""
+
+    def test_cache_key_same_content(self, tmp_path, pdf_file):
+        """Test that identical PDFs share a key regardless of path."""
+        copy = tmp_path / "copy.pdf"
+        copy.write_bytes(pdf_file.read_bytes())
+
+        assert cache_key(pdf_file) == cache_key(copy)
+
+    def test_cache_key_different_content(self, tmp_path, pdf_file):
+        """Test that different PDFs get different keys."""
+        other = tmp_path / "other.pdf"
+        other.write_bytes(b"%PDF-1.4 other content")
+
+        assert cache_key(pdf_file) != cache_key(other)
+
+    def test_cache_key_missing_file(self, tmp_path):
+        """Test that an unreadable file has no key."""
+        assert cache_key(tmp_path / "missing.pdf") is None
+
+    def test_cache_key_changes_with_prompt_templates(
+        self, tmp_path, pdf_file, monkeypatch
+    ):
+        """Test that editing a prompt template invalidates the key."""
+        prompts = tmp_path / "prompts"
+        prompts.mkdir()
+        template = prompts / "prompt.md"
+        template.write_text("v1", encoding="utf-8")
+        monkeypatch.setattr(cache, "PROMPTS_DIR", prompts)
+        before = cache_key(pdf_file)
+
+        template.write_text("v2", encoding="utf-8")
+        stat = template.stat()
+        os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert cache_key(pdf_file) != before
+
+    def test_cache_key_ignores_prompt_mtime(self, tmp_path, pdf_file, monkeypatch):
+        """Test that touching a template without editing it keeps the key."""
+        prompts = tmp_path / "prompts"
+        prompts.mkdir()
+        template = prompts / "prompt.md"
+        template.write_text("v1", encoding="utf-8")
+        monkeypatch.setattr(cache, "PROMPTS_DIR", prompts)
+        before = cache_key(pdf_file)
+
+        stat = template.stat()
+        os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert cache_key(pdf_file) == before
+
+    def test_cache_key_includes_model_settings(self, pdf_file):
+        """Test that the model deployment and API version change the key."""
+        key = cache_key(pdf_file, "gpt-4.1", "2024-02-15")
+
+        assert key == cache_key(pdf_file, "gpt-4.1", "2024-02-15")
+        assert key != cache_key(pdf_file, "gpt-4o", "2024-02-15")
+        assert key != cache_key(pdf_file, "gpt-4.1", "2025-01-01")
+
+
+class TestCacheEntries:
+    """Test cases for loading and saving cache entries."""
+
+    def test_save_and_load_merges_fields(self):
+        """Test that saved fields are merged into one entry."""
+        save_cache_entry("key", {"section_summaries": {"Abstract": "摘要"}})
+        save_cache_entry("key", {"overall_summary": "總結"})
+
+        assert load_cache_entry("key") == {
+            "section_summaries": {"Abstract": "摘要"},
+            "overall_summary": "總結",
+        }
+
+    def test_load_missing_or_corrupt_entry(self):
+        """Test that missing or corrupt entries load as empty."""
+        assert load_cache_entry("missing") == {}
+
+        get_cache_dir().mkdir(parents=True, exist_ok=True)
+        (get_cache_dir() / "corrupt.json").write_text("{not json", encoding="utf-8")
+        assert load_cache_entry("corrupt") == {}
+
+
+class TestResponseEntries:
+    """Test cases for the exact-match response cache."""
+
+    def test_response_cache_key_inputs(self):
+        """Test that model, API version and prompt all change the key."""
+        key = response_cache_key("gpt-4.1", "2024-02-15", "prompt")
+
+        assert key == response_cache_key("gpt-4.1", "2024-02-15", "prompt")
+        assert key != response_cache_key("gpt-4o", "2024-02-15", "prompt")
+        assert key != response_cache_key("gpt-4.1", "2025-01-01", "prompt")
+        assert key != response_cache_key("gpt-4.1", "2024-02-15", "prompt!")
+
+    def test_save_and_load_response(self):
+        """Test that responses round-trip under a sharded directory."""
+        key = response_cache_key("gpt-4.1", "v", "prompt")
+
+        assert load_response(key) is None
+        save_response(key, "中文摘要")
+
+        assert load_response(key) == "中文摘要"
+        assert (get_cache_dir() / "responses" / key[:2] / f"{key}.txt").exists()
+
+
+class TestCachedStep:
+    """Test cases for the cached_step decorator."""
+
+    def test_cached_step_skips_second_call(self, pdf_file):
+        """Test that the step runs once per PDF and later calls hit the cache."""
+        step = Mock(side_effect=lambda inputs: {**inputs, "overall_summary": "總結"})
+        wrapped = cached_step("overall_summary")(step)
+        inputs = {"document": ExtractedDocument(source_file=str(pdf_file))}
+
+        first = wrapped(inputs)
+        second = wrapped(inputs)
+
+        assert first["overall_summary"] == second["overall_summary"] == "總結"
+        assert step.call_count == 1
+
+    def test_cached_step_async(self, pdf_file):
+        """Test that async steps are cached as well."""
+        calls = []
+
+        @cached_step("overall_summary")
+        async def step(inputs):
+            calls.append(inputs)
+            return {**inputs, "overall_summary": "總結"}
+
+        inputs = {"document": ExtractedDocument(source_file=str(pdf_file))}
+        asyncio.run(step(inputs))
+        result = asyncio.run(step(inputs))
+
+        assert result["overall_summary"] == "總結"
+        assert len(calls) == 1
+
+    def test_cached_step_does_not_store_rejected_values(self, pdf_file):
+        """Test that values failing should_cache are recomputed next time."""
+        step = Mock(side_effect=lambda inputs: {**inputs, "overall_summary": ""})
+        wrapped = cached_step("overall_summary")(step)
+        inputs = {"document": ExtractedDocument(source_file=str(pdf_file))}
+
+        wrapped(inputs)
+        wrapped(inputs)
+
+        assert step.call_count == 2
+
+    def test_cached_step_keyed_by_llm_settings(self, pdf_file):
+        """Test that a different model deployment misses the cached result."""
+        step = Mock(side_effect=lambda inputs: {**inputs, "overall_summary": "總結"})
+        settings = Mock(return_value=("gpt-4.1", "2024-02-15"))
+        wrapped = cached_step("overall_summary", llm_settings=settings)(step)
+        inputs = {"document": ExtractedDocument(source_file=str(pdf_file))}
+
+        wrapped(inputs)
+        wrapped(inputs)
+        settings.return_value = ("gpt-4o", "2024-02-15")
+        wrapped(inputs)
+
+        assert step.call_count == 2
+        settings.assert_called_with(inputs)
+
+    def test_cached_step_disabled(self, pdf_file, monkeypatch):
+        """Test that DOCXTRACT_NO_CACHE bypasses the cache."""
+        monkeypatch.setenv("DOCXTRACT_NO_CACHE", "1")
+        step = Mock(side_effect=lambda inputs: {**inputs, "overall_summary": "總結"})
+        wrapped = cached_step("overall_summary")(step)
+        inputs = {"document": ExtractedDocument(source_file=str(pdf_file))}
+
+        wrapped(inputs)
+        wrapped(inputs)
+
+        assert step.call_count == 2
+        assert not get_cache_dir().exists()
+
+
+class TestSemanticCache:
+    """Test cases for the embedding-similarity index."""
+
+    def test_lookup_respects_threshold(self):
+        """Test that only neighbours above the threshold are returned."""
+        cache = SemanticCache("gpt-4.1", "v1", "Abstract", threshold=0.95)
+        assert cache.lookup([1.0, 0.0]) is None
+
+        cache.add([2.0, 0.0], "summary")
+
+        assert cache.lookup([1.0, 0.01]) == "summary"
+        assert cache.lookup([1.0, 1.0]) is None
+        assert SemanticCache("gpt-4.1", "v1", "Method", 0.95).lookup([1.0, 0.0]) is None
+
+    def test_index_changes_with_prompts_and_api_version(self, tmp_path, monkeypatch):
+        """Test that summaries written with an older prompt or API version are not reused."""
+        prompts = tmp_path / "prompts"
+        prompts.mkdir()
+        template = prompts / "prompt.md"
+        template.write_text("v1", encoding="utf-8")
+        monkeypatch.setattr(cache, "PROMPTS_DIR", prompts)
+        SemanticCache("gpt-4.1", "v1", "Abstract", 0.95).add([1.0, 0.0], "old")
+
+        assert SemanticCache("gpt-4.1", "v1", "Abstract", 0.95).lookup([1.0, 0.0]) == (
+            "old"
+        )
+        assert (
+            SemanticCache("gpt-4.1", "v2", "Abstract", 0.95).lookup([1.0, 0.0]) is None
+        )
+
+        template.write_text("v2 edited", encoding="utf-8")
+        assert (
+            SemanticCache("gpt-4.1", "v1", "Abstract", 0.95).lookup([1.0, 0.0]) is None
+        )
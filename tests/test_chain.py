@@ -1,33 +1,76 @@
 """Unit tests for docxtract.chain module."""
 
+import asyncio
+import io
+import subprocess
+import sys
+import threading
+from operator import attrgetter
 from pathlib import Path
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from docxtract.chain import (
+    OVERALL_SUMMARY_FAILED,
     DocExtractPipeline,
+    aimportant_points_and_ideas_step,
+    asummarize_documents,
+    asummarize_overall_step,
+    asummarize_sections_step,
+    build_llm_pipeline,
+    extract_and_parse_step,
     extract_pdf_step,
     generate_application_ideas,
     generate_important_points,
+    get_extractor,
     get_ideas_prompt,
     get_take_away_prompt,
     important_points_and_ideas_step,
     load_prompt_template,
     parse_sections_step,
+    preload_prompt_templates,
     summarize_overall_step,
     summarize_sections_step,
     to_markdown_step,
 )
+from docxtract.extract import PDFExtractor
 from docxtract.models import DocumentSection, ExtractedDocument
+from docxtract.parser import DEFAULT_PARSER
+from docxtract.summarizer import ChineseSummarizer
+
+TEST_PDF_PATH = Path("test.pdf")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def prompt_templates():
+    """Read the prompt templates once per test process (or pytest-xdist worker)."""
+    preload_prompt_templates()
+
+
+@pytest.fixture(autouse=True)
+def map_reduce_only(monkeypatch):
+    """Disable the single-call path so small test documents use map-reduce."""
+    monkeypatch.setattr("docxtract.summarizer.SINGLE_CALL_TOKEN_LIMIT", 0)
+
+
+def run_with_failing_summarizer(step, document, **state):
+    """Run a pipeline step with a summarizer whose every LLM-backed call raises."""
+    error = Exception("LLM call failed")
+    summarizer = Mock()
+    summarizer.summarize_overall.side_effect = error
+    summarizer.summarize_document.side_effect = error
+    summarizer.invoke_prompt.side_effect = error
+    return step({"document": document, "summarizer": summarizer, **state})
 
 
 class TestChainSteps:
     """Test cases for individual pipeline steps."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def sample_document(self):
-        """Create a sample document for testing."""
+        """Create a sample document shared by all tests (treat as read-only)."""
         sections = [
             DocumentSection(
                 title="Abstract", content="This paper presents a novel approach."
@@ -41,38 +84,85 @@ class TestChainSteps:
             title="Test Paper", sections=sections, source_file="test.pdf"
         )
 
+    @pytest.fixture
+    def mock_summarizer(self):
+        """Patch ChineseSummarizer and return the instance the steps will create."""
+        with patch("docxtract.chain.ChineseSummarizer") as mock_summarizer_class:
+            yield mock_summarizer_class.return_value
+
     def test_extract_pdf_step_success(self, sample_document):
         """Test successful PDF extraction step."""
-        with patch("docxtract.chain.PDFExtractor") as mock_extractor_class:
+        with patch("docxtract.chain.get_extractor") as mock_get_extractor:
             mock_extractor = Mock()
             mock_extractor.extract_document.return_value = sample_document
-            mock_extractor_class.return_value = mock_extractor
+            mock_get_extractor.return_value = mock_extractor
 
-            result = extract_pdf_step(Path("test.pdf"))
+            result = extract_pdf_step(TEST_PDF_PATH)
 
             assert "document" in result
-            assert result["document"] == sample_document
-            mock_extractor.extract_document.assert_called_once_with(Path("test.pdf"))
-
-    def test_extract_pdf_step_failure(self):
-        """Test PDF extraction step with extraction failure."""
-        with patch("docxtract.chain.PDFExtractor") as mock_extractor_class:
-            mock_extractor = Mock()
-            mock_extractor.extract_document.side_effect = Exception(
-                "PDF extraction failed"
-            )
-            mock_extractor_class.return_value = mock_extractor
+            assert result["document"] is sample_document
+            mock_extractor.extract_document.assert_called_once_with(TEST_PDF_PATH)
+
+    @pytest.mark.parametrize(
+        "target, method, step, make_input, message",
+        [
+            (
+                "docxtract.chain.get_extractor",
+                "return_value.extract_document",
+                extract_pdf_step,
+                lambda document: TEST_PDF_PATH,
+                "Failed to extract PDF",
+            ),
+            (
+                "docxtract.chain.DEFAULT_PARSER",
+                "parse_document",
+                parse_sections_step,
+                lambda document: {"document": document},
+                "Failed to parse sections",
+            ),
+            (
+                "docxtract.chain.ChineseSummarizer",
+                "return_value.summarize_all_sections",
+                summarize_sections_step,
+                lambda document: {"document": document},
+                "Failed to summarize sections",
+            ),
+        ],
+        ids=["extract", "parse", "summarize_sections"],
+    )
+    def test_step_failure_is_wrapped(
+        self, sample_document, target, method, step, make_input, message
+    ):
+        """Test that extraction, parsing and section steps wrap errors in RuntimeError."""
+        with patch(target) as mock:
+            attrgetter(method)(mock).side_effect = Exception("Step failed")
 
             with pytest.raises(RuntimeError) as exc_info:
-                extract_pdf_step(Path("test.pdf"))
+                step(make_input(sample_document))
+
+        assert message in str(exc_info.value)
+        assert "Step failed" in str(exc_info.value)
+
+    def test_extractor_is_shared(self):
+        """Test that every extraction step reuses one PDFExtractor instance."""
+        assert isinstance(get_extractor(), PDFExtractor)
+        assert get_extractor() is get_extractor()
+
+    def test_extract_and_parse_step(self, sample_document):
+        """Test that the fused step hands a section parser to the extractor."""
+        with patch("docxtract.chain.get_extractor") as mock_get_extractor:
+            mock_extractor = mock_get_extractor.return_value
+            mock_extractor.extract_document.return_value = sample_document
 
-            assert "Failed to extract PDF" in str(exc_info.value)
-            assert "PDF extraction failed" in str(exc_info.value)
+            result = extract_and_parse_step(TEST_PDF_PATH)
+
+            assert result == {"document": sample_document}
+            _, kwargs = mock_extractor.extract_document.call_args
+            assert kwargs["parser"] is DEFAULT_PARSER
 
     def test_parse_sections_step_success(self, sample_document):
         """Test successful section parsing step."""
-        with patch("docxtract.chain.SectionParser") as mock_parser_class:
-            mock_parser = Mock()
+        with patch("docxtract.chain.DEFAULT_PARSER") as mock_parser:
             parsed_document = ExtractedDocument(
                 title="Parsed Paper",
                 sections=[
@@ -81,109 +171,181 @@ class TestChainSteps:
                 source_file="test.pdf",
             )
             mock_parser.parse_document.return_value = parsed_document
-            mock_parser_class.return_value = mock_parser
 
             inputs = {"document": sample_document}
             result = parse_sections_step(inputs)
 
             assert "document" in result
-            assert result["document"] == parsed_document
-            mock_parser.parse_document.assert_called_once_with(sample_document)
+            assert result["document"] is parsed_document
+            assert mock_parser.parse_document.call_count == 1
+            assert mock_parser.parse_document.call_args.args[0] is sample_document
 
-    def test_parse_sections_step_failure(self, sample_document):
-        """Test section parsing step with parsing failure."""
-        with patch("docxtract.chain.SectionParser") as mock_parser_class:
-            mock_parser = Mock()
-            mock_parser.parse_document.side_effect = Exception("Parsing failed")
-            mock_parser_class.return_value = mock_parser
+    def test_summarize_sections_step_success(self, sample_document, mock_summarizer):
+        """Test successful section summarization step."""
+        section_summaries = {
+            "Abstract": "Abstract summary in Chinese",
+            "Introduction": "Introduction summary in Chinese",
+        }
+        mock_summarizer.summarize_all_sections.return_value = section_summaries
+
+        inputs = {"document": sample_document}
+        result = summarize_sections_step(inputs)
+
+        assert "document" in result
+        assert "section_summaries" in result
+        assert result["document"] is sample_document
+        assert result["section_summaries"] == section_summaries
+        assert mock_summarizer.summarize_all_sections.call_count == 1
+        assert (
+            mock_summarizer.summarize_all_sections.call_args.args[0] is sample_document
+        )
 
-            inputs = {"document": sample_document}
+    def test_asummarize_sections_step_success(self, sample_document, mock_summarizer):
+        """Test the async section summarization step."""
+        section_summaries = {"Abstract": "Abstract summary in Chinese"}
+        mock_summarizer.asummarize_all_sections = AsyncMock(
+            return_value=section_summaries
+        )
 
-            with pytest.raises(RuntimeError) as exc_info:
-                parse_sections_step(inputs)
+        result = asyncio.run(asummarize_sections_step({"document": sample_document}))
 
-            assert "Failed to parse sections" in str(exc_info.value)
-            assert "Parsing failed" in str(exc_info.value)
+        assert result["document"] is sample_document
+        assert result["section_summaries"] == section_summaries
+        assert mock_summarizer.asummarize_all_sections.await_count == 1
+        assert (
+            mock_summarizer.asummarize_all_sections.call_args.args[0] is sample_document
+        )
 
-    def test_summarize_sections_step_success(self, sample_document):
-        """Test successful section summarization step."""
-        with patch("docxtract.chain.ChineseSummarizer") as mock_summarizer_class:
-            mock_summarizer = Mock()
-            section_summaries = {
-                "Abstract": "Abstract summary in Chinese",
-                "Introduction": "Introduction summary in Chinese",
-            }
-            mock_summarizer.summarize_all_sections.return_value = section_summaries
-            mock_summarizer_class.return_value = mock_summarizer
+    def test_asummarize_sections_step_failure(self, sample_document, mock_summarizer):
+        """Test the async section summarization step wraps failures."""
+        mock_summarizer.asummarize_all_sections = AsyncMock(
+            side_effect=Exception("Summarization failed")
+        )
 
-            inputs = {"document": sample_document}
-            result = summarize_sections_step(inputs)
+        with pytest.raises(RuntimeError) as exc_info:
+            asyncio.run(asummarize_sections_step({"document": sample_document}))
 
-            assert "document" in result
-            assert "section_summaries" in result
-            assert result["document"] == sample_document
-            assert result["section_summaries"] == section_summaries
-            mock_summarizer.summarize_all_sections.assert_called_once_with(
-                sample_document
-            )
+        assert "Failed to summarize sections" in str(exc_info.value)
 
-    def test_summarize_sections_step_failure(self, sample_document):
-        """Test section summarization step with failure."""
-        with patch("docxtract.chain.ChineseSummarizer") as mock_summarizer_class:
-            mock_summarizer = Mock()
-            mock_summarizer.summarize_all_sections.side_effect = Exception(
-                "Summarization failed"
-            )
-            mock_summarizer_class.return_value = mock_summarizer
+    def test_summarize_overall_step_success(self, sample_document, mock_summarizer):
+        """Test successful overall summarization step."""
+        overall_summary = "Overall summary in Chinese"
+        mock_summarizer.summarize_overall.return_value = overall_summary
 
-            inputs = {"document": sample_document}
+        inputs = {
+            "document": sample_document,
+            "section_summaries": {"Abstract": "Abstract summary"},
+        }
+        result = summarize_overall_step(inputs)
+
+        assert "document" in result
+        assert "section_summaries" in result
+        assert "overall_summary" in result
+        assert result["overall_summary"] == overall_summary
+        mock_summarizer.summarize_overall.assert_called_once_with(
+            {"Abstract": "Abstract summary"}, "Test Paper"
+        )
 
-            with pytest.raises(RuntimeError) as exc_info:
-                summarize_sections_step(inputs)
+    def test_summarize_sections_step_cached_on_disk(self, tmp_path):
+        """Test that a second run on the same PDF reuses cached section summaries."""
+        pdf_path = tmp_path / "paper.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4 cached")
+        doc = ExtractedDocument(
+            title="Paper",
+            sections=[DocumentSection(title="Abstract", content="Abstract content.")],
+            source_file=str(pdf_path),
+        )
+        mock_summarizer = Mock()
+        mock_summarizer.summarize_all_sections.return_value = {"Abstract": "摘要"}
+
+        first = summarize_sections_step(
+            {"document": doc, "summarizer": mock_summarizer}
+        )
+        second = summarize_sections_step(
+            {"document": doc, "summarizer": mock_summarizer}
+        )
 
-            assert "Failed to summarize sections" in str(exc_info.value)
-            assert "Summarization failed" in str(exc_info.value)
+        assert first["section_summaries"] == second["section_summaries"]
+        mock_summarizer.summarize_all_sections.assert_called_once()
 
-    def test_summarize_overall_step_success(self, sample_document):
-        """Test successful overall summarization step."""
-        with patch("docxtract.chain.ChineseSummarizer") as mock_summarizer_class:
-            mock_summarizer = Mock()
-            overall_summary = "Overall summary in Chinese"
-            mock_summarizer.summarize_overall.return_value = overall_summary
-            mock_summarizer_class.return_value = mock_summarizer
+    def test_short_document_single_call(self, sample_document, monkeypatch):
+        """Test that short documents skip section summaries and use one call."""
+        monkeypatch.setattr("docxtract.summarizer.SINGLE_CALL_TOKEN_LIMIT", 8000)
+        mock_summarizer = Mock()
+        mock_summarizer.summarize_document.return_value = "總結"
 
-            inputs = {
-                "document": sample_document,
-                "section_summaries": {"Abstract": "Abstract summary"},
-            }
-            result = summarize_overall_step(inputs)
+        sections = summarize_sections_step(
+            {"document": sample_document, "summarizer": mock_summarizer}
+        )
+        result = summarize_overall_step(sections)
+
+        assert sections["section_summaries"] == {}
+        assert result["overall_summary"] == "總結"
+        mock_summarizer.summarize_all_sections.assert_not_called()
+        mock_summarizer.summarize_overall.assert_not_called()
+        assert mock_summarizer.summarize_document.call_count == 1
+        assert mock_summarizer.summarize_document.call_args.args[0] is sample_document
+
+    def test_ashort_document_single_call(self, sample_document, monkeypatch):
+        """Test that the async steps also summarize short documents in one call."""
+        monkeypatch.setattr("docxtract.summarizer.SINGLE_CALL_TOKEN_LIMIT", 8000)
+        mock_summarizer = Mock()
+        mock_summarizer.asummarize_all_sections = AsyncMock()
+        mock_summarizer.asummarize_document = AsyncMock(return_value="總結")
 
-            assert "document" in result
-            assert "section_summaries" in result
-            assert "overall_summary" in result
-            assert result["overall_summary"] == overall_summary
-            mock_summarizer.summarize_overall.assert_called_once_with(
-                {"Abstract": "Abstract summary"}, "Test Paper"
+        sections = asyncio.run(
+            asummarize_sections_step(
+                {"document": sample_document, "summarizer": mock_summarizer}
             )
+        )
+        result = asyncio.run(asummarize_overall_step(sections))
 
-    def test_summarize_overall_step_failure(self, sample_document):
-        """Test overall summarization step with failure (should not raise)."""
+        assert result["overall_summary"] == "總結"
+        mock_summarizer.asummarize_all_sections.assert_not_awaited()
+        assert mock_summarizer.asummarize_document.await_count == 1
+        assert mock_summarizer.asummarize_document.call_args.args[0] is sample_document
+
+    def test_summarize_overall_step_reuses_summarizer(self, sample_document):
+        """Test that a summarizer passed by an earlier step is reused."""
         with patch("docxtract.chain.ChineseSummarizer") as mock_summarizer_class:
-            mock_summarizer = Mock()
-            mock_summarizer.summarize_overall.side_effect = Exception(
-                "Overall summarization failed"
-            )
-            mock_summarizer_class.return_value = mock_summarizer
+            shared_summarizer = Mock()
+            shared_summarizer.summarize_overall.return_value = "Overall"
 
             inputs = {
                 "document": sample_document,
+                "summarizer": shared_summarizer,
                 "section_summaries": {"Abstract": "Abstract summary"},
             }
             result = summarize_overall_step(inputs)
 
-            # Should not raise exception, but return fallback message
-            assert "overall_summary" in result
-            assert result["overall_summary"] == "(Failed to generate overall summary)"
+            mock_summarizer_class.assert_not_called()
+            assert result["summarizer"] is shared_summarizer
+            assert result["overall_summary"] == "Overall"
+
+    def test_summarize_overall_step_not_configured(self, sample_document):
+        """Test that an unconfigured summarizer is not called at all."""
+        mock_summarizer = Mock()
+        mock_summarizer.is_configured.return_value = False
+        inputs = {
+            "document": sample_document,
+            "section_summaries": {"Abstract": "Abstract summary"},
+            "summarizer": mock_summarizer,
+        }
+
+        result = summarize_overall_step(inputs)
+
+        assert result["overall_summary"] == OVERALL_SUMMARY_FAILED
+        mock_summarizer.summarize_overall.assert_not_called()
+
+    def test_summarize_overall_step_failure(self, sample_document):
+        """Test overall summarization step with failure (should not raise)."""
+        result = run_with_failing_summarizer(
+            summarize_overall_step,
+            sample_document,
+            section_summaries={"Abstract": "Abstract summary"},
+        )
+
+        assert result["overall_summary"] == OVERALL_SUMMARY_FAILED
 
     def test_important_points_and_ideas_step_success(self, sample_document):
         """Test successful important points and ideas generation."""
@@ -224,13 +386,13 @@ class TestChainSteps:
         """Test important points and ideas step with real function calls (integration-style)."""
         with patch("docxtract.chain.ChineseSummarizer") as mock_summarizer_class:
             mock_llm = Mock()
-            mock_response = Mock()
-            mock_response.content = "   Response with whitespace   "
-            mock_llm.invoke.return_value = mock_response
+            mock_llm.ainvoke = AsyncMock(
+                return_value=SimpleNamespace(content="   Response with whitespace   ")
+            )
 
-            mock_summarizer = Mock()
-            mock_summarizer.llm = mock_llm
-            mock_summarizer_class.return_value = mock_summarizer
+            summarizer = ChineseSummarizer(use_cache=False)
+            summarizer.llm = mock_llm
+            mock_summarizer_class.return_value = summarizer
 
             inputs = {
                 "document": sample_document,
@@ -244,37 +406,73 @@ class TestChainSteps:
             # Should strip whitespace from responses
             assert result["important_points"] == "Response with whitespace"
             assert result["ideas"] == "Response with whitespace"
-            assert mock_llm.invoke.call_count == 2  # Called for both points and ideas
+            # Called for both points and ideas, through the summarizer's retry helper
+            assert mock_llm.ainvoke.await_count == 2
+            summarizer.close()
+
+    def test_aimportant_points_and_ideas_step_concurrent(self, sample_document):
+        """Test that points and ideas LLM calls are issued concurrently."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_ainvoke_prompt(prompt):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return "Async response"
 
-    def test_important_points_and_ideas_step_no_llm(self, sample_document):
-        """Test important points and ideas step when LLM is None."""
-        with (
-            patch("docxtract.chain.generate_important_points") as mock_points,
-            patch("docxtract.chain.generate_application_ideas") as mock_ideas,
-        ):
-            mock_points.return_value = ""
-            mock_ideas.return_value = ""
+        with patch("docxtract.chain.ChineseSummarizer") as mock_summarizer_class:
+            mock_summarizer = Mock()
+            mock_summarizer.ainvoke_prompt = AsyncMock(side_effect=fake_ainvoke_prompt)
+            mock_summarizer_class.return_value = mock_summarizer
 
             inputs = {
                 "document": sample_document,
                 "section_summaries": {"Abstract": "Summary"},
                 "overall_summary": "Overall summary text",
             }
-            result = important_points_and_ideas_step(inputs)
+            result = asyncio.run(aimportant_points_and_ideas_step(inputs))
 
-            assert "important_points" in result
-            assert "ideas" in result
-            assert result["important_points"] == ""
-            assert result["ideas"] == ""
+            assert result["important_points"] == "Async response"
+            assert result["ideas"] == "Async response"
+            assert mock_summarizer.ainvoke_prompt.await_count == 2
+            assert max_in_flight == 2
+            mock_summarizer.invoke_prompt.assert_not_called()
 
-    def test_important_points_and_ideas_step_failure(self, sample_document):
-        """Test important points and ideas step with function failures."""
+    def test_important_points_and_ideas_step_runs_calls_in_parallel(
+        self, sample_document
+    ):
+        """Test that the sync step issues both blocking LLM calls at once."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def invoke_prompt(prompt):
+            # Both calls must be in flight together to pass the barrier
+            barrier.wait()
+            return "response"
+
+        mock_summarizer = Mock()
+        mock_summarizer.invoke_prompt.side_effect = invoke_prompt
+        inputs = {
+            "document": sample_document,
+            "summarizer": mock_summarizer,
+            "overall_summary": "Overall summary text",
+        }
+
+        result = important_points_and_ideas_step(inputs)
+
+        assert result["important_points"] == "response"
+        assert result["ideas"] == "response"
+
+    def test_important_points_and_ideas_step_no_llm(self, sample_document):
+        """Test important points and ideas step when LLM is None."""
         with (
             patch("docxtract.chain.generate_important_points") as mock_points,
             patch("docxtract.chain.generate_application_ideas") as mock_ideas,
         ):
-            mock_points.return_value = "(Failed to generate important points)"
-            mock_ideas.return_value = "(Failed to generate application ideas)"
+            mock_points.return_value = ""
+            mock_ideas.return_value = ""
 
             inputs = {
                 "document": sample_document,
@@ -283,73 +481,173 @@ class TestChainSteps:
             }
             result = important_points_and_ideas_step(inputs)
 
-            # Should not raise exception, but return fallback messages
-            assert result["important_points"] == "(Failed to generate important points)"
-            assert result["ideas"] == "(Failed to generate application ideas)"
+            assert "important_points" in result
+            assert "ideas" in result
+            assert result["important_points"] == ""
+            assert result["ideas"] == ""
 
-    def test_to_markdown_step_complete(self, sample_document):
-        """Test markdown generation with complete inputs."""
+    @pytest.mark.parametrize("overall_summary", ["", OVERALL_SUMMARY_FAILED])
+    def test_important_points_and_ideas_step_skips_failed_summary(
+        self, sample_document, overall_summary
+    ):
+        """Test that no LLM calls are made without a usable overall summary."""
+        mock_summarizer = Mock()
+        mock_summarizer.ainvoke_prompt = AsyncMock()
         inputs = {
             "document": sample_document,
-            "section_summaries": {"Abstract": "Summary"},
-            "overall_summary": "Complete overall summary",
-            "important_points": "1. Point one\n2. Point two",
-            "ideas": "1. Idea one\n2. Idea two",
+            "summarizer": mock_summarizer,
+            "section_summaries": {},
+            "overall_summary": overall_summary,
         }
 
-        result = to_markdown_step(inputs)
+        result = important_points_and_ideas_step(inputs)
+        async_result = asyncio.run(aimportant_points_and_ideas_step(inputs))
 
-        # Check that all sections are included
-        assert "# Test Paper" in result
-        assert "## Top-5 Important Points" in result
-        assert "1. Point one" in result
-        assert "## Application Ideas" in result
-        assert "1. Idea one" in result
-        assert "## Chinese Summary" in result
-        assert "Complete overall summary" in result
-        assert "*Chinese summary generated using GPT-4.1*" in result
-
-    def test_to_markdown_step_minimal(self, sample_document):
-        """Test markdown generation with minimal inputs."""
-        sample_document.title = None  # No title
-        inputs = {
-            "document": sample_document,
-            "section_summaries": {},
-            "overall_summary": None,  # No overall summary
-        }
+        for step_result in (result, async_result):
+            assert step_result["important_points"] == ""
+            assert step_result["ideas"] == ""
+        mock_summarizer.invoke_prompt.assert_not_called()
+        mock_summarizer.ainvoke_prompt.assert_not_awaited()
 
-        result = to_markdown_step(inputs)
+    def test_important_points_and_ideas_step_failure(self, sample_document):
+        """Test important points and ideas step with LLM failures."""
+        result = run_with_failing_summarizer(
+            important_points_and_ideas_step,
+            sample_document,
+            overall_summary="Overall summary text",
+        )
 
-        # 應該只檢查是否有 H1 標題（# ），而不是 # 號開頭的所有行
-        lines = result.splitlines()
-        assert not any(
-            line.startswith("# ") and not line.startswith("##") for line in lines
+        assert result["important_points"] == "(Failed to generate important points)"
+        assert result["ideas"] == "(Failed to generate application ideas)"
+
+    @pytest.mark.parametrize(
+        "section_summaries,expected_calls",
+        [
+            ({"Abstract": "摘要", "Method": "方法"}, 1),
+            ({"Abstract": "摘要", "Method": ""}, 2),
+        ],
+    )
+    def test_llm_steps_cache_only_complete_results(
+        self, tmp_path, section_summaries, expected_calls
+    ):
+        """Test that a run with a failed section is not cached, so it is retried."""
+        pdf_path = tmp_path / "paper.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4 test content")
+        document = ExtractedDocument(
+            sections=[
+                DocumentSection(title="Abstract", content="Abstract content."),
+                DocumentSection(title="Method", content="Method content."),
+            ],
+            source_file=str(pdf_path),
         )
-        assert "## Top-5 Important Points" not in result  # No points section
-        assert "## Application Ideas" not in result  # No ideas section
-        assert "## Chinese Summary" in result
-        assert "(Failed to generate overall summary)" in result
-        assert "*Chinese summary generated using GPT-4.1*" in result
-
-    def test_to_markdown_step_partial(self, sample_document):
-        """Test markdown generation with partial inputs."""
+        summarizer = Mock()
+        summarizer.summarize_all_sections.return_value = section_summaries
+        summarizer.summarize_overall.return_value = "總結"
+
+        for _ in range(2):
+            state = {"document": document, "summarizer": summarizer}
+            summarize_overall_step(summarize_sections_step(state))
+
+        assert summarizer.summarize_all_sections.call_count == expected_calls
+        assert summarizer.summarize_overall.call_count == expected_calls
+
+    def test_steps_update_state_in_place(self, sample_document):
+        """Test that each step updates and returns the same state dict."""
+        mock_summarizer = Mock()
+        mock_summarizer.summarize_all_sections.return_value = {"Abstract": "摘要"}
+        mock_summarizer.summarize_overall.return_value = "總結"
+        mock_summarizer.invoke_prompt.return_value = "重點"
+        state = {"document": sample_document, "summarizer": mock_summarizer}
+
+        for step in (
+            summarize_sections_step,
+            summarize_overall_step,
+            important_points_and_ideas_step,
+        ):
+            assert step(state) is state
+
+        assert state["section_summaries"] == {"Abstract": "摘要"}
+        assert state["overall_summary"] == "總結"
+        assert state["important_points"] == state["ideas"] == "重點"
+
+    @pytest.mark.parametrize(
+        "title, fields, must_contain, must_not_contain",
+        [
+            (
+                "Test Paper",
+                {
+                    "overall_summary": "Complete overall summary",
+                    "important_points": "1. Point one\n2. Point two",
+                    "ideas": "1. Idea one\n2. Idea two",
+                },
+                [
+                    "## Top-5 Important Points",
+                    "1. Point one",
+                    "## Application Ideas",
+                    "1. Idea one",
+                    "## Chinese Summary",
+                    "Complete overall summary",
+                    "*Chinese summary generated using GPT-4.1*",
+                ],
+                [],
+            ),
+            (
+                None,
+                {"overall_summary": None},
+                [
+                    "## Chinese Summary",
+                    "(Failed to generate overall summary)",
+                    "*Chinese summary generated using GPT-4.1*",
+                ],
+                ["## Top-5 Important Points", "## Application Ideas"],
+            ),
+            (
+                "Test Paper",
+                {
+                    "overall_summary": "Partial summary",
+                    "important_points": "Some points",
+                },
+                [
+                    "## Top-5 Important Points",
+                    "Some points",
+                    "## Chinese Summary",
+                    "Partial summary",
+                ],
+                ["## Application Ideas"],
+            ),
+        ],
+        ids=["complete", "minimal", "partial"],
+    )
+    def test_to_markdown_step(
+        self, sample_document, title, fields, must_contain, must_not_contain
+    ):
+        """Test that markdown includes exactly the blocks whose inputs are present."""
+        document = sample_document.model_copy(update={"title": title})
+        inputs = {"document": document, "section_summaries": {}, **fields}
+
+        result = to_markdown_step(inputs)
+
+        # Only the paper title may be an H1 heading
+        h1_lines = [line for line in result.splitlines() if line.startswith("# ")]
+        assert h1_lines == ([f"# {title}"] if title else [])
+        assert all(text in result for text in must_contain)
+        assert not any(text in result for text in must_not_contain)
+
+    def test_to_markdown_step_writer(self, sample_document):
+        """Test markdown is streamed to a writer and matches the returned text."""
         inputs = {
             "document": sample_document,
-            "section_summaries": {"Abstract": "Summary"},
-            "overall_summary": "Partial summary",
-            "important_points": "Some points",
-            # Missing "ideas"
+            "overall_summary": "Streamed summary",
+            "important_points": "1. Point",
+            "ideas": "1. Idea",
         }
+        buffer = io.StringIO()
 
-        result = to_markdown_step(inputs)
+        result = to_markdown_step(inputs, buffer)
 
-        # Should include what's available
-        assert "# Test Paper" in result
-        assert "## Top-5 Important Points" in result
-        assert "Some points" in result
-        assert "## Application Ideas" not in result  # Missing ideas
-        assert "## Chinese Summary" in result
-        assert "Partial summary" in result
+        assert result == ""
+        assert buffer.getvalue() == to_markdown_step(inputs)
+        assert buffer.getvalue().startswith("# Test Paper\n\n## Top-5 Important Points")
 
 
 class TestDocExtractPipeline:
@@ -362,6 +660,149 @@ class TestDocExtractPipeline:
         # Should be a Runnable
         assert isinstance(DocExtractPipeline, Runnable)
 
+    def test_pipeline_built_once(self):
+        """Test that the lazily built pipeline is cached and shared."""
+        import docxtract.chain as chain
+
+        assert chain.DocExtractPipeline is chain.build_pipeline()
+        assert chain.DocSummaryPipeline is chain.build_summary_pipeline()
+
+    def test_cli_import_does_not_load_pipeline(self):
+        """Test that importing the CLI does not import the LangChain pipeline."""
+        code = (
+            "import sys, docxtract.cli; "
+            "sys.exit('docxtract.chain' in sys.modules or 'fitz' in sys.modules)"
+        )
+        result = subprocess.run([sys.executable, "-c", code])
+
+        assert result.returncode == 0
+
+    def test_chain_import_defers_heavy_modules(self):
+        """Test that importing the pipeline module does not load PyMuPDF or numpy."""
+        code = (
+            "import sys, docxtract.chain; "
+            "sys.exit(any(m in sys.modules for m in ('fitz', 'numpy')))"
+        )
+        result = subprocess.run([sys.executable, "-c", code])
+
+        assert result.returncode == 0
+
+    def test_pipeline_ainvoke_uses_async_steps(self, tmp_path):
+        """Test that the async pipeline routes LLM steps through their async variants."""
+        document = ExtractedDocument(
+            title="Async Paper",
+            sections=[DocumentSection(title="Abstract", content="Async content.")],
+            source_file="async.pdf",
+        )
+        with (
+            patch("docxtract.chain.get_extractor") as mock_get_extractor,
+            patch("docxtract.chain.ChineseSummarizer") as mock_summarizer_class,
+        ):
+            mock_get_extractor.return_value.extract_document.return_value = document
+            mock_summarizer = Mock()
+            mock_summarizer.asummarize_all_sections = AsyncMock(
+                return_value={"Abstract": "摘要"}
+            )
+            mock_summarizer.asummarize_overall = AsyncMock(return_value="總結")
+            mock_summarizer.ainvoke_prompt = AsyncMock(return_value="重點")
+            mock_summarizer_class.return_value = mock_summarizer
+
+            result = asyncio.run(DocExtractPipeline.ainvoke(tmp_path / "async.pdf"))
+
+            assert "# Async Paper" in result
+            assert "總結" in result
+            mock_summarizer.summarize_all_sections.assert_not_called()
+            mock_summarizer.summarize_overall.assert_not_called()
+            # One summarizer instance is shared by every LLM step
+            assert mock_summarizer_class.call_count == 1
+
+    def test_llm_pipeline_uses_given_summarizer(self):
+        """Test that the LLM pipeline runs with the caller's summarizer."""
+        document = ExtractedDocument(
+            title="Paper",
+            sections=[DocumentSection(title="Abstract", content="Content.")],
+            source_file="paper.pdf",
+        )
+        summarizer = Mock()
+        summarizer.asummarize_all_sections = AsyncMock(return_value={"A": "摘要"})
+        summarizer.asummarize_overall = AsyncMock(return_value="總結")
+        summarizer.ainvoke_prompt = AsyncMock(return_value="重點")
+        inputs = {"document": document, "summarizer": summarizer}
+
+        with patch("docxtract.chain.ChineseSummarizer") as mock_summarizer_class:
+            result = asyncio.run(build_llm_pipeline().ainvoke(inputs))
+
+        mock_summarizer_class.assert_not_called()
+        assert result["summarizer"] is summarizer
+        assert result["overall_summary"] == "總結"
+        assert result["important_points"] == "重點"
+
+    @pytest.fixture
+    def mock_summarizer(self):
+        """Patch the summarizer class with one async-capable mock instance."""
+        with patch("docxtract.chain.ChineseSummarizer") as mock_summarizer_class:
+            mock_summarizer = Mock()
+            mock_summarizer.asummarize_all_sections = AsyncMock(
+                return_value={"Abstract": "摘要"}
+            )
+            mock_summarizer.asummarize_overall = AsyncMock(return_value="總結")
+            mock_summarizer.ainvoke_prompt = AsyncMock(return_value="重點")
+            mock_summarizer.aclose = AsyncMock()
+            mock_summarizer_class.return_value = mock_summarizer
+            yield mock_summarizer
+
+    @staticmethod
+    def fake_extract(path):
+        """Extract a one-section document named after the path, failing on bad.pdf."""
+        if path.name == "bad.pdf":
+            raise RuntimeError("Failed to extract PDF: broken")
+        return {
+            "document": ExtractedDocument(
+                title=path.stem,
+                sections=[DocumentSection(title="Abstract", content="Content.")],
+                source_file=str(path),
+            )
+        }
+
+    def test_asummarize_documents(self, tmp_path, mock_summarizer):
+        """Test that documents keep input order and failures stay per document."""
+        paths = [tmp_path / "a.pdf", tmp_path / "bad.pdf", tmp_path / "c.pdf"]
+        with patch(
+            "docxtract.chain.extract_and_parse_step", side_effect=self.fake_extract
+        ):
+            results = asyncio.run(asummarize_documents(paths))
+
+        assert [r["document"].title for r in (results[0], results[2])] == ["a", "c"]
+        assert isinstance(results[1], RuntimeError)
+        assert results[0]["overall_summary"] == "總結"
+        assert results[2]["important_points"] == "重點"
+        assert results[0]["summarizer"] is mock_summarizer
+        mock_summarizer.aclose.assert_awaited_once()
+
+    def test_asummarize_documents_overlaps_stages(self, tmp_path, mock_summarizer):
+        """Test that the next PDF is extracted while the previous one is summarized."""
+        second_extracted = threading.Event()
+
+        def extract(path):
+            result = self.fake_extract(path)
+            if path.name == "b.pdf":
+                second_extracted.set()
+            return result
+
+        async def slow_overall(summaries, title):
+            if title == "a":
+                # Blocks forever if extraction of b.pdf waited for a.pdf to finish
+                assert await asyncio.to_thread(second_extracted.wait, 5)
+            return "總結"
+
+        mock_summarizer.asummarize_overall.side_effect = slow_overall
+        with patch("docxtract.chain.extract_and_parse_step", side_effect=extract):
+            results = asyncio.run(
+                asummarize_documents([tmp_path / "a.pdf", tmp_path / "b.pdf"])
+            )
+
+        assert [r["overall_summary"] for r in results] == ["總結", "總結"]
+
     @pytest.mark.integration
     def test_pipeline_step_order(self):
         """Test that pipeline steps are in correct order."""
@@ -390,6 +831,17 @@ class TestPromptTemplates:
 
         assert result == template_content
 
+    def test_load_prompt_template_is_cached(self, tmp_path):
+        """Test that repeated loads of the same template do not hit the disk."""
+        template_file = tmp_path / "cached_template.md"
+        template_file.write_text("Original {summary}", encoding="utf-8")
+
+        first = load_prompt_template(template_file)
+        template_file.write_text("Changed {summary}", encoding="utf-8")
+        second = load_prompt_template(template_file)
+
+        assert first == second == "Original {summary}"
+
     def test_load_prompt_template_file_not_found(self):
         """Test prompt template loading with non-existent file."""
         non_existent_path = Path("non_existent_template.md")
@@ -427,6 +879,17 @@ class TestPromptTemplates:
         assert "落地可行性" in result
         assert "商業價值" in result
 
+    @pytest.mark.parametrize("build_prompt", [get_take_away_prompt, get_ideas_prompt])
+    def test_prompt_summary_is_tail(self, build_prompt):
+        """Test that the summary is appended after a static, cacheable prefix."""
+        first = build_prompt("第一份總結")
+        second = build_prompt("第二份總結")
+
+        assert first.endswith("第一份總結")
+        assert second.endswith("第二份總結")
+        # Everything before the summary is identical across documents
+        assert first[: -len("第一份總結")] == second[: -len("第二份總結")]
+
     @patch("docxtract.chain.load_prompt_template")
     def test_get_take_away_prompt_with_mock_template(self, mock_load):
         """Test take away prompt with mocked template loading."""
@@ -451,82 +914,100 @@ class TestPromptTemplates:
         assert result == "Mock ideas template: test summary"
         mock_load.assert_called_once()
 
+    @patch("docxtract.chain.load_prompt_template")
+    def test_prompt_matches_str_format(self, mock_load):
+        """Test prompts equal str.format output, even with braces in the summary."""
+        mock_template = "Use {{json}}:\n{summary}\nEnd {{}}"
+        mock_load.return_value = mock_template
+        test_summary = "summary with {braces}"
+
+        result = get_take_away_prompt(test_summary)
+
+        assert result == mock_template.format(summary=test_summary)
+
+
+class FakeLLM:
+    """Minimal LLM stand-in that records its prompts (cheaper than a Mock tree)."""
+
+    def __init__(self, content: str = "", error: Exception = None):
+        self.content = content
+        self.error = error
+        self.calls = []
+
+    def invoke(self, prompt):
+        self.calls.append(prompt)
+        if self.error is not None:
+            raise self.error
+        return self.content
+
+
+class FakeSummarizer:
+    """Summarizer stand-in exposing only the `llm` and `invoke_prompt` the steps use."""
+
+    def __init__(self, llm: FakeLLM = None):
+        self.llm = llm
+
+    def invoke_prompt(self, prompt):
+        return self.llm.invoke(prompt)
+
 
 class TestNewPromptFunctions:
     """Test cases for new prompt generation functions."""
 
     def test_generate_important_points_success(self):
         """Test successful generation of important points."""
-        mock_summarizer = Mock()
-        mock_llm = Mock()
-        mock_response = Mock()
-        mock_response.content = "1. Important point one\n2. Important point two"
-        mock_llm.invoke.return_value = mock_response
-        mock_summarizer.llm = mock_llm
+        llm = FakeLLM("1. Important point one\n2. Important point two")
 
-        result = generate_important_points(mock_summarizer, "test summary")
+        result = generate_important_points(FakeSummarizer(llm), "test summary")
 
         assert result == "1. Important point one\n2. Important point two"
-        mock_llm.invoke.assert_called_once()
-        # Verify the call contains a HumanMessage with formatted prompt
-        call_args = mock_llm.invoke.call_args[0][0]
-        assert len(call_args) == 1
-        assert "test summary" in call_args[0].content
+        # One call with the formatted prompt
+        assert len(llm.calls) == 1
+        assert "test summary" in llm.calls[0]
 
     def test_generate_important_points_no_llm(self):
         """Test important points generation when LLM is None."""
-        mock_summarizer = Mock()
-        mock_summarizer.llm = None
+        result = generate_important_points(FakeSummarizer(), "test summary")
+
+        assert result == ""
 
-        result = generate_important_points(mock_summarizer, "test summary")
+    def test_generate_important_points_empty_summary(self):
+        """Test important points generation skips the LLM for an empty summary."""
+        llm = FakeLLM("unused")
+
+        result = generate_important_points(FakeSummarizer(llm), "")
 
         assert result == ""
+        assert llm.calls == []
 
     def test_generate_important_points_llm_failure(self):
         """Test important points generation when LLM call fails."""
-        mock_summarizer = Mock()
-        mock_llm = Mock()
-        mock_llm.invoke.side_effect = Exception("LLM error")
-        mock_summarizer.llm = mock_llm
+        llm = FakeLLM(error=Exception("LLM error"))
 
-        result = generate_important_points(mock_summarizer, "test summary")
+        result = generate_important_points(FakeSummarizer(llm), "test summary")
 
         assert result == "(Failed to generate important points)"
 
     def test_generate_application_ideas_success(self):
         """Test successful generation of application ideas."""
-        mock_summarizer = Mock()
-        mock_llm = Mock()
-        mock_response = Mock()
-        mock_response.content = "1. Application idea one\n2. Application idea two"
-        mock_llm.invoke.return_value = mock_response
-        mock_summarizer.llm = mock_llm
+        llm = FakeLLM("1. Application idea one\n2. Application idea two")
 
-        result = generate_application_ideas(mock_summarizer, "test summary")
+        result = generate_application_ideas(FakeSummarizer(llm), "test summary")
 
         assert result == "1. Application idea one\n2. Application idea two"
-        mock_llm.invoke.assert_called_once()
-        # Verify the call contains a HumanMessage with formatted prompt
-        call_args = mock_llm.invoke.call_args[0][0]
-        assert len(call_args) == 1
-        assert "test summary" in call_args[0].content
+        assert len(llm.calls) == 1
+        assert "test summary" in llm.calls[0]
 
     def test_generate_application_ideas_no_llm(self):
         """Test application ideas generation when LLM is None."""
-        mock_summarizer = Mock()
-        mock_summarizer.llm = None
-
-        result = generate_application_ideas(mock_summarizer, "test summary")
+        result = generate_application_ideas(FakeSummarizer(), "test summary")
 
         assert result == ""
 
     def test_generate_application_ideas_llm_failure(self):
         """Test application ideas generation when LLM call fails."""
-        mock_summarizer = Mock()
-        mock_llm = Mock()
-        mock_llm.invoke.side_effect = Exception("LLM error")
-        mock_summarizer.llm = mock_llm
+        llm = FakeLLM(error=Exception("LLM error"))
 
-        result = generate_application_ideas(mock_summarizer, "test summary")
+        result = generate_application_ideas(FakeSummarizer(llm), "test summary")
 
         assert result == "(Failed to generate application ideas)"
@@ -115,6 +115,37 @@ class TestExtractedDocument:
 
         assert doc.has_section("Non-Existing") is False
 
+    def test_section_lookup_tracks_changes(self, sample_extracted_document):
+        """Test section lookups see every kind of change to the sections."""
+        doc = sample_extracted_document.model_copy(deep=True)
+        assert doc.has_section("Appendix") is False
+
+        # Append
+        appendix = DocumentSection(title="Appendix", content="Extra material")
+        doc.sections.append(appendix)
+        assert doc.get_section("appendix") is appendix
+
+        # Replace in place
+        methods = DocumentSection(title="Methods", content="Method details")
+        doc.sections[0] = methods
+        assert doc.get_section("methods") is methods
+        assert doc.has_section("Abstract") is False
+
+        # Rename in place
+        methods.title = "Approach"
+        assert doc.get_section("approach") is methods
+        assert doc.has_section("Methods") is False
+
+        # A copy with its own sections doesn't affect the original
+        copy = doc.model_copy()
+        copy.sections = [appendix]
+        assert copy.has_section("Approach") is False
+        assert doc.get_section("approach") is methods
+
+        # Reassign
+        doc.sections = [appendix]
+        assert doc.has_section("Approach") is False
+
     def test_extracted_document_missing_source_file(self):
         """Test ExtractedDocument validation with missing source_file."""
         with pytest.raises(ValidationError) as exc_info:
@@ -7,10 +7,12 @@ Tests the SectionParser class functionality:
 - Document parsing integration
 """
 
+import re
+
 import pytest
 
 from docxtract.models import DocumentSection, ExtractedDocument
-from docxtract.parser import SectionParser
+from docxtract.parser import DEFAULT_PARSER, SectionParser
 
 
 class TestSectionParser:
@@ -39,6 +41,35 @@ class TestSectionParser:
         assert "Summary" in pattern_names
         assert "Analysis" in pattern_names
 
+    def test_compiled_patterns_shared_between_parsers(self):
+        """Test that parsers with the same patterns reuse compiled regexes."""
+        custom = [(r"^Summary\s*$", "Summary")]
+
+        assert SectionParser().compiled_patterns is SectionParser().compiled_patterns
+        assert (
+            SectionParser(custom).compiled_patterns
+            is SectionParser(list(custom)).compiled_patterns
+        )
+        assert SectionParser(custom).compiled_patterns is not (
+            SectionParser().compiled_patterns
+        )
+
+    def test_init_precompiled_patterns(self):
+        """Test that pre-compiled patterns are used as-is, keeping their own flags."""
+        summary = re.compile(r"^SUMMARY\s*$")  # case-sensitive
+        parser = SectionParser([(summary, "Summary"), (r"^Notes\s*$", "Notes")])
+
+        assert parser.compiled_patterns[0][0] is summary
+        assert parser.detect_section_boundaries("summary\nSUMMARY\nnotes") == [
+            ("Summary", 1),
+            ("Notes", 2),
+        ]
+
+    def test_default_parser_uses_builtin_patterns(self):
+        """Test that the shared DEFAULT_PARSER matches a freshly built parser."""
+        assert isinstance(DEFAULT_PARSER, SectionParser)
+        assert DEFAULT_PARSER.compiled_patterns is SectionParser().compiled_patterns
+
     def test_detect_section_boundaries_basic(self):
         """Test detection of basic section boundaries."""
         text = """
@@ -158,6 +189,87 @@ class TestSectionParser:
         assert len(boundaries) == 1
         assert boundaries[0][0] == expected_name
 
+    def test_detect_section_boundaries_blank_and_indented_lines(self):
+        """Test that blank lines are skipped and indented headers still match."""
+        parser = SectionParser()
+        lines = ["", " \t ", "\tAbstract", "   ", "Body", "  Conclusion  "]
+
+        assert parser.detect_section_boundaries_from_lines(lines) == [
+            ("Abstract", 2),
+            ("Conclusion", 5),
+        ]
+
+    def test_detect_section_boundaries_first_pattern_wins(self):
+        """Test that earlier patterns take precedence when several match a line."""
+        parser = SectionParser(
+            section_patterns=[
+                (r"^Results?\s*$", "Results"),
+                (r"^Results and Discussion\s*$", "Results and Discussion"),
+                (r"^Results.*$", "Catch-all"),
+            ]
+        )
+        boundaries = parser.detect_section_boundaries(
+            "Results\nA\nResults and Discussion\nB"
+        )
+
+        assert boundaries == [("Results", 0), ("Results and Discussion", 2)]
+
+    @pytest.mark.parametrize(
+        "patterns, text, expected",
+        [
+            # Global inline flag after the first pattern
+            (
+                [
+                    (r"^Abstract\s*$", "Abstract"),
+                    (r"(?x) ^ Appendix \s* $", "Appendix"),
+                ],
+                "Abstract\nA\nAppendix\nB",
+                [("Abstract", 0), ("Appendix", 2)],
+            ),
+            # Named group reused across patterns
+            (
+                [
+                    (r"(?P<n>\d+)\.\s+Intro", "Introduction"),
+                    (r"(?P<n>\d+)\.\s+Method", "Method"),
+                ],
+                "1. Intro\nA\n2. Method\nB",
+                [("Introduction", 0), ("Method", 2)],
+            ),
+            # Numbered backreference
+            (
+                [(r"^Abstract\s*$", "Abstract"), (r"^(\w)\1 Repeat$", "Repeat")],
+                "Abstract\nA\naa Repeat\nB",
+                [("Abstract", 0), ("Repeat", 2)],
+            ),
+        ],
+    )
+    def test_detect_section_boundaries_uncombinable_patterns(
+        self, patterns, text, expected
+    ):
+        """Test that patterns with groups or inline flags are matched one by one."""
+        parser = SectionParser(section_patterns=patterns)
+
+        assert parser.detect_section_boundaries(text) == expected
+        assert [
+            section.title
+            for section in parser.extract_sections_from_lines(text.split("\n"))
+        ] == [name for name, _ in expected]
+
+    def test_detect_section_boundaries_no_patterns(self):
+        """Test that a parser without patterns detects no boundaries."""
+        parser = SectionParser(section_patterns=[])
+
+        assert parser.detect_section_boundaries("Abstract\nContent") == []
+
+    def test_detect_section_boundaries_from_lines(self):
+        """Test boundary detection on pre-split lines matches the text variant."""
+        parser = SectionParser()
+        text = "Abstract\nSummary\n\nIntroduction\nBody"
+
+        assert parser.detect_section_boundaries_from_lines(
+            text.split("\n")
+        ) == parser.detect_section_boundaries(text)
+
     def test_extract_sections_basic(self):
         """Test basic section extraction."""
         text = """
@@ -251,6 +363,44 @@ class TestSectionParser:
         assert "final conclusion" in conclusion.content
         assert "properly extracted" in conclusion.content
 
+    def test_extract_sections_preserves_section_text(self):
+        """Test that section content is the exact text between headers."""
+        text = "Abstract\nLine one.\n  Indented line.\nKeywords: a, b\nIntroduction\nBody\n\nMore body"
+
+        parser = SectionParser()
+        sections = parser.extract_sections(text)
+
+        assert [(s.title, s.content) for s in sections] == [
+            ("Abstract", "Line one.\n  Indented line."),
+            ("Introduction", "Body\n\nMore body"),
+        ]
+
+    def test_extract_sections_header_on_last_line(self):
+        """Test that a trailing header without content yields no section."""
+        parser = SectionParser()
+        sections = parser.extract_sections("Introduction\nBody\nConclusion")
+
+        assert [s.title for s in sections] == ["Introduction"]
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "Abstract\nLine one.\nKeywords: a, b\nmore\nIntroduction\nBody\n\nMore body",
+            "Preamble\nTitle\n\nMethods\n  indented\nResults\n\nConclusion",
+            "No headers here\njust text\n",
+            "\n  No headers, padded  \n\n",
+            "",
+        ],
+    )
+    def test_extract_sections_from_lines_matches_extract_sections(self, text):
+        """Test that streaming extraction matches whole-text extraction."""
+        parser = SectionParser()
+
+        streamed = parser.extract_sections_from_lines(iter(text.split("\n")))
+
+        assert streamed == parser.extract_sections(text)
+        assert all(section.content == section.content.strip() for section in streamed)
+
     def test_parse_document_with_sections(self, sample_extracted_document):
         """Test parsing a document that contains section headers."""
         # Create a document with section headers in the content
@@ -1,12 +1,60 @@
 """Unit tests for docxtract.summarizer module."""
 
-from unittest.mock import Mock, patch
-
+import asyncio
+import json
+import subprocess
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import openai
 import pytest
-from langchain.schema import AIMessage
+from langchain_core.messages import AIMessage
 
 from docxtract.models import DocumentSection, ExtractedDocument, SummaryRequest
-from docxtract.summarizer import ChineseSummarizer
+from docxtract.summarizer import (
+    SINGLE_CALL_TOKEN_LIMIT,
+    ChineseSummarizer,
+    _dumps_jsonl,
+    _loads_json,
+    is_short_document,
+    truncate_tokens,
+)
+
+# Azure settings the client-construction tests expect to be passed through
+AZURE_ENV = {
+    "AZURE_OPENAI_API_KEY": "test_key",
+    "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+    "AZURE_OPENAI_API_VERSION": "2024-02-01",
+    "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4",
+}
+
+
+class TestTruncateTokens:
+    """Test cases for token-budget truncation."""
+
+    @pytest.fixture
+    def word_encoder(self):
+        """Patch in an encoder with one token per whitespace-separated word."""
+        encoder = Mock()
+        encoder.encode.side_effect = lambda text, **kwargs: text.split()
+        encoder.decode.side_effect = " ".join
+        with patch("docxtract.summarizer._token_encoder", return_value=encoder):
+            yield encoder
+
+    def test_truncates_to_token_budget(self, word_encoder):
+        """Test that text longer than the budget is cut at a token boundary."""
+        assert truncate_tokens("one two three four", 2) == "one two"
+
+    def test_short_text_unchanged(self, word_encoder):
+        """Test that text within the budget is returned as-is."""
+        assert truncate_tokens("one  two", 5) == "one  two"
+
+    def test_falls_back_to_character_estimate(self):
+        """Test the 4-characters-per-token fallback without an encoder."""
+        with patch("docxtract.summarizer._token_encoder", return_value=None):
+            assert truncate_tokens("x" * 100, 10) == "x" * 40
 
 
 class TestChineseSummarizer:
@@ -17,20 +65,23 @@ class TestChineseSummarizer:
         """Create a mock LLM."""
         mock = Mock()
         mock.invoke.return_value = AIMessage(content="Mock summary in Chinese")
+
+        async def ainvoke(messages):
+            return mock.invoke(messages)
+
+        mock.ainvoke = AsyncMock(side_effect=ainvoke)
         return mock
 
     @pytest.fixture
     def summarizer(self, mock_llm):
         """Create a ChineseSummarizer with mocked LLM."""
-        with patch("docxtract.summarizer.AzureChatOpenAI") as mock_azure:
-            mock_azure.return_value = mock_llm
-            summarizer = ChineseSummarizer()
-            summarizer.llm = mock_llm
-            return summarizer
+        summarizer = ChineseSummarizer()
+        summarizer.llm = mock_llm
+        return summarizer
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def sample_document(self):
-        """Create a sample document for testing."""
+        """Create a sample document shared by the class; copy it before mutating."""
         sections = [
             DocumentSection(
                 title="Abstract",
@@ -64,36 +115,93 @@ class TestChineseSummarizer:
             focus_areas=["methodology", "results", "contributions"],
         )
 
-    def test_init_with_env_vars(self):
+    @pytest.fixture
+    def azure_env(self, monkeypatch):
+        """Set the Azure OpenAI environment variables from AZURE_ENV."""
+        for name, value in AZURE_ENV.items():
+            monkeypatch.setenv(name, value)
+
+    def test_init_with_env_vars(self, azure_env):
         """Test ChineseSummarizer initialization with environment variables."""
-        with patch.dict(
-            "os.environ",
-            {
-                "AZURE_OPENAI_API_KEY": "test_key",
-                "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
-                "AZURE_OPENAI_API_VERSION": "2024-02-01",
-                "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4",
-            },
-        ):
-            with patch("docxtract.summarizer.AzureChatOpenAI") as mock_azure:
-                summarizer = ChineseSummarizer()
-
-                mock_azure.assert_called_once_with(
-                    azure_endpoint="https://test.openai.azure.com/",
-                    api_key="test_key",
-                    api_version="2024-02-01",
-                    azure_deployment="gpt-4",
-                    temperature=0.3,
-                    max_tokens=4096,
-                )
-
-    def test_init_missing_env_vars(self):
-        """Test ChineseSummarizer initialization with missing environment variables."""
-        with patch.dict("os.environ", {}, clear=True):
+        with patch("langchain_openai.AzureChatOpenAI") as mock_azure:
+            summarizer = ChineseSummarizer()
+
+            # The client is only built on first use
+            mock_azure.assert_not_called()
+            assert summarizer.is_configured() is True
+            assert summarizer.llm is mock_azure.return_value
+            mock_azure.assert_called_once_with(
+                azure_endpoint="https://test.openai.azure.com/",
+                api_key="test_key",
+                api_version="2024-02-01",
+                azure_deployment="gpt-4",
+                temperature=0.3,
+                max_tokens=4096,
+                max_retries=0,
+                http_async_client=summarizer._http_async_client,
+            )
+
+    def test_import_does_not_load_azure_client(self):
+        """Test that importing the summarizer skips langchain_openai and dotenv."""
+        code = (
+            "import sys, docxtract.summarizer; "
+            "sys.exit('langchain_openai' in sys.modules or 'dotenv' in sys.modules)"
+        )
+        result = subprocess.run([sys.executable, "-c", code])
+
+        assert result.returncode == 0
+
+    def test_aclose_resets_shared_http_client(self):
+        """Test that aclose closes the HTTP client and the LLM is rebuilt after it."""
+        with patch("langchain_openai.AzureChatOpenAI") as mock_azure:
             summarizer = ChineseSummarizer()
+            first_client = summarizer._http_async_client
+            summarizer.llm
+
+            asyncio.run(summarizer.aclose())
+            summarizer.llm
 
-            # Should create summarizer with llm=None when env vars are missing
-            assert summarizer.llm is None
+        assert first_client.is_closed
+        assert summarizer._http_async_client is not first_client
+        assert mock_azure.call_count == 2
+        assert (
+            mock_azure.call_args.kwargs["http_async_client"]
+            is summarizer._http_async_client
+        )
+
+    def test_sync_api_reuses_clients_until_close(self):
+        """Test that sync calls share one loop and client, also inside a running loop."""
+        with patch("langchain_openai.AzureChatOpenAI") as mock_azure:
+            mock_azure.return_value.ainvoke = AsyncMock(
+                return_value=AIMessage(content="ok")
+            )
+            summarizer = ChineseSummarizer(use_cache=False)
+
+            assert summarizer.summarize_overall({"A": "x"}) == "ok"
+            client = summarizer._http_async_client
+
+            async def call_from_running_loop():
+                return summarizer.summarize_overall({"A": "y"})
+
+            assert asyncio.run(call_from_running_loop()) == "ok"
+            assert summarizer._http_async_client is client
+            assert mock_azure.call_count == 1
+
+            summarizer.close()
+            summarizer.close()
+
+        assert client.is_closed
+        assert summarizer._loop is None
+
+    def test_init_missing_env_vars(self, monkeypatch):
+        """Test ChineseSummarizer initialization with missing environment variables."""
+        for name in AZURE_ENV:
+            monkeypatch.delenv(name, raising=False)
+
+        summarizer = ChineseSummarizer()
+
+        # Should create summarizer with llm=None when env vars are missing
+        assert summarizer.llm is None
 
     def test_select_core_sections(self):
         """Test core section selection."""
@@ -123,12 +231,25 @@ class TestChineseSummarizer:
         assert "Implementation" not in core_titles
         assert "References" not in core_titles
 
+    def test_create_summary_prompt(self, summarizer, sample_summary_request):
+        """Test that the summary prompt template is filled from the request."""
+        prompt = summarizer._create_summary_prompt(sample_summary_request)
+
+        assert (
+            "論文標題：Test Paper Title\n\n請重點關注：methodology、results" in prompt
+        )
+        assert "論文內容：\nThis is a test document content" in prompt
+        assert "{" not in prompt
+
     def test_section_prompts_exist(self):
         """Test that section prompts are defined for priority sections."""
         for section in ChineseSummarizer.PRIORITY_SECTIONS:
             assert section in ChineseSummarizer.SECTION_PROMPTS
             assert isinstance(ChineseSummarizer.SECTION_PROMPTS[section], str)
             assert len(ChineseSummarizer.SECTION_PROMPTS[section]) > 0
+            assert ChineseSummarizer.SECTION_PROMPT_PREFIXES[section].startswith(
+                ChineseSummarizer.SECTION_PROMPTS[section]
+            )
 
     def test_summarize_section_with_specific_prompt(self, summarizer, mock_llm):
         """Test section summarization with section-specific prompt."""
@@ -199,6 +320,102 @@ class TestChineseSummarizer:
         for section_summary in result.values():
             assert section_summary == "Mock summary in Chinese"
 
+    def test_summarize_all_sections_partial_failure_sync(
+        self, summarizer, mock_llm, sample_document
+    ):
+        """Test that a failed sync section call leaves the other sections intact."""
+        mock_llm.invoke.side_effect = [
+            AIMessage(content="ok"),
+            AIMessage(content="ok"),
+            Exception("LLM call failed"),
+            AIMessage(content="ok"),
+            AIMessage(content="ok"),
+        ]
+
+        result = summarizer.summarize_all_sections(sample_document)
+
+        assert mock_llm.ainvoke.await_count == 5
+        assert result["Method"] == ""
+        assert result["Abstract"] == "ok"
+
+    def test_asummarize_all_sections(self, summarizer, mock_llm, sample_document):
+        """Test concurrent section summarization, one call per section."""
+        mock_llm.ainvoke = AsyncMock(
+            side_effect=[AIMessage(content=f"  Summary {i}  ") for i in range(5)]
+        )
+
+        result = asyncio.run(summarizer.asummarize_all_sections(sample_document))
+
+        assert mock_llm.ainvoke.await_count == 5
+        first_prompt = mock_llm.ainvoke.call_args_list[0][0][0][0].content
+        assert "研究動機" in first_prompt  # Abstract prompt first
+        mock_llm.invoke.assert_not_called()
+
+        assert list(result) == [s.title for s in sample_document.sections]
+        assert result["Abstract"] == "Summary 0"
+        assert result["Conclusion"] == "Summary 4"
+
+    def test_asummarize_all_sections_partial_failure(
+        self, summarizer, mock_llm, sample_document
+    ):
+        """Test that a failed section maps to an empty summary without aborting."""
+        responses = [AIMessage(content="ok")] * 5
+        responses[2] = Exception("LLM call failed")
+        mock_llm.ainvoke = AsyncMock(side_effect=responses)
+
+        result = asyncio.run(summarizer.asummarize_all_sections(sample_document))
+
+        assert result["Method"] == ""
+        assert result["Abstract"] == "ok"
+
+    def test_asummarize_all_sections_bounded_concurrency(
+        self, summarizer, mock_llm, sample_document
+    ):
+        """Test that at most max_concurrency section calls are in flight."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_ainvoke(messages):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return AIMessage(content="ok")
+
+        mock_llm.ainvoke = AsyncMock(side_effect=fake_ainvoke)
+        summarizer.max_concurrency = 2
+
+        result = asyncio.run(summarizer.asummarize_all_sections(sample_document))
+
+        assert max_in_flight == 2
+        assert all(summary == "ok" for summary in result.values())
+
+    def test_asummarize_all_sections_no_llm(self, sample_document):
+        """Test concurrent summarization returns empty summaries without an LLM."""
+        summarizer = ChineseSummarizer.__new__(ChineseSummarizer)
+        summarizer.llm = None
+
+        result = asyncio.run(summarizer.asummarize_all_sections(sample_document))
+
+        assert len(result) == 5
+        assert all(summary == "" for summary in result.values())
+
+    def test_asummarize_overall(self, summarizer, mock_llm):
+        """Test asynchronous overall summary generation."""
+        mock_llm.ainvoke = AsyncMock(return_value=AIMessage(content=" Overall "))
+
+        result = asyncio.run(
+            summarizer.asummarize_overall(
+                {"Abstract": "摘要部分的中文總結"}, "Test Paper"
+            )
+        )
+
+        prompt_content = mock_llm.ainvoke.call_args[0][0][0].content
+        assert "摘要部分的中文總結" in prompt_content
+        assert "Test Paper" in prompt_content
+        assert result == "Overall"
+
     def test_summarize_overall(self, summarizer, mock_llm):
         """Test overall summary generation."""
         section_summaries = {
@@ -220,28 +437,150 @@ class TestChineseSummarizer:
 
         assert result == "Mock summary in Chinese"
 
+    def test_is_short_document(self, sample_document):
+        """Test the single-call threshold on core section length."""
+        assert is_short_document(sample_document)
+
+        long_document = sample_document.model_copy(deep=True)
+        long_document.sections[0].content = "x" * 4 * (SINGLE_CALL_TOKEN_LIMIT + 1)
+        assert not is_short_document(long_document)
+
+    def test_is_short_document_without_core_sections(self):
+        """Test that documents without core section content are never short."""
+        doc = ExtractedDocument(
+            sections=[DocumentSection(title="Full Content", content="Text")],
+            source_file="test.pdf",
+        )
+
+        assert not is_short_document(doc)
+
+    def test_summarize_document(self, summarizer, mock_llm, sample_document):
+        """Test single-call summary of a whole short document."""
+        mock_llm.invoke.return_value = SimpleNamespace(content="  整篇摘要  ")
+
+        result = summarizer.summarize_document(sample_document)
+
+        assert result == "整篇摘要"
+        prompt = mock_llm.invoke.call_args[0][0][0].content
+        assert sample_document.title in prompt
+        for section in summarizer.select_core_sections(sample_document.sections):
+            assert section.content in prompt
+
+    def test_asummarize_document(self, summarizer, mock_llm, sample_document):
+        """Test async single-call summary of a whole short document."""
+        mock_llm.ainvoke = AsyncMock(return_value=SimpleNamespace(content="整篇摘要"))
+
+        result = asyncio.run(summarizer.asummarize_document(sample_document))
+
+        assert result == "整篇摘要"
+        mock_llm.ainvoke.assert_awaited_once()
+
     def test_generate_summary(self, summarizer, mock_llm, sample_document):
         """Test generating summary from document."""
-        # Mock different responses for different calls
-        mock_responses = ["Section summary"] * 5 + ["Overall summary"]
-        mock_llm.invoke.side_effect = [
-            AIMessage(content=resp) for resp in mock_responses
-        ]
+
+        # Answer by prompt type, since takeaways and applications run concurrently
+        def respond(messages):
+            prompt = messages[0].content
+            if "五個最重要的重點" in prompt:
+                return AIMessage(content="Top takeaways")
+            if "應用方向" in prompt:
+                return AIMessage(content="Applications")
+            if "彙整出一份完整的論文總結" in prompt:
+                return AIMessage(content="Overall summary")
+            return AIMessage(content="Section summary")
+
+        mock_llm.invoke.side_effect = respond
 
         result = summarizer.generate_summary(sample_document)
 
-        # Should call LLM for sections + overall
-        assert mock_llm.invoke.call_count == 6  # 5 sections + 1 overall
+        # Should call LLM for sections + overall + takeaways + applications
+        assert mock_llm.invoke.call_count == 8
 
         # Should return markdown document with paper title
         assert "# Novel ML Approach" in result
         assert "## 中文摘要" in result
         assert "Overall summary" in result
+        assert "## 重點摘要\n\nTop takeaways" in result
+        assert "## 應用發想\n\nApplications" in result
         assert (
             "*Chinese summary generated using GPT-4.1, core-section summarization mode*"
             in result
         )
 
+    def test_agenerate_summary_concurrent_followups(
+        self, summarizer, mock_llm, sample_document
+    ):
+        """Test that takeaways and applications are generated concurrently."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_ainvoke(messages):
+            nonlocal in_flight, max_in_flight
+            followup = "摘要內容" in messages[0].content
+            in_flight += followup
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= followup
+            return AIMessage(content="response")
+
+        mock_llm.ainvoke = AsyncMock(side_effect=fake_ainvoke)
+
+        result = asyncio.run(summarizer.agenerate_summary(sample_document))
+
+        # 5 sections and the overall summary, then takeaways and applications together
+        assert mock_llm.ainvoke.await_count == 8
+        assert max_in_flight == 2
+        assert "## 重點摘要" in result
+
+    def test_agenerate_summary_starts_overall_early(
+        self, summarizer, mock_llm, sample_document
+    ):
+        """Test that the overall summary only waits for Abstract and Conclusion."""
+        overall_prompts = []
+
+        async def fake_ainvoke(messages):
+            if "彙整出一份完整的論文總結" in messages[0].content:
+                overall_prompts.append(messages[0].content)
+            return AIMessage(content="response")
+
+        mock_llm.ainvoke = AsyncMock(side_effect=fake_ainvoke)
+
+        asyncio.run(summarizer.agenerate_summary(sample_document))
+
+        assert len(overall_prompts) == 1
+        assert "Abstract:" in overall_prompts[0]
+        assert "Conclusion:" in overall_prompts[0]
+        assert "Method:" not in overall_prompts[0]
+
+    def test_agenerate_summary_strict_reissues_overall(
+        self, summarizer, mock_llm, sample_document
+    ):
+        """Test that strict mode regenerates the overall summary from every section."""
+        overall_prompts = []
+
+        async def fake_ainvoke(messages):
+            if "彙整出一份完整的論文總結" in messages[0].content:
+                overall_prompts.append(messages[0].content)
+            return AIMessage(content="response")
+
+        mock_llm.ainvoke = AsyncMock(side_effect=fake_ainvoke)
+
+        result = asyncio.run(summarizer.agenerate_summary(sample_document, strict=True))
+
+        assert len(overall_prompts) == 2
+        assert "Method:" in overall_prompts[1]
+        assert result.index("## Abstract") < result.index("## Method")
+
+    def test_format_summary_marks_failed_sections(self, summarizer, sample_document):
+        """Test that empty section summaries render the failure placeholder."""
+        result = summarizer._format_summary_markdown(
+            sample_document, {"Abstract": "", "Method": "方法"}, "總結", "", ""
+        )
+
+        assert "## Abstract\n\n(本章節摘要產生失敗)" in result
+        assert "## Method\n\n方法" in result
+        assert "## Results" not in result
+
     def test_is_configured(self, summarizer):
         """Test configuration check."""
         # Should be configured with mock LLM
@@ -283,25 +622,17 @@ class TestChineseSummarizer:
 
         assert result == "Mock summary in Chinese"
 
-    def test_llm_error_handling(self, mock_llm):
-        """Test LLM error handling during initialization."""
+    def test_llm_error_handling(self, azure_env):
+        """Test that client construction errors surface on first use."""
         with patch(
-            "docxtract.summarizer.AzureChatOpenAI",
+            "langchain_openai.AzureChatOpenAI",
             side_effect=Exception("LLM initialization failed"),
         ):
-            with patch.dict(
-                "os.environ",
-                {
-                    "AZURE_OPENAI_API_KEY": "test_key",
-                    "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
-                    "AZURE_OPENAI_API_VERSION": "2024-02-01",
-                    "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4",
-                },
-            ):
-                with pytest.raises(Exception) as exc_info:
-                    ChineseSummarizer()
-
-                assert "LLM initialization failed" in str(exc_info.value)
+            summarizer = ChineseSummarizer()
+            with pytest.raises(Exception) as exc_info:
+                summarizer.llm
+
+            assert "LLM initialization failed" in str(exc_info.value)
 
     def test_summarize_section_llm_error(self, summarizer, mock_llm):
         """Test section summarization with LLM error."""
@@ -312,7 +643,7 @@ class TestChineseSummarizer:
         # Should return empty string on error
         assert result == ""
 
-    @pytest.mark.parametrize("section_title", ChineseSummarizer.PRIORITY_SECTIONS)
+    @pytest.mark.parametrize("section_title", ChineseSummarizer.PRIORITY_ORDER)
     def test_all_priority_sections_have_prompts(self, section_title):
         """Test that all priority sections have corresponding prompts."""
         assert section_title in ChineseSummarizer.SECTION_PROMPTS
@@ -320,3 +651,364 @@ class TestChineseSummarizer:
         assert isinstance(prompt, str)
         assert len(prompt.strip()) > 0
         assert "繁體中文" in prompt or "中文" in prompt  # Should be Chinese prompt
+
+
+class TestResponseCache:
+    """Test cases for the exact-match LLM response cache."""
+
+    @pytest.fixture
+    def mock_llm(self):
+        """Create a mock LLM with a fixed response."""
+        mock = Mock()
+        mock.invoke.return_value = AIMessage(content=" 摘要 ")
+        mock.ainvoke = AsyncMock(side_effect=lambda messages: mock.invoke(messages))
+        return mock
+
+    def make_summarizer(self, mock_llm, **kwargs):
+        """Create a summarizer using the given mock LLM."""
+        summarizer = ChineseSummarizer(**kwargs)
+        summarizer.llm = mock_llm
+        return summarizer
+
+    def test_identical_prompt_hits_cache(self, mock_llm):
+        """Test that a repeated prompt is answered from disk, even by a new instance."""
+        first = self.make_summarizer(mock_llm).summarize_overall({"A": "x"}, "T")
+        second = self.make_summarizer(mock_llm).summarize_overall({"A": "x"}, "T")
+
+        assert first == second == "摘要"
+        assert mock_llm.invoke.call_count == 1
+
+    def test_async_and_sync_share_cache(self, mock_llm):
+        """Test that async calls reuse responses cached by sync calls."""
+        summarizer = self.make_summarizer(mock_llm)
+        summarizer.generate_top_takeaways("overall")
+
+        result = asyncio.run(summarizer.agenerate_top_takeaways("overall"))
+
+        assert result == "摘要"
+        assert mock_llm.invoke.call_count == 1
+
+    def test_different_deployment_misses_cache(self, mock_llm, monkeypatch):
+        """Test that the model deployment is part of the cache key."""
+        self.make_summarizer(mock_llm).summarize_overall({"A": "x"}, "T")
+        monkeypatch.setenv("AZURE_OPENAI_DEPLOYMENT_NAME", "other-deployment")
+        self.make_summarizer(mock_llm).summarize_overall({"A": "x"}, "T")
+
+        assert mock_llm.invoke.call_count == 2
+
+    def test_use_cache_false(self, mock_llm):
+        """Test that caching can be turned off per summarizer."""
+        summarizer = self.make_summarizer(mock_llm, use_cache=False)
+        summarizer.summarize_overall({"A": "x"}, "T")
+        summarizer.summarize_overall({"A": "x"}, "T")
+
+        assert mock_llm.invoke.call_count == 2
+
+    def test_failed_call_not_cached(self, mock_llm):
+        """Test that errors are not cached and the next call retries."""
+        mock_llm.invoke.side_effect = [Exception("timeout"), AIMessage(content="ok")]
+        summarizer = self.make_summarizer(mock_llm)
+
+        assert summarizer.summarize_overall({"A": "x"}, "T") == ""
+        assert summarizer.summarize_overall({"A": "x"}, "T") == "ok"
+
+    def test_section_batch_sends_only_uncached(
+        self, mock_llm, sample_extracted_document
+    ):
+        """Test that cached sections are left out of the LLM batch."""
+        summarizer = self.make_summarizer(mock_llm)
+        abstract = sample_extracted_document.sections[0]
+        summarizer.summarize_section(
+            abstract.title, abstract.content, sample_extracted_document.title
+        )
+        mock_llm.ainvoke.side_effect = lambda messages: AIMessage(content="summary")
+
+        result = summarizer.summarize_all_sections(sample_extracted_document)
+
+        assert mock_llm.ainvoke.await_count == 1 + 4
+        assert result["Abstract"] == "摘要"
+
+
+class FakeBatchClient:
+    """In-memory stand-in for the Azure OpenAI Files and Batch APIs."""
+
+    def __init__(self, fail_ids=()):
+        self.fail_ids = set(fail_ids)
+        self.uploads = []
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(
+            create=self._create_batch, retrieve=self._retrieve_batch
+        )
+
+    def _create_file(self, file, purpose):
+        assert purpose == "batch"
+        self.uploads.append([json.loads(line) for line in file[1].splitlines()])
+        return SimpleNamespace(id=f"file-{len(self.uploads)}")
+
+    def _create_batch(self, input_file_id, endpoint, completion_window):
+        assert endpoint == "/chat/completions"
+        return SimpleNamespace(id=input_file_id, status="in_progress")
+
+    def _retrieve_batch(self, batch_id):
+        return SimpleNamespace(
+            id=batch_id, status="completed", output_file_id=f"out-{batch_id}"
+        )
+
+    def _content(self, file_id):
+        requests = self.uploads[int(file_id.rsplit("-", 1)[1]) - 1]
+        lines = []
+        for request in requests:
+            custom_id = request["custom_id"]
+            if custom_id in self.fail_ids:
+                record = {"custom_id": custom_id, "response": {"status_code": 500}}
+            else:
+                body = {"choices": [{"message": {"content": f" {custom_id} "}}]}
+                record = {
+                    "custom_id": custom_id,
+                    "response": {"status_code": 200, "body": body},
+                }
+            lines.append(json.dumps(record))
+        return SimpleNamespace(content="\n".join(lines).encode("utf-8"))
+
+
+class TestJsonLines:
+    """Test cases for the Batch API JSONL helpers."""
+
+    @pytest.mark.parametrize("use_orjson", [False, True])
+    def test_jsonl_round_trip(self, monkeypatch, use_orjson):
+        """Test that records survive serialization with and without orjson."""
+        if use_orjson:
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr("docxtract.summarizer.orjson", None)
+        records = [{"custom_id": "0:overall", "body": {"content": "中文"}}, {"n": 1}]
+
+        data = _dumps_jsonl(records)
+
+        assert isinstance(data, bytes)
+        assert data.endswith(b"\n")
+        assert [_loads_json(line) for line in data.splitlines()] == records
+
+
+class TestGenerateSummaryBatch:
+    """Test cases for Azure OpenAI Batch API summarization."""
+
+    @pytest.fixture
+    def summarizer(self, monkeypatch):
+        """Create a configured summarizer that never sleeps while polling."""
+        summarizer = ChineseSummarizer()
+        monkeypatch.setattr("docxtract.summarizer.time.sleep", lambda _: None)
+        return summarizer
+
+    def test_generate_summary_batch(self, summarizer, sample_extracted_document):
+        """Test that three dependent batch jobs are demultiplexed per document."""
+        client = FakeBatchClient(fail_ids={"1:takeaways"})
+        summarizer._batch_client = lambda: client
+        other = sample_extracted_document.model_copy(update={"title": "Second Paper"})
+
+        results = summarizer.generate_summary_batch([sample_extracted_document, other])
+
+        assert len(client.uploads) == 3
+        section_ids = [request["custom_id"] for request in client.uploads[0]]
+        assert section_ids[:2] == ["0:section:Abstract", "0:section:Introduction"]
+        assert len(section_ids) == 10
+        assert client.uploads[0][0]["body"]["model"] == summarizer.deployment_name
+        assert [r["custom_id"] for r in client.uploads[1]] == ["0:overall", "1:overall"]
+        assert (
+            "0:section:Abstract"
+            in client.uploads[1][0]["body"]["messages"][0]["content"]
+        )
+
+        assert results[0].startswith("# A Novel Approach to Document Extraction")
+        assert "## 中文摘要\n\n0:overall" in results[0]
+        assert "## 重點摘要\n\n0:takeaways" in results[0]
+        assert "## Abstract\n\n0:section:Abstract" in results[0]
+        assert results[1].startswith("# Second Paper")
+        assert "(重點摘要產生失敗)" in results[1]
+        assert "## 應用發想\n\n1:applications" in results[1]
+        # Batch jobs go through the batch client; the chat client is never built
+        assert "llm" not in summarizer.__dict__
+
+    def test_generate_summary_batch_not_configured(self, sample_extracted_document):
+        """Test that batch mode returns empty results without Azure config."""
+        summarizer = ChineseSummarizer.__new__(ChineseSummarizer)
+        summarizer.llm = None
+
+        assert summarizer.generate_summary_batch([sample_extracted_document]) == [""]
+
+
+class TestSemanticCache:
+    """Test cases for the embedding-similarity section cache."""
+
+    @pytest.fixture
+    def mock_llm(self):
+        """Create a mock LLM whose batch calls go through invoke."""
+        mock = Mock()
+        mock.invoke.return_value = AIMessage(content="摘要")
+        mock.ainvoke = AsyncMock(side_effect=lambda messages: mock.invoke(messages))
+        return mock
+
+    @pytest.fixture
+    def summarizer(self, mock_llm):
+        """Create a summarizer with fake embeddings (first char decides direction)."""
+        summarizer = ChineseSummarizer()
+        summarizer.llm = mock_llm
+        summarizer.embeddings = Mock()
+        summarizer.embeddings.embed_documents.side_effect = lambda texts: [
+            [1.0, 0.0] if text.startswith("A") else [0.0, 1.0] for text in texts
+        ]
+        summarizer.embeddings.aembed_documents = AsyncMock(
+            side_effect=summarizer.embeddings.embed_documents
+        )
+        return summarizer
+
+    def test_near_duplicate_section_reuses_summary(self, summarizer, mock_llm):
+        """Test that a similar section with a different prompt skips the LLM."""
+        first = summarizer.summarize_section("Abstract", "A study of transformers.")
+        second = summarizer.summarize_section("Abstract", "A study on transformers!")
+
+        assert first == second == "摘要"
+        assert mock_llm.invoke.call_count == 1
+
+    def test_dissimilar_or_other_section_misses(self, summarizer, mock_llm):
+        """Test that the index is per section title and respects the threshold."""
+        summarizer.summarize_section("Abstract", "A study of transformers.")
+        summarizer.summarize_section("Abstract", "Different content entirely.")
+        summarizer.summarize_section("Method", "A study of transformers.")
+
+        assert mock_llm.invoke.call_count == 3
+
+    def test_section_batch_uses_semantic_cache(self, summarizer, mock_llm):
+        """Test that batched section summaries consult the semantic index."""
+        summarizer.summarize_section("Method", "A neural network.")
+        document = ExtractedDocument(
+            title="Paper",
+            sections=[
+                DocumentSection(title="Method", content="A neural net."),
+                DocumentSection(title="Results", content="Better accuracy."),
+            ],
+            source_file="paper.pdf",
+        )
+
+        result = summarizer.summarize_all_sections(document)
+
+        assert result == {"Method": "摘要", "Results": "摘要"}
+        assert mock_llm.invoke.call_count == 2
+
+    def test_disabled_without_embeddings(self, summarizer, mock_llm):
+        """Test that no embeddings client means exact-match caching only."""
+        summarizer.embeddings = None
+        summarizer.summarize_section("Abstract", "A study of transformers.")
+        summarizer.summarize_section("Abstract", "A study on transformers!")
+
+        assert mock_llm.invoke.call_count == 2
+
+
+class TestRetries:
+    """Test cases for retrying transient LLM errors."""
+
+    @pytest.fixture
+    def summarizer(self):
+        """Create a summarizer with a mock LLM and no backoff delay."""
+        summarizer = ChineseSummarizer(use_cache=False)
+        summarizer.llm = Mock()
+        summarizer.llm.ainvoke = AsyncMock(
+            side_effect=lambda messages: summarizer.llm.invoke(messages)
+        )
+        summarizer.RETRY_BASE_DELAY = 0
+        return summarizer
+
+    @staticmethod
+    def rate_limit_error():
+        """Build an openai RateLimitError."""
+        request = httpx.Request("POST", "https://test.openai.azure.com/")
+        response = httpx.Response(429, request=request)
+        return openai.RateLimitError("rate limited", response=response, body=None)
+
+    @staticmethod
+    def status_error(error_class, status_code: int):
+        """Build an openai status error for an HTTP status."""
+        request = httpx.Request("POST", "https://test.openai.azure.com/")
+        response = httpx.Response(status_code, request=request)
+        return error_class("error", response=response, body=None)
+
+    @pytest.mark.parametrize(
+        "error_class,status_code",
+        [
+            (openai.APIStatusError, 408),
+            (openai.ConflictError, 409),
+            (openai.InternalServerError, 500),
+            (openai.InternalServerError, 503),
+        ],
+    )
+    def test_server_errors_are_retried(self, summarizer, error_class, status_code):
+        """Test that timeouts, conflicts and 5xx responses are retried."""
+        summarizer.llm.invoke.side_effect = [
+            self.status_error(error_class, status_code),
+            AIMessage(content="ok"),
+        ]
+
+        assert summarizer.summarize_overall({"A": "x"}, "T") == "ok"
+        assert summarizer.llm.invoke.call_count == 2
+
+    def test_client_errors_not_retried(self, summarizer):
+        """Test that 4xx responses other than 408/409/429 fail immediately."""
+        summarizer.llm.invoke.side_effect = self.status_error(
+            openai.BadRequestError, 400
+        )
+
+        assert summarizer.summarize_overall({"A": "x"}, "T") == ""
+        assert summarizer.llm.invoke.call_count == 1
+
+    def test_transient_error_is_retried(self, summarizer):
+        """Test that a rate limit followed by success returns the response."""
+        summarizer.llm.invoke.side_effect = [
+            self.rate_limit_error(),
+            AIMessage(content=" 摘要 "),
+        ]
+
+        assert summarizer.summarize_overall({"A": "x"}, "T") == "摘要"
+        assert summarizer.llm.invoke.call_count == 2
+
+    def test_gives_up_after_max_attempts(self, summarizer):
+        """Test that persistent transient errors stop after RETRY_ATTEMPTS."""
+        summarizer.llm.invoke.side_effect = self.rate_limit_error()
+
+        assert summarizer.generate_top_takeaways("summary") == "(重點摘要產生失敗)"
+        assert summarizer.llm.invoke.call_count == ChineseSummarizer.RETRY_ATTEMPTS
+
+    def test_section_batch_retries_transient_errors(self, summarizer):
+        """Test that batched section summaries retry transient errors per call."""
+        summarizer.llm.invoke.side_effect = [
+            self.rate_limit_error(),
+            AIMessage(content=" 摘要 "),
+        ]
+        document = ExtractedDocument(
+            sections=[DocumentSection(title="Abstract", content="content")],
+            source_file="paper.pdf",
+        )
+
+        assert summarizer.summarize_all_sections(document) == {"Abstract": "摘要"}
+        assert summarizer.llm.invoke.call_count == 2
+
+    def test_other_errors_not_retried(self, summarizer):
+        """Test that non-transient errors fail immediately."""
+        summarizer.llm.invoke.side_effect = ValueError("bad request")
+
+        assert summarizer.summarize_section("Abstract", "content") == ""
+        assert summarizer.llm.invoke.call_count == 1
+
+    def test_async_transient_error_is_retried(self, summarizer):
+        """Test that async calls retry transient errors too."""
+        request = httpx.Request("POST", "https://test.openai.azure.com/")
+        summarizer.llm.ainvoke = AsyncMock(
+            side_effect=[
+                openai.APITimeoutError(request=request),
+                AIMessage(content="ok"),
+            ]
+        )
+
+        result = asyncio.run(summarizer.asummarize_overall({"A": "x"}, "T"))
+
+        assert result == "ok"
+        assert summarizer.llm.ainvoke.await_count == 2
@@ -1,90 +1,108 @@
 """Unit tests for docxtract.utils module."""
 
-import tempfile
 from pathlib import Path
 
 import pytest
 
-from docxtract.utils import ensure_directory, get_default_output_path, validate_pdf_file
+from docxtract.utils import (
+    ensure_directory,
+    format_file_size,
+    get_default_output_path,
+    validate_pdf_file,
+)
+
+# Placeholder bytes for files that only need to exist with a .pdf name
+DUMMY_PDF_CONTENT = b"dummy pdf content"
 
 
 class TestUtilsFunctions:
     """Test cases for utility functions."""
 
-    def test_ensure_directory_creates_new_directory(self):
+    def test_ensure_directory_creates_new_directory(self, tmp_path):
         """Test ensure_directory creates a new directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            new_dir = Path(temp_dir) / "new_directory"
+        new_dir = tmp_path / "new_directory"
 
-            # Directory should not exist initially
-            assert not new_dir.exists()
+        # Directory should not exist initially
+        assert not new_dir.exists()
 
-            ensure_directory(new_dir)
+        ensure_directory(new_dir)
 
-            # Directory should exist after calling ensure_directory
-            assert new_dir.exists()
-            assert new_dir.is_dir()
+        # Directory should exist after calling ensure_directory
+        assert new_dir.exists()
+        assert new_dir.is_dir()
 
-    def test_ensure_directory_creates_nested_directories(self):
+    def test_ensure_directory_creates_nested_directories(self, tmp_path):
         """Test ensure_directory creates nested directories."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            nested_dir = Path(temp_dir) / "level1" / "level2" / "level3"
+        nested_dir = tmp_path / "level1" / "level2" / "level3"
 
-            # Nested directories should not exist initially
-            assert not nested_dir.exists()
-            assert not nested_dir.parent.exists()
+        # Nested directories should not exist initially
+        assert not nested_dir.exists()
+        assert not nested_dir.parent.exists()
 
-            ensure_directory(nested_dir)
+        ensure_directory(nested_dir)
 
-            # All nested directories should exist
-            assert nested_dir.exists()
-            assert nested_dir.is_dir()
-            assert nested_dir.parent.exists()
-            assert nested_dir.parent.parent.exists()
+        # All nested directories should exist
+        assert nested_dir.exists()
+        assert nested_dir.is_dir()
+        assert nested_dir.parent.exists()
+        assert nested_dir.parent.parent.exists()
 
-    def test_ensure_directory_existing_directory(self):
+    def test_ensure_directory_existing_directory(self, tmp_path):
         """Test ensure_directory with existing directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            existing_dir = Path(temp_dir) / "existing"
-            existing_dir.mkdir()
+        existing_dir = tmp_path / "existing"
+        existing_dir.mkdir()
 
-            # Directory should exist
-            assert existing_dir.exists()
+        # Directory should exist
+        assert existing_dir.exists()
 
-            # Should not raise error with existing directory
-            ensure_directory(existing_dir)
+        # Should not raise error with existing directory
+        ensure_directory(existing_dir)
 
-            # Directory should still exist
-            assert existing_dir.exists()
-            assert existing_dir.is_dir()
+        # Directory should still exist
+        assert existing_dir.exists()
+        assert existing_dir.is_dir()
 
-    def test_ensure_directory_with_file_path(self):
+    def test_ensure_directory_with_file_path(self, tmp_path):
         """Test ensure_directory with a file path (should create parent)."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            file_path = Path(temp_dir) / "subdir" / "file.txt"
-            parent_dir = file_path.parent
+        file_path = tmp_path / "subdir" / "file.txt"
+        parent_dir = file_path.parent
+
+        # Parent directory should not exist initially
+        assert not parent_dir.exists()
 
-            # Parent directory should not exist initially
-            assert not parent_dir.exists()
+        ensure_directory(parent_dir)
 
-            ensure_directory(parent_dir)
+        # Parent directory should exist
+        assert parent_dir.exists()
+        assert parent_dir.is_dir()
 
-            # Parent directory should exist
-            assert parent_dir.exists()
-            assert parent_dir.is_dir()
+    @pytest.mark.parametrize(
+        "size_bytes, expected",
+        [
+            (0, "0.0 B"),
+            (1023, "1023.0 B"),
+            (1024, "1.0 KB"),
+            (1536, "1.5 KB"),
+            (1024**2 - 1, "1024.0 KB"),
+            (5 * 1024**3, "5.0 GB"),
+            (1024**5, "1024.0 TB"),
+        ],
+    )
+    def test_format_file_size(self, size_bytes, expected):
+        """Test human-readable file sizes at unit boundaries."""
+        assert format_file_size(size_bytes) == expected
 
-    def test_validate_pdf_file_valid_pdf(self):
+    def test_validate_pdf_file_valid_pdf(self, tmp_path):
         """Test validate_pdf_file with valid PDF file."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            pdf_path = Path(temp_dir) / "test.pdf"
+        pdf_path = tmp_path / "test.pdf"
 
-            # Create a dummy PDF file
-            pdf_path.write_bytes(
-                b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n>>\nendobj\nxref\n0 1\n0000000000 65535 f \ntrailer\n<<\n/Size 1\n/Root 1 0 R\n>>\nstartxref\n9\n%%EOF"
-            )
+        # Create a dummy PDF file
+        pdf_path.write_bytes(
+            b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n>>\nendobj\nxref\n0 1\n0000000000 65535 f \ntrailer\n<<\n/Size 1\n/Root 1 0 R\n>>\nstartxref\n9\n%%EOF"
+        )
 
-            # Should validate as true
-            assert validate_pdf_file(pdf_path) is True
+        # Should validate as true
+        assert validate_pdf_file(pdf_path) is True
 
     def test_validate_pdf_file_nonexistent_file(self):
         """Test validate_pdf_file with non-existent file."""
@@ -93,42 +111,44 @@ class TestUtilsFunctions:
         # Should validate as false
         assert validate_pdf_file(nonexistent_path) is False
 
-    def test_validate_pdf_file_directory(self):
+    def test_validate_pdf_file_directory(self, tmp_path):
         """Test validate_pdf_file with directory path."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            dir_path = Path(temp_dir)
-
-            # Should validate as false (it's a directory, not a file)
-            assert validate_pdf_file(dir_path) is False
+        # Should validate as false (it's a directory, not a file)
+        assert validate_pdf_file(tmp_path) is False
 
-    def test_validate_pdf_file_wrong_extension(self):
+    def test_validate_pdf_file_wrong_extension(self, tmp_path):
         """Test validate_pdf_file with wrong file extension."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            txt_path = Path(temp_dir) / "test.txt"
-            txt_path.write_text("This is not a PDF file")
+        txt_path = tmp_path / "test.txt"
+        txt_path.write_text("This is not a PDF file")
+
+        # Should validate as false (wrong extension)
+        assert validate_pdf_file(txt_path) is False
 
-            # Should validate as false (wrong extension)
-            assert validate_pdf_file(txt_path) is False
+    def test_validate_pdf_file_accepts_str_paths(self, tmp_path):
+        """Test validate_pdf_file with a plain string path."""
+        pdf_path = tmp_path / "paper.pdf"
+        pdf_path.write_bytes(DUMMY_PDF_CONTENT)
 
-    def test_validate_pdf_file_case_insensitive_extension(self):
+        assert validate_pdf_file(str(pdf_path)) is True
+        assert validate_pdf_file(str(tmp_path / "missing.pdf")) is False
+
+    def test_validate_pdf_file_case_insensitive_extension(self, tmp_path):
         """Test validate_pdf_file with case variations of PDF extension."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Test different case variations
-            for extension in [".PDF", ".Pdf", ".pDf"]:
-                pdf_path = Path(temp_dir) / f"test{extension}"
-                pdf_path.write_bytes(b"dummy pdf content")
+        # Test different case variations
+        for extension in [".PDF", ".Pdf", ".pDf"]:
+            pdf_path = tmp_path / f"test_{extension.strip('.')}{extension}"
+            pdf_path.write_bytes(DUMMY_PDF_CONTENT)
 
-                # Should validate as true (case insensitive)
-                assert validate_pdf_file(pdf_path) is True
+            # Should validate as true (case insensitive)
+            assert validate_pdf_file(pdf_path) is True
 
-    def test_validate_pdf_file_no_extension(self):
+    def test_validate_pdf_file_no_extension(self, tmp_path):
         """Test validate_pdf_file with file without extension."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            no_ext_path = Path(temp_dir) / "filename_without_extension"
-            no_ext_path.write_text("Some content")
+        no_ext_path = tmp_path / "filename_without_extension"
+        no_ext_path.write_text("Some content")
 
-            # Should validate as false (no PDF extension)
-            assert validate_pdf_file(no_ext_path) is False
+        # Should validate as false (no PDF extension)
+        assert validate_pdf_file(no_ext_path) is False
 
     def test_get_default_output_path_basic(self):
         """Test get_default_output_path with basic PDF file."""
@@ -217,24 +237,22 @@ class TestUtilsFunctions:
 
         assert result == expected_path
 
-    def test_functions_work_with_pathlib_objects(self):
+    def test_functions_work_with_pathlib_objects(self, tmp_path):
         """Test that all functions properly work with pathlib.Path objects."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Test with Path objects
-            base_path = Path(temp_dir)
-            test_dir = base_path / "test_dir"
-            test_file = base_path / "test.pdf"
+        # Test with Path objects
+        test_dir = tmp_path / "test_dir"
+        test_file = tmp_path / "test.pdf"
 
-            # Create test file
-            test_file.write_bytes(b"dummy pdf content")
+        # Create test file
+        test_file.write_bytes(DUMMY_PDF_CONTENT)
 
-            # All functions should work with Path objects
-            ensure_directory(test_dir)
-            assert test_dir.exists()
+        # All functions should work with Path objects
+        ensure_directory(test_dir)
+        assert test_dir.exists()
 
-            is_valid = validate_pdf_file(test_file)
-            assert is_valid is True
+        is_valid = validate_pdf_file(test_file)
+        assert is_valid is True
 
-            output_path = get_default_output_path(test_file)
-            assert isinstance(output_path, Path)
-            assert output_path.suffix == ".md"
+        output_path = get_default_output_path(test_file)
+        assert isinstance(output_path, Path)
+        assert output_path.suffix == ".md"
@@ -1,8 +1,7 @@
 """Unit tests for docxtract.writer module."""
 
-import tempfile
-from pathlib import Path
-from unittest.mock import patch
+import io
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -10,6 +9,16 @@ from docxtract.models import DocumentSection, ExtractedDocument
 from docxtract.writer import MarkdownWriter
 
 
+def make_document(title, source_file, sections, summary_zh=None):
+    """Build an ExtractedDocument from (section title, content) pairs."""
+    return ExtractedDocument(
+        title=title,
+        summary_zh=summary_zh,
+        sections=[DocumentSection(title=t, content=c) for t, c in sections],
+        source_file=source_file,
+    )
+
+
 class TestMarkdownWriter:
     """Test cases for MarkdownWriter class."""
 
@@ -18,123 +27,123 @@ class TestMarkdownWriter:
         """Create a MarkdownWriter instance."""
         return MarkdownWriter()
 
-    @pytest.fixture
+    # Document fixtures are shared by the class; copy one before mutating it.
+    @pytest.fixture(scope="class")
     def sample_document_with_summary(self):
         """Create a sample ExtractedDocument with Chinese summary."""
-        sections = [
-            DocumentSection(title="Abstract", content="This is the abstract content."),
-            DocumentSection(
-                title="Introduction", content="This is the introduction content."
-            ),
-            DocumentSection(title="Method", content="This is the method content."),
-        ]
-        doc = ExtractedDocument(
-            title="Sample Paper Title", sections=sections, source_file="sample.pdf"
+        return make_document(
+            "Sample Paper Title",
+            "sample.pdf",
+            [
+                ("Abstract", "This is the abstract content."),
+                ("Introduction", "This is the introduction content."),
+                ("Method", "This is the method content."),
+            ],
+            summary_zh="這是一篇關於機器學習的論文，主要探討了新的神經網絡架構。",
         )
-        # Add Chinese summary using setattr to simulate the dynamic field
-        doc.summary_zh = "這是一篇關於機器學習的論文，主要探討了新的神經網絡架構。"
-        return doc
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def sample_document_without_summary(self):
         """Create a sample ExtractedDocument without Chinese summary."""
-        sections = [
-            DocumentSection(title="Abstract", content="This is the abstract content."),
-            DocumentSection(title="Results", content="This is the results content."),
-        ]
-        return ExtractedDocument(
-            title="Another Paper", sections=sections, source_file="another.pdf"
+        return make_document(
+            "Another Paper",
+            "another.pdf",
+            [
+                ("Abstract", "This is the abstract content."),
+                ("Results", "This is the results content."),
+            ],
         )
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def document_without_title(self):
         """Create a document without title."""
-        sections = [
-            DocumentSection(
-                title="Full Content", content="This is the full document content."
-            ),
-        ]
-        return ExtractedDocument(
-            title=None, sections=sections, source_file="untitled.pdf"
+        return make_document(
+            None,
+            "untitled.pdf",
+            [("Full Content", "This is the full document content.")],
         )
 
     def test_init(self, writer):
         """Test MarkdownWriter initialization."""
         assert isinstance(writer, MarkdownWriter)
 
-    def test_format_document_with_summary(self, writer, sample_document_with_summary):
-        """Test formatting document with Chinese summary."""
-        result = writer._format_document(sample_document_with_summary)
-
-        # Check title
-        assert "# Sample Paper Title" in result
-
-        # Check Chinese summary section
-        assert "## 中文摘要" in result
-        assert "這是一篇關於機器學習的論文" in result
-
-        # Check sections
-        assert "## Abstract" in result
-        assert "This is the abstract content." in result
-        assert "## Introduction" in result
-        assert "This is the introduction content." in result
-        assert "## Method" in result
-        assert "This is the method content." in result
-
-        # Check metadata footer
-        assert "---" in result
-        assert "*Extracted from: sample.pdf*" in result
-        assert "*Chinese summary generated using GPT-4.1*" in result
-
-    def test_format_document_without_summary(
-        self, writer, sample_document_without_summary
+    @pytest.mark.parametrize(
+        "document_fixture, must_contain, must_not_contain",
+        [
+            (
+                "sample_document_with_summary",
+                [
+                    # Chinese summary section
+                    "## 中文摘要",
+                    "這是一篇關於機器學習的論文",
+                    # Sections
+                    "## Abstract",
+                    "This is the abstract content.",
+                    "## Introduction",
+                    "This is the introduction content.",
+                    "## Method",
+                    "This is the method content.",
+                    # Metadata footer
+                    "---",
+                    "*Extracted from: sample.pdf*",
+                    "*Chinese summary generated using GPT-4.1*",
+                ],
+                [],
+            ),
+            (
+                "sample_document_without_summary",
+                [
+                    "## Abstract",
+                    "This is the abstract content.",
+                    "## Results",
+                    "This is the results content.",
+                    "---",
+                    "*Extracted from: another.pdf*",
+                ],
+                # No summary section, and no GPT-4.1 mention without a summary
+                ["## 中文摘要", "*Chinese summary generated using GPT-4.1*"],
+            ),
+            (
+                "document_without_title",
+                [
+                    # "Full Content" is kept when it's the only section
+                    "## Full Content",
+                    "This is the full document content.",
+                    "*Extracted from: untitled.pdf*",
+                ],
+                [],
+            ),
+        ],
+        ids=["with_summary", "without_summary", "without_title"],
+    )
+    def test_format_document(
+        self, request, writer, document_fixture, must_contain, must_not_contain
     ):
-        """Test formatting document without Chinese summary."""
-        result = writer._format_document(sample_document_without_summary)
-
-        # Check title
-        assert "# Another Paper" in result
-
-        # Check no Chinese summary section
-        assert "## 中文摘要" not in result
-
-        # Check sections
-        assert "## Abstract" in result
-        assert "This is the abstract content." in result
-        assert "## Results" in result
-        assert "This is the results content." in result
+        """Test that formatted Markdown has the title, sections and footer expected."""
+        document = request.getfixturevalue(document_fixture)
 
-        # Check metadata footer
-        assert "---" in result
-        assert "*Extracted from: another.pdf*" in result
-        # Should not mention GPT-4.1 when no summary
-        assert "*Chinese summary generated using GPT-4.1*" not in result
+        result = writer._format_document(document)
 
-    def test_format_document_without_title(self, writer, document_without_title):
-        """Test formatting document without title."""
-        result = writer._format_document(document_without_title)
-
-        # Should not have title header when title is None
-        lines = result.split("\n") if result else []
-        first_non_empty_line = next((line for line in lines if line.strip()), "")
-        assert not first_non_empty_line.startswith("# ")
-
-        # Should include "Full Content" section when it's the only section
-        assert "## Full Content" in result
-        assert "This is the full document content." in result
-
-        # Check metadata footer
-        assert "*Extracted from: untitled.pdf*" in result
+        # The first line is the title heading, and only when there is a title
+        first_line = result.lstrip().split("\n", 1)[0]
+        if document.title:
+            assert first_line == f"# {document.title}"
+        else:
+            assert not first_line.startswith("# ")
+        missing = [text for text in must_contain if text not in result]
+        assert not missing
+        assert not any(text in result for text in must_not_contain)
 
     def test_format_document_skips_full_content_with_multiple_sections(self, writer):
         """Test that Full Content section is skipped when other sections exist."""
-        sections = [
-            DocumentSection(title="Abstract", content="Abstract content"),
-            DocumentSection(title="Full Content", content="Full document content"),
-            DocumentSection(title="Conclusion", content="Conclusion content"),
-        ]
-        doc = ExtractedDocument(
-            title="Test Paper", sections=sections, source_file="test.pdf"
+        doc = make_document(
+            "Test Paper",
+            "test.pdf",
+            [
+                ("Abstract", "Abstract content"),
+                ("Full Content", "Full document content"),
+                ("Conclusion", "Conclusion content"),
+            ],
         )
 
         result = writer._format_document(doc)
@@ -155,70 +164,95 @@ class TestMarkdownWriter:
         # Preview should be identical to formatted content
         assert preview == formatted
 
-    def test_write_document_success(self, writer, sample_document_with_summary):
-        """Test successful document writing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_path = Path(temp_dir) / "subdir" / "output.md"
+    def test_format_document_streams_to_writer(
+        self, writer, sample_document_with_summary
+    ):
+        """Test that formatting into a stream matches the returned string."""
+        out = io.StringIO()
 
-            # Should create directory and write file
-            writer.write_document(sample_document_with_summary, output_path)
+        result = writer._format_document(sample_document_with_summary, out)
+
+        assert result == ""
+        assert out.getvalue() == writer._format_document(sample_document_with_summary)
+
+    def test_write_document_reuses_preview(
+        self, writer, sample_document_with_summary, tmp_path
+    ):
+        """Test that writing a previewed document does not format it again."""
+        preview = writer.preview_content(sample_document_with_summary)
+        output_path = tmp_path / "output.md"
 
-            # Check file was created
-            assert output_path.exists()
-            assert output_path.is_file()
+        with patch.object(writer, "_format_document") as mock_format:
+            writer.write_document(sample_document_with_summary, output_path)
 
-            # Check content
-            content = output_path.read_text(encoding="utf-8")
-            assert "# Sample Paper Title" in content
-            assert "## 中文摘要" in content
-            assert "*Extracted from: sample.pdf*" in content
+        mock_format.assert_not_called()
+        assert output_path.read_text(encoding="utf-8") == preview
 
-    def test_write_document_creates_directory(
-        self, writer, sample_document_without_summary
+    def test_preview_reflects_changed_content(
+        self, writer, sample_document_with_summary
+    ):
+        """Test that edited section content is not served from the cache."""
+        document = sample_document_with_summary.model_copy(deep=True)
+        before = writer.preview_content(document)
+        document.sections[0].content = "Edited content"
+
+        after = writer.preview_content(document)
+
+        assert "Edited content" in after
+        assert after != before
+
+    @pytest.mark.parametrize(
+        "subpath",
+        ["subdir/output.md", "nested/deep/output.md"],
+        ids=["single_level", "deep_nested"],
+    )
+    def test_write_document_success(
+        self, writer, sample_document_with_summary, tmp_path, subpath
     ):
-        """Test that write_document creates parent directories."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_path = Path(temp_dir) / "nested" / "deep" / "output.md"
+        """Test that write_document creates parent directories and writes the file."""
+        output_path = tmp_path / subpath
+
+        # Parent directories should not exist initially
+        assert not output_path.parent.exists()
 
-            # Parent directory should not exist initially
-            assert not output_path.parent.exists()
+        writer.write_document(sample_document_with_summary, output_path)
 
-            writer.write_document(sample_document_without_summary, output_path)
+        # Check file was created
+        assert output_path.is_file()
 
-            # Parent directory should be created
-            assert output_path.parent.exists()
-            assert output_path.exists()
+        # The streamed file matches the previewed Markdown exactly
+        content = output_path.read_text(encoding="utf-8")
+        assert content == writer.preview_content(sample_document_with_summary)
 
     def test_write_document_handles_permission_error(
-        self, writer, sample_document_with_summary
+        self, writer, sample_document_with_summary, tmp_path, monkeypatch
     ):
         """Test write_document error handling for permission issues."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_path = Path(temp_dir) / "readonly" / "output.md"
-
-            # Create parent directory and make it read-only
-            output_path.parent.mkdir()
-            output_path.parent.chmod(0o444)  # Read-only
-
-            try:
-                with pytest.raises(Exception) as exc_info:
-                    writer.write_document(sample_document_with_summary, output_path)
-
-                # Should provide helpful error message
-                assert "Failed to write Markdown file" in str(exc_info.value)
-                assert "Please check the output path and permissions" in str(
-                    exc_info.value
-                )
-            finally:
-                # Restore permissions for cleanup
-                output_path.parent.chmod(0o755)
-
-    @patch("builtins.open", side_effect=IOError("Mock IO error"))
+        # Shadow open() in the writer module only, leaving pytest's own I/O alone
+        monkeypatch.setattr(
+            "docxtract.writer.open",
+            Mock(side_effect=PermissionError("Permission denied")),
+            raising=False,
+        )
+        output_path = tmp_path / "readonly" / "output.md"
+
+        with pytest.raises(Exception) as exc_info:
+            writer.write_document(sample_document_with_summary, output_path)
+
+        # Should provide helpful error message
+        assert "Failed to write Markdown file" in str(exc_info.value)
+        assert "Please check the output path and permissions" in str(exc_info.value)
+
     def test_write_document_handles_io_error(
-        self, mock_open, writer, sample_document_with_summary
+        self, writer, sample_document_with_summary, tmp_path, monkeypatch
     ):
         """Test write_document error handling for IO errors."""
-        output_path = Path("test_output.md")
+        monkeypatch.setattr(
+            "docxtract.writer.open",
+            Mock(side_effect=IOError("Mock IO error")),
+            raising=False,
+        )
+        output_path = tmp_path / "test_output.md"
 
         with pytest.raises(Exception) as exc_info:
             writer.write_document(sample_document_with_summary, output_path)
@@ -228,12 +262,10 @@ class TestMarkdownWriter:
 
     def test_format_document_empty_sections(self, writer):
         """Test formatting document with empty sections."""
-        sections = [
-            DocumentSection(title="Empty Section", content=""),
-            DocumentSection(title="Another Section", content="Some content"),
-        ]
-        doc = ExtractedDocument(
-            title="Test Document", sections=sections, source_file="test.pdf"
+        doc = make_document(
+            "Test Document",
+            "test.pdf",
+            [("Empty Section", ""), ("Another Section", "Some content")],
         )
 
         result = writer._format_document(doc)
@@ -243,22 +275,32 @@ class TestMarkdownWriter:
         assert "## Another Section" in result
         assert "Some content" in result
 
-    def test_format_document_special_characters(self, writer):
-        """Test formatting document with special characters."""
-        sections = [
-            DocumentSection(
-                title="Special Characters",
-                content="Content with émojis 🚀 and 特殊字符",
+    @pytest.mark.parametrize(
+        "title, content",
+        [
+            (
+                "Paper with Special Characters: 測試 & símbolos",
+                "Content with émojis 🚀 and 特殊字符",
+            ),
+            (
+                "Markdown *emphasis* and _underscores_ in [brackets]",
+                "Content with `code`, <tags>, # hashes and | pipes",
             ),
-        ]
-        doc = ExtractedDocument(
-            title="Paper with Special Characters: 測試 & símbolos",
-            sections=sections,
-            source_file="special_chars.pdf",
+            (
+                "ورقة بحثية: right-to-left",
+                "Combining e\u0301, zero\u200bwidth and non\u00a0breaking spaces",
+            ),
+        ],
+        ids=["emoji_cjk", "markdown_syntax", "rtl_combining"],
+    )
+    def test_format_document_special_characters(self, writer, title, content):
+        """Test formatting document with special characters."""
+        doc = make_document(
+            title, "special_chars.pdf", [("Special Characters", content)]
         )
 
         result = writer._format_document(doc)
 
-        # Should preserve special characters
-        assert "Paper with Special Characters: 測試 & símbolos" in result
-        assert "Content with émojis 🚀 and 特殊字符" in result
+        # Should preserve special characters verbatim
+        assert f"# {title}" in result
+        assert content in result